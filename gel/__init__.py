@@ -31,6 +31,7 @@ from gel.datatypes.datatypes import (
 )
 from gel.datatypes.datatypes import Record, Set, Object, Array
 from gel.datatypes.range import Range, MultiRange
+from gel.datatypes.columns import Columns
 
 from .abstract import (
     Executor,
@@ -40,6 +41,7 @@ from .abstract import (
     expr,
 )
 from .base_client import ConnectionInfo
+from .protocol.protocol import LazyObject
 
 from .asyncio_client import create_async_client, AsyncIOClient
 
@@ -48,6 +50,7 @@ from .enums import Cardinality, ElementKind
 from .options import RetryCondition, IsolationLevel, default_backoff
 from .options import RetryOptions, TransactionOptions
 from .options import State
+from .options import IdentityMap
 
 from .errors._base import EdgeDBError, EdgeDBMessage
 
@@ -58,6 +61,7 @@ __all__ = [
     "AsyncIOReadOnlyExecutor",
     "Cardinality",
     "Client",
+    "Columns",
     "ConfigMemory",
     "ConnectionInfo",
     "DateDuration",
@@ -66,7 +70,9 @@ __all__ = [
     "ElementKind",
     "EnumValue",
     "Executor",
+    "IdentityMap",
     "IsolationLevel",
+    "LazyObject",
     "MultiRange",
     "NamedTuple",
     "Object",
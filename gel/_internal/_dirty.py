@@ -0,0 +1,109 @@
+# SPDX-PackageName: gel-python
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright Gel Data Inc. and the contributors.
+
+
+"""Index of saved models and collections with unsaved changes.
+
+Models that already exist in the database are marked when they become
+dirty (a field is assigned) and tracked collections right before they
+are mutated; both are unmarked by ``__gel_commit__``.  New objects and
+collections that replace a link or property wholesale are not marked:
+a link to a new object can only have been made through a marked model
+or collection (or another new object), and a replacing collection is
+saved as a changed field of its owner.  The index is conservative: a
+marked object may turn out to have no changes.
+
+save() visits the objects it is given and everything linked from them
+until it has seen every marked object, and every new object linked
+from the dirty ones it has seen.  Unsaved new objects elsewhere in the
+process therefore don't keep it walking.  Entries are weak references,
+so objects that are dropped without being saved do not leak.
+"""
+
+from __future__ import annotations
+
+import itertools
+import weakref
+
+from typing_extensions import Self
+
+
+class _Mark(weakref.KeyedRef):  # type: ignore [type-arg]
+    # `seq` orders marks against the start of a save().
+    __slots__ = ("seq",)
+
+    seq: int
+
+    def __new__(cls, obj: object, key: int, seq: int) -> Self:
+        self = super().__new__(cls, obj, _evict, key)
+        self.seq = seq
+        return self
+
+    def __init__(self, obj: object, key: int, seq: int) -> None:
+        super().__init__(obj, _evict, key)
+
+
+_refs: dict[int, _Mark] = {}
+_seq = itertools.count()
+
+
+def _evict(ref: _Mark) -> None:
+    key = ref.key
+    if _refs.get(key) is ref:
+        _refs.pop(key, None)
+
+
+def mark(obj: object) -> None:
+    key = id(obj)
+    ref = _refs.get(key)
+    if ref is None or ref() is not obj:
+        _refs[key] = _Mark(obj, key, next(_seq))
+
+
+def unmark(obj: object) -> None:
+    key = id(obj)
+    ref = _refs.get(key)
+    if ref is not None and ref() is obj:
+        _refs.pop(key, None)
+
+
+def is_marked(obj: object) -> bool:
+    ref = _refs.get(id(obj))
+    return ref is not None and ref() is obj
+
+
+class Pending:
+    """What a save() has yet to visit before it can stop walking.
+
+    Only objects marked before the ``Pending`` was created count, so
+    creating one is O(1) and objects marked by other threads mid-walk
+    can't make it stop early.
+    """
+
+    __slots__ = ("_left", "_required", "_seen", "_seq")
+
+    def __init__(self) -> None:
+        self._seq = next(_seq)
+        self._left = len(_refs)
+        self._seen: set[int] = set()
+        self._required: set[int] = set()
+
+    def __bool__(self) -> bool:
+        return self._left > 0 or bool(self._required)
+
+    def discard(self, obj: object) -> bool:
+        """Record that *obj* was visited; return whether it is marked."""
+        key = id(obj)
+        self._required.discard(key)
+        ref = _refs.get(key)
+        if ref is None or ref() is not obj or ref.seq > self._seq:
+            return False
+        if key not in self._seen:
+            self._seen.add(key)
+            self._left -= 1
+        return True
+
+    def require(self, obj: object) -> None:
+        """Keep walking until *obj* has been visited too."""
+        self._required.add(id(obj))
@@ -0,0 +1,88 @@
+# SPDX-PackageName: gel-python
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright Gel Data Inc. and the contributors.
+
+
+"""Identity map for models decoded from query results.
+
+Normally every query decodes a fresh model instance per object, so an
+object fetched by several queries ends up as several instances.  With
+an identity map (see ``Client.with_identity_map()``), the object codec
+looks instances up by type and id: the first fetch constructs the
+instance, later fetches merge their fields into it in place (see
+``GelModel.__gel_merge_fetched__()``) and return it.
+
+Instances are held weakly, so the map only ever contains objects
+that are still in use somewhere else.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import contextvars
+import threading
+import weakref
+
+if TYPE_CHECKING:
+    import uuid
+
+
+class IdentityMap:
+    """A map of ``(type, id)`` to the model instance fetched for it.
+
+    Create one per unit of work (e.g. a web request) and pass it to
+    ``Client.with_identity_map()``, let that method create it, or use
+    ``Client.identity_map_scope()``.  Don't share one map between
+    concurrent requests: fetches overwrite the fields of the instances
+    in the map.
+    """
+
+    __slots__ = ("__weakref__", "_lock", "_objects")
+
+    _objects: weakref.WeakValueDictionary[tuple[type, uuid.UUID], Any]
+
+    def __init__(self) -> None:
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} objects={len(self._objects)}>"
+
+    def get(self, tp: type, id: uuid.UUID) -> Any | None:  # noqa: A002
+        """Return the instance of *tp* with *id*, if it's in the map."""
+        return self._objects.get((tp, id))
+
+    def clear(self) -> None:
+        """Forget all instances; they are fetched anew afterwards."""
+        self._objects.clear()
+
+    def __gel_construct__(self, cls: Any, __dict__: dict[str, Any]) -> Any:
+        # Called by the object codec in place of
+        # `cls.__gel_model_construct__(__dict__)`.
+        mid = __dict__.get("id")
+        if mid is None or not cls.__gel_has_id_field__:
+            return cls.__gel_model_construct__(__dict__)
+
+        # Queries run from several threads may decode the same object
+        # at once: only one instance is to be constructed for it, and
+        # merges into it must not interleave.
+        key = (cls, mid)
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is None:
+                obj = cls.__gel_model_construct__(__dict__)
+                self._objects[key] = obj
+            else:
+                obj.__gel_merge_fetched__(__dict__)
+        return obj
+
+
+# The map to decode into, set by the protocol while it decodes
+# the results of a query run with an identity map.
+current: contextvars.ContextVar[IdentityMap | None] = contextvars.ContextVar(
+    "gel_identity_map", default=None
+)
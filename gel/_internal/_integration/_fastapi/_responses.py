@@ -0,0 +1,89 @@
+# SPDX-PackageName: gel-python
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright Gel Data Inc. and the contributors.
+
+"""Responses that pass JSON produced by the server through unchanged."""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+import contextlib
+from collections.abc import AsyncIterable
+
+import fastapi
+from fastapi import responses
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+
+class RawJSONResponse(fastapi.Response):
+    """A JSON response whose body is already encoded JSON.
+
+    Meant for the result of ``query_json_bytes()``: the bytes are sent
+    as is, without being decoded and serialized again like
+    :class:`fastapi.responses.JSONResponse` would do.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, str):
+            return content.encode("utf-8")
+        if content is None:
+            return b""
+        return bytes(content)
+
+
+class JSONArrayStreamingResponse(responses.StreamingResponse):
+    """Stream a JSON array from an iterable of encoded array elements.
+
+    Meant for the result of ``query_json_bytes_iter()``: each element
+    is written to the response as soon as it arrives from the server,
+    so large results are never assembled in memory.
+    """
+
+    def __init__(
+        self,
+        content: Iterable[bytes] | AsyncIterable[bytes],
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = "application/json",
+        background: Any = None,
+    ) -> None:
+        body: Iterable[bytes] | AsyncIterable[bytes]
+        if isinstance(content, AsyncIterable):
+            body = _join_async(content)
+        else:
+            body = _join_sync(content)
+        super().__init__(
+            body,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            background=background,
+        )
+
+
+def _join_sync(elements: Iterable[bytes]) -> Iterable[bytes]:
+    sep = b"["
+    for element in elements:
+        yield sep
+        yield element
+        sep = b","
+    yield b"[]" if sep == b"[" else b"]"
+
+
+async def _join_async(elements: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    it = aiter(elements)
+    async with contextlib.AsyncExitStack() as stack:
+        if hasattr(it, "aclose"):
+            # Close the query iterator (releasing its connection) even
+            # if the client goes away mid-stream.
+            stack.push_async_callback(it.aclose)
+        sep = b"["
+        async for element in it:
+            yield sep
+            yield element
+            sep = b","
+    yield b"[]" if sep == b"[" else b"]"
@@ -0,0 +1,60 @@
+# SPDX-PackageName: gel-python
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright Gel Data Inc. and the contributors.
+
+
+"""JSON parsers for decoding std::json values into Python objects.
+
+The fastest parser that is installed is used: orjson, then msgspec,
+then the standard library json module.  None of them is a dependency.
+Parsers take the encoded JSON document as bytes, serializers may
+return either str or bytes.
+"""
+
+from __future__ import annotations
+from typing import Any
+from collections.abc import Callable
+
+import functools
+import json
+
+
+JSONLoads = Callable[[bytes], Any]
+JSONDumps = Callable[[Any], "str | bytes"]
+
+
+@functools.cache
+def default_parser() -> tuple[JSONLoads, JSONDumps]:
+    try:
+        import orjson  # noqa: PLC0415
+    except ImportError:
+        pass
+    else:
+        return orjson.loads, orjson.dumps
+
+    try:
+        import msgspec.json  # noqa: PLC0415
+    except ImportError:
+        pass
+    else:
+        return msgspec.json.decode, msgspec.json.encode
+
+    return json.loads, json.dumps
+
+
+def resolve_parser(
+    *,
+    decode_json: bool | JSONLoads,
+) -> tuple[JSONLoads, JSONDumps] | None:
+    """Return the (loads, dumps) pair for the *decode_json* option."""
+    if decode_json is False:
+        return None
+    loads, dumps = default_parser()
+    if decode_json is not True:
+        if not callable(decode_json):
+            raise TypeError(
+                f"decode_json is expected to be a bool or a callable, "
+                f"got {decode_json!r}"
+            )
+        loads = decode_json
+    return loads, dumps
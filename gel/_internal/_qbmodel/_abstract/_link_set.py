@@ -12,6 +12,7 @@ from typing_extensions import Self
 from collections.abc import Iterable, Collection
 
 
+from gel._internal import _dirty
 from gel._internal import _typing_parametric as parametric
 from gel._internal._qbmodel._abstract._base import AbstractGelLinkModel
 from gel._internal._qbmodel import _abstract
@@ -57,7 +58,10 @@ class AbstractLinkSet(  # noqa: PLW1641 (__hash__ is implemented)
     """A read-only, ordered set-like list"""
 
     __slots__ = (
-        "_index_snapshot",
+        "_added_index",
+        "_item_list",
+        "_item_list_stale",
+        "_removed_index",
         "_tracking_index",
         "_tracking_set",
     )
@@ -66,25 +70,55 @@ class AbstractLinkSet(  # noqa: PLW1641 (__hash__ is implemented)
 
     # Set of (hashable) items to maintain distinctness.
     _tracking_set: dict[_MT_co, _MT_co] | None
-    # Mapping of `self._pyid(item)` to `item`
+    # Mapping of `self._pyid(item)` to `item`, in insertion order.
+    # Once tracking is initialized this is the source of truth for
+    # the contents of the collection.
     _tracking_index: dict[int, _MT_co] | None
-    # Copy of `_tracking_index` at the moment of `_ensure_snapshot()` call
-    _index_snapshot: dict[int, _MT_co] | None
+    # Items added and removed since the first `_ensure_snapshot()` call
+    # (keyed by `self._pyid(item)`).  An item that is added and then
+    # removed again (or vice versa) is in neither.
+    _added_index: dict[int, _MT_co] | None
+    _removed_index: dict[int, _MT_co] | None
+    # Storage for `_items`.  Removals only mark it as stale and it is
+    # rebuilt (in place) from `_tracking_index` when it's next needed,
+    # which is how they stay O(1).
+    _item_list: list[_MT_co]
+    _item_list_stale: bool
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self._tracking_set = None
         self._tracking_index = None
-        self._index_snapshot = None
+        self._added_index = None
+        self._removed_index = None
         super().__init__(*args, **kwargs)
 
+    @property
+    def _items(self) -> list[_MT_co]:
+        items = self._item_list
+        if self._item_list_stale:
+            assert self._tracking_index is not None
+            items[:] = self._tracking_index.values()
+            self._item_list_stale = False
+        return items
+
+    @_items.setter
+    def _items(self, items: list[_MT_co]) -> None:
+        self._item_list = items
+        self._item_list_stale = False
+
     def __copy__(self) -> Self:
         obj = type(self).__new__(type(self))
 
         obj.__gel_overwrite_data__ = self.__gel_overwrite_data__
         obj._mode = self._mode
         obj._items = list(self._items)
-        obj._index_snapshot = (
-            dict(self._index_snapshot) if self._index_snapshot else None
+        obj._added_index = (
+            dict(self._added_index) if self._added_index is not None else None
+        )
+        obj._removed_index = (
+            dict(self._removed_index)
+            if self._removed_index is not None
+            else None
         )
         obj._tracking_set = (
             dict(self._tracking_set) if self._tracking_set else None
@@ -92,6 +126,8 @@ class AbstractLinkSet(  # noqa: PLW1641 (__hash__ is implemented)
         obj._tracking_index = (
             dict(self._tracking_index) if self._tracking_index else None
         )
+        if _dirty.is_marked(self):
+            _dirty.mark(obj)
         return obj
 
     def __deepcopy__(self, memo: dict[int, Any]) -> Self:
@@ -120,8 +156,15 @@ class AbstractLinkSet(  # noqa: PLW1641 (__hash__ is implemented)
         if not item.__gel_new__:
             self._tracking_set[item] = item
 
+        pyid = self._pyid(item)
         assert self._tracking_index is not None
-        self._tracking_index[self._pyid(item)] = item
+        self._tracking_index[pyid] = item
+
+        added = self._added_index
+        if added is not None:
+            assert self._removed_index is not None
+            if self._removed_index.pop(pyid, None) is None:
+                added[pyid] = item
 
     def _is_tracked(self, item: _MT_co) -> bool:  # type: ignore [misc]
         self._init_tracking()
@@ -276,8 +319,10 @@ class AbstractLinkSet(  # noqa: PLW1641 (__hash__ is implemented)
             return repr(self._items)
 
     def __gel_replace_with_empty__(self) -> None:
-        self._items.clear()
-        self._index_snapshot = None
+        self._item_list.clear()
+        self._item_list_stale = False
+        self._added_index = None
+        self._removed_index = None
         self._tracking_set = None
         self._tracking_index = None
 
@@ -390,7 +435,8 @@ class ComputedLinkSet(
                 self._items,
                 self._tracking_set,
                 self._tracking_index,
-                self._index_snapshot,
+                self._added_index,
+                self._removed_index,
                 self._mode,
                 self.__gel_overwrite_data__,
             ),
@@ -403,7 +449,8 @@ class ComputedLinkSet(
         items: list[_MT_co],
         tracking_set: dict[_MT_co, _MT_co] | None,
         tracking_index: dict[int, _MT_co] | None,
-        index_snapshot: dict[int, _MT_co] | None,
+        added_index: dict[int, _MT_co] | None,
+        removed_index: dict[int, _MT_co] | None,
         mode: Mode,
         gel_overwrite_data: bool,  # noqa: FBT001
     ) -> ComputedLinkSet[_MT_co]:
@@ -416,11 +463,15 @@ class ComputedLinkSet(
         lst._items = items
         lst._tracking_set = tracking_set
         lst._tracking_index = tracking_index
-        lst._index_snapshot = index_snapshot
+        lst._added_index = added_index
+        lst._removed_index = removed_index
 
         lst._mode = mode
         lst.__gel_overwrite_data__ = gel_overwrite_data
 
+        if not gel_overwrite_data and (lst._added_index or lst._removed_index):
+            _dirty.mark(lst)
+
         return lst
 
 
@@ -505,7 +556,12 @@ class ComputedLinkWithPropsSet(
                 if self._tracking_index is not None
                 else None,
                 self._tracking_set,
-                self._index_snapshot,
+                list(self._added_index.values())
+                if self._added_index is not None
+                else None,
+                list(self._removed_index.values())
+                if self._removed_index is not None
+                else None,
                 self._mode,
                 self.__gel_overwrite_data__,
             ),
@@ -519,7 +575,8 @@ class ComputedLinkWithPropsSet(
         items: list[_PT_co],
         tracking_index: list[_PT_co] | None,
         tracking_set: dict[_PT_co, _PT_co] | None,
-        index_snapshot: list[_PT_co] | None,
+        added_index: list[_PT_co] | None,
+        removed_index: list[_PT_co] | None,
         mode: Mode,
         gel_overwrite_data: bool,  # noqa: FBT001
     ) -> ComputedLinkWithPropsSet[_PT_co, _BMT_co]:
@@ -540,16 +597,20 @@ class ComputedLinkWithPropsSet(
 
         lst._tracking_set = tracking_set
 
-        if index_snapshot is None:
-            lst._index_snapshot = None
+        if added_index is None or removed_index is None:
+            lst._added_index = lst._removed_index = None
         else:
-            lst._index_snapshot = {
-                cls._pyid(item): item for item in index_snapshot
+            lst._added_index = {cls._pyid(item): item for item in added_index}
+            lst._removed_index = {
+                cls._pyid(item): item for item in removed_index
             }
 
         lst._mode = mode
         lst.__gel_overwrite_data__ = gel_overwrite_data
 
+        if not gel_overwrite_data and (lst._added_index or lst._removed_index):
+            _dirty.mark(lst)
+
         return lst
 
 
@@ -594,7 +655,8 @@ class AbstractMutableLinkSet(
         # Reset tracking: it will likely be not needed. Typically there
         # should be just one `sync()` call with no modifications of anything
         # after it.
-        self._tracking_index = self._tracking_set = self._index_snapshot = None
+        self._tracking_index = self._tracking_set = None
+        self._added_index = self._removed_index = None
         return self
 
     def _ensure_value_indexable(self, value: Any) -> _MT_co | None:
@@ -611,19 +673,23 @@ class AbstractMutableLinkSet(
     def _ensure_snapshot(self) -> None:
         # "_ensure_snapshot" is called right before any mutation:
         # this is the perfect place to init tracking, as it's required
-        # for making a snapshot.
+        # for recording changes.  We don't copy the current state, only
+        # start recording added and removed items.  Collections that
+        # replace the link wholesale are saved with their owner instead.
+        if not self.__gel_overwrite_data__:
+            _dirty.mark(self)
         self._init_tracking()
 
-        if self._index_snapshot is None:
-            assert self._tracking_index is not None
-            self._index_snapshot = dict(self._tracking_index)
+        if self._added_index is None:
+            self._added_index = {}
+            self._removed_index = {}
 
     def _ensure_snapshot_then_track(self, value: _MT_co) -> None:  # type: ignore [misc]
         self._ensure_snapshot()
         if self._is_tracked(value):
             return
         self._track_item(value)
-        self._items.append(value)
+        self._append_item(value)
 
     def _ensure_snapshot_then_untrack(self, value: _MT_co) -> _MT_co | None:  # type: ignore [misc]
         self._ensure_snapshot()
@@ -631,68 +697,26 @@ class AbstractMutableLinkSet(
             return None
 
         self._untrack_item(value)
-        self._items.remove(value)
         return value
 
+    def _append_item(self, item: _MT_co) -> None:  # type: ignore [misc]
+        # Call after `_track_item()`.  If `_items` is stale,
+        # `_tracking_index` already has the item in the right place.
+        if not self._item_list_stale:
+            self._item_list.append(item)
+
     def __gel_get_added__(self) -> list[_MT_co]:
-        match bool(self._index_snapshot), bool(self._tracking_index):
-            case True, False:
-                # _index_snapshot has data in it, _tracking_index is empty --
-                # everything was removed
-                return []
-            case False, True:
-                # _index_snapshot is empty, _tracking_index has data in it --
-                # everything was added
-                return list(self._items)
-            case True, True:
-                # _index_snapshot and _tracking_index have data in it --
-                # some items were added, some were removed
-                assert self._index_snapshot is not None
-                assert self._tracking_index is not None
-                return [
-                    item
-                    for item_id, item in self._tracking_index.items()
-                    if item_id not in self._index_snapshot
-                ]
-            case False, False:
-                # _index_snapshot and _tracking_index are empty -- no changes
-                return []
-
-        raise AssertionError("unreachable")
+        if self._added_index is None:
+            return []
+        return list(self._added_index.values())
 
     def __gel_get_removed__(self) -> Iterable[_MT_co]:
-        # See the comment in __gel_get_added__
-        match bool(self._index_snapshot), bool(self._tracking_index):
-            case True, False:
-                # _index_snapshot has data in it, _tracking_index is empty --
-                # everything was removed
-                assert self._index_snapshot is not None
-                return list(self._index_snapshot.values())
-            case False, True:
-                # _index_snapshot is empty, _tracking_index has data in it --
-                # everything was added
-                return ()
-            case True, True:
-                # _index_snapshot and _tracking_index have data in it --
-                # some items were added, some were removed
-                assert self._index_snapshot is not None
-                assert self._tracking_index is not None
-                return [
-                    item
-                    for item_id, item in self._index_snapshot.items()
-                    if item_id not in self._tracking_index
-                ]
-            case False, False:
-                # _index_snapshot and _tracking_index are empty -- no changes
-                return ()
-
-        raise AssertionError("unreachable")
+        if self._removed_index is None:
+            return ()
+        return list(self._removed_index.values())
 
     def __gel_has_changes__(self) -> bool:
-        if self._index_snapshot is None:
-            # We don't even have a snapshot -- no changes
-            return False
-        return self._tracking_index != self._index_snapshot
+        return bool(self._added_index) or bool(self._removed_index)
 
     def __gel_commit__(self) -> None:
         super().__gel_commit__()
@@ -710,18 +734,14 @@ class AbstractMutableLinkSet(
                     )
                 )
 
-        if self._index_snapshot is not None:
-            assert self._tracking_index is not None
-            if len(self._tracking_index) != len(self._index_snapshot):
-                self._index_snapshot = dict(self._tracking_index)
+        self._added_index = self._removed_index = None
 
     def __gel_post_commit_check__(self, path: Path) -> None:
         super().__gel_post_commit_check__(path)
 
-        if self._index_snapshot != self._tracking_index:
+        if self._added_index or self._removed_index:
             raise ValueError(
-                f"{path} `self._index_snapshot` != `self._tracking_index` "
-                f"after save()"
+                f"{path} has uncommitted added or removed items after save()"
             )
 
         if self._tracking_set is not None and len(self._tracking_set) != len(
@@ -745,16 +765,34 @@ class AbstractMutableLinkSet(
         if not item.__gel_new__:
             self._tracking_set.pop(item)
 
+        pyid = self._pyid(item)
         assert self._tracking_index is not None
-        self._tracking_index.pop(self._pyid(item), None)
+        self._tracking_index.pop(pyid, None)
+
+        added = self._added_index
+        if added is not None:
+            assert self._removed_index is not None
+            if added.pop(pyid, None) is None:
+                self._removed_index[pyid] = item
+
+        # Removing from the middle of a list is O(n); rebuild `_items`
+        # from `_tracking_index` lazily instead, when it's next needed.
+        self._item_list_stale = True
 
     def clear(self) -> None:
         """Remove all items but keep element-type enforcement."""
         self._ensure_snapshot()
-        self._items.clear()
+        assert self._tracking_index is not None
+        assert self._added_index is not None
+        assert self._removed_index is not None
+        for pyid, item in self._tracking_index.items():
+            if self._added_index.pop(pyid, None) is None:
+                self._removed_index[pyid] = item
+
+        self._item_list.clear()
+        self._item_list_stale = False
         assert self._tracking_set is not None
         self._tracking_set.clear()
-        assert self._tracking_index is not None
         self._tracking_index.clear()
 
     def __gel_add__(self, value: _MT_co) -> None:  # type: ignore [misc]
@@ -781,6 +819,8 @@ class AbstractMutableLinkSet(
 
     @requires_read("get the length of", unsafe="unsafe_len()")
     def __len__(self) -> int:
+        if self._tracking_index is not None:
+            return len(self._tracking_index)
         return len(self._items)
 
     @requires_read("iterate over", unsafe="unsafe_iter()")
@@ -962,7 +1002,7 @@ class LinkWithPropsSet(
 
         # For an empty list we can call one extend() call instead
         # of slow iterative appends.
-        empty_items = not self._items
+        empty_items = not self._tracking_index
 
         for val in values:
             proxy_val: _PT_co | _BMT_co
@@ -1001,7 +1041,7 @@ class LinkWithPropsSet(
                 self._track_item(proxy)
 
                 if not empty_items:
-                    self._items.append(proxy)
+                    self._append_item(proxy)
 
         if empty_items:
             # A LOT faster than `extend()` ¯\_(ツ)_/¯
@@ -1023,7 +1063,7 @@ class LinkWithPropsSet(
         if proxy is not existing:
             assert existing is None
             self._track_item(proxy)
-            self._items.append(proxy)
+            self._append_item(proxy)
 
     def __gel_remove__(self, value: _PT_co | _BMT_co) -> _PT_co | None:
         """Remove item; return None if missing."""
@@ -1036,10 +1076,6 @@ class LinkWithPropsSet(
 
         self._untrack_item(existing)
 
-        # TODO: Maybe there's a faster way to do this?
-        # __eq__ on ProxyModels isn't cheap.
-        self._items.remove(existing)
-
         return existing
 
     if TYPE_CHECKING:
@@ -39,6 +39,7 @@ from pydantic._internal import _model_construction  # noqa: PLC2701
 from pydantic._internal import _decorators  # noqa: PLC2701
 from pydantic._internal import _core_utils as _pydantic_core_utils  # noqa: PLC2701
 
+from gel._internal import _dirty
 from gel._internal import _qb
 from gel._internal import _tracked_list
 from gel._internal import _typing_inspect
@@ -624,7 +625,7 @@ class GelSourceModel(
     # making state management for "special" properties like
     # these hard. We also mess with `__dict__` so we want
     # these fields to be outside of it.
-    __slots__ = ("__gel_changed_fields__", "__gel_new__")
+    __slots__ = ("__gel_changed_fields__", "__gel_new__", "__weakref__")
 
     # Functions like __gel_model_construct__ are performance-critical,
     # we don't want to add another super() call to them, so we use
@@ -752,6 +753,8 @@ class GelSourceModel(
         ll_setattr(
             self, "__gel_changed_fields__", set(self.__pydantic_fields_set__)
         )
+        if cls.__gel_has_id_field__ and not self.__gel_new__:
+            _dirty.mark(self)
 
         return self
 
@@ -781,6 +784,10 @@ class GelSourceModel(
     def __setstate__(self, state: dict[Any, Any]) -> None:
         super().__setstate__(state)
         self.__gel_changed_fields__ = state["__gel_changed_fields__"]
+        if self.__gel_changed_fields__ is not None and not state.get(
+            "__gel_new__"
+        ):
+            _dirty.mark(self)
 
     def __copy__(self) -> Self:
         cp = super().__copy__()
@@ -791,6 +798,8 @@ class GelSourceModel(
             "__gel_changed_fields__",
             set(changed_fields) if changed_fields is not None else None,
         )
+        if _dirty.is_marked(self):
+            _dirty.mark(cp)
         return cp
 
     def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
@@ -802,6 +811,8 @@ class GelSourceModel(
             "__gel_changed_fields__",
             set(changed_fields) if changed_fields is not None else None,
         )
+        if _dirty.is_marked(self):
+            _dirty.mark(cp)
         return cp
 
     def model_copy(
@@ -823,6 +834,8 @@ class GelSourceModel(
 
     def __init__(self, /, **kwargs: Any) -> None:
         super().__init__(**kwargs)
+        # Not marked dirty: this is a new object (or the link properties
+        # of a new link), see `_dirty`.
         ll_setattr(
             self, "__gel_changed_fields__", set(self.__pydantic_fields_set__)
         )
@@ -835,6 +848,7 @@ class GelSourceModel(
 
     def __gel_commit__(self) -> None:
         ll_setattr(self, "__gel_changed_fields__", None)
+        _dirty.unmark(self)
 
     def __setattr__(self, name: str, value: Any) -> None:
         # Implement state tracking and multi-link/multi-prop custom handling
@@ -902,6 +916,7 @@ class GelSourceModel(
                 if dirty is None:
                     dirty = set()
                     object.__setattr__(self, "__gel_changed_fields__", dirty)
+                    _dirty.mark(self)
                 dirty.add(name)
 
     def __delattr__(self, name: str) -> None:
@@ -1001,6 +1016,7 @@ class GelModel(
         self.__gel_changed_fields__ = set(self.__pydantic_fields_set__)
         self.__dict__["id"] = id
         self.__gel_new__ = False
+        _dirty.mark(self)
         return self
 
     def __init__(
@@ -1107,6 +1123,27 @@ class GelModel(
         assert not self.__gel_new__
         super().__gel_commit__()
 
+    def __gel_merge_fetched__(self, __dict__: dict[str, Any]) -> None:
+        # Called by IdentityMap when this object is fetched again:
+        # take the freshly fetched fields, except for the ones with
+        # unsaved changes, which keep their local values.  Fields are
+        # overwritten in place, without validation or change tracking,
+        # and the change is visible to every holder of the instance.
+        changed = self.__gel_get_changed_fields__()
+        data = self.__dict__
+        fields_set: set[str] = ll_getattr(self, "__pydantic_fields_set__")
+        for name, value in __dict__.items():
+            if name in changed:
+                continue
+            current = data.get(name)
+            if (
+                isinstance(current, _tracked_list.AbstractCollection)
+                and current.__gel_has_changes__()
+            ):
+                continue
+            data[name] = value
+            fields_set.add(name)
+
     def __eq__(self, other: object) -> bool:
         # We make two models equal to each other if they:
         #
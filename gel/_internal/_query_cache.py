@@ -0,0 +1,247 @@
+# SPDX-PackageName: gel-python
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright Gel Data Inc. and the contributors.
+
+
+"""On-disk cache of query type descriptors.
+
+A freshly started client has to Parse every query once to learn its
+input and output type descriptors.  PersistentQueryCache keeps those
+descriptors on disk so that a new process can build codecs straight
+away and execute queries without the extra round-trip.
+
+Entries are stored in one file per server address, branch, user and
+protocol version, and are keyed by the same tuple as the in-memory
+query cache (query text and output options).  A descriptor that no
+longer matches the schema is corrected by the server on execution,
+exactly like for a stale in-memory cache entry.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+import hashlib
+import json
+import logging
+import pathlib
+import threading
+import time
+
+from gel import _version
+from gel._internal import _cache
+from gel._internal import _platform
+
+if TYPE_CHECKING:
+    import os
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 1000
+SAVE_INTERVAL = 5.0
+
+
+def default_cache_dir() -> pathlib.Path:
+    return _platform.cache_dir() / "queries"
+
+
+def _encode_key(key: tuple[Any, ...]) -> str:
+    query, output_format, implicit_limit, *flags = key
+    return json.dumps(
+        [query, int(output_format), implicit_limit, *map(bool, flags)]
+    )
+
+
+class PersistentQueryCache:
+    __slots__ = (
+        "_cache_dir",
+        "_claim_lock",
+        "_dirty",
+        "_entries",
+        "_extra_key",
+        "_file_key",
+        "_last_save",
+        "_lock",
+        "_maxsize",
+        "_save_claimed",
+        "protocol_version",
+    )
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike[str] | None = None,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize is expected to be greater than zero")
+        if cache_dir is None:
+            self._cache_dir = default_cache_dir()
+        else:
+            self._cache_dir = pathlib.Path(cache_dir)
+        self._maxsize = maxsize
+        self._entries: dict[str, list[Any]] = {}
+        self._file_key: str | None = None
+        self._extra_key: str | None = None
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+        self._claim_lock = threading.Lock()
+        self._save_claimed = False
+        self.protocol_version: tuple[int, int] | None = None
+
+    def load(self, server_key: str, protocol_version: tuple[int, int]) -> None:
+        """Load the entries cached for *server_key* from disk.
+
+        Does nothing if the entries for this server and protocol
+        version are already loaded.
+        """
+        file_key = hashlib.sha256(
+            f"{server_key}\0{protocol_version}".encode()
+        ).hexdigest()
+        with self._lock:
+            if file_key == self._file_key:
+                return
+            self._save_locked()
+            self._file_key = file_key
+            self._extra_key = f"{_version.__version__}:{protocol_version}"
+            self.protocol_version = protocol_version
+            self._entries = self._read_locked()
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def reset(self) -> None:
+        """Flush pending entries and detach from the current server."""
+        with self._lock:
+            self._save_locked()
+            self._file_key = self._extra_key = None
+            self.protocol_version = None
+            self._entries = {}
+
+    def get(
+        self, key: tuple[Any, ...]
+    ) -> tuple[bytes, int, tuple[bytes, bytes], tuple[bytes, bytes]] | None:
+        if self.protocol_version is None:
+            return None
+        entry = self._entries.get(_encode_key(key))
+        if entry is None:
+            return None
+        try:
+            cardinality, capabilities, in_tid, in_td, out_tid, out_td = entry
+            return (
+                bytes.fromhex(cardinality),
+                int(capabilities),
+                (bytes.fromhex(in_tid), bytes.fromhex(in_td)),
+                (bytes.fromhex(out_tid), bytes.fromhex(out_td)),
+            )
+        except (TypeError, ValueError):
+            self.discard(key)
+            return None
+
+    def put(
+        self,
+        key: tuple[Any, ...],
+        entry: tuple[bytes, int, tuple[bytes, bytes], tuple[bytes, bytes]],
+    ) -> None:
+        if self.protocol_version is None:
+            return
+        cardinality, capabilities, (in_tid, in_td), (out_tid, out_td) = entry
+        encoded = _encode_key(key)
+        with self._lock:
+            self._entries.pop(encoded, None)
+            self._entries[encoded] = [
+                cardinality.hex(),
+                capabilities,
+                in_tid.hex(),
+                in_td.hex(),
+                out_tid.hex(),
+                out_td.hex(),
+            ]
+            while len(self._entries) > self._maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._dirty = True
+
+    def discard(self, key: tuple[Any, ...]) -> None:
+        with self._lock:
+            if self._entries.pop(_encode_key(key), None) is not None:
+                self._dirty = True
+
+    def claim_save(self) -> bool:
+        """Return True if pending entries are due to be written to disk.
+
+        They are due if they have not been written for SAVE_INTERVAL
+        seconds.  The caller must then call save_claimed(); until it
+        returns and for SAVE_INTERVAL seconds, this returns False.
+        """
+        if not self._dirty or self._save_claimed:
+            return False
+        # Not self._lock: that is held while writing to disk.
+        with self._claim_lock:
+            now = time.monotonic()
+            if self._save_claimed or now - self._last_save < SAVE_INTERVAL:
+                return False
+            self._save_claimed = True
+            self._last_save = now
+            return True
+
+    def save_claimed(self) -> None:
+        """Write pending entries after claim_save() returned True.
+
+        Runs off the query path, so errors are logged, not raised.
+        """
+        try:
+            self.save()
+        except Exception:
+            logger.warning(
+                "could not save the persistent query cache", exc_info=True
+            )
+        finally:
+            self._save_claimed = False
+
+    def save(self) -> None:
+        """Write pending entries to disk."""
+        with self._lock:
+            self._save_locked()
+
+    def _read_locked(self) -> dict[str, list[Any]]:
+        assert self._file_key is not None
+        data = _cache.load_json(
+            self._file_key,
+            cache_dir=self._cache_dir,
+            extra_key=self._extra_key,
+        )
+        if not isinstance(data, dict):
+            return {}
+        return {
+            k: v
+            for k, v in data.items()
+            if isinstance(k, str) and isinstance(v, list)
+        }
+
+    def _save_locked(self) -> None:
+        if not self._dirty or self._file_key is None:
+            return
+        # Other processes may share the file: keep their entries
+        # unless we have a newer version of them.
+        entries = self._read_locked()
+        for k in self._entries:
+            entries.pop(k, None)
+        entries.update(self._entries)
+        excess = len(entries) - self._maxsize
+        if excess > 0:
+            for k in list(entries)[:excess]:
+                del entries[k]
+        if not _cache.save_json(
+            self._file_key,
+            entries,
+            cache_dir=self._cache_dir,
+            extra_key=self._extra_key,
+        ):
+            # Keep the entries pending; claim_save() retries later.
+            logger.warning(
+                "could not write the persistent query cache to %s",
+                self._cache_dir,
+            )
+            return
+        self._dirty = False
+        self._last_save = time.monotonic()
@@ -4,6 +4,7 @@ import collections
 import copy
 import dataclasses
 import pathlib
+import time
 import warnings
 import weakref
 import uuid
@@ -19,6 +20,7 @@ from typing import (
 )
 from typing_extensions import TypeAliasType, dataclass_transform
 
+from gel._internal import _dirty
 from gel._internal._qbmodel._abstract import (
     DEFAULT_VALUE,
     AbstractLinkSet,
@@ -427,46 +429,59 @@ def get_pointers(tp: type[GelSourceModel]) -> Iterable[GelPointerReflection]:
     return ret
 
 
+def iter_linked(obj: GelModel) -> Iterator[GelModel]:
+    # Objects directly linked from `obj` (unwrapped from proxies),
+    # in pointer order.
+    for prop in get_pointers(type(obj)):
+        if prop.computed or prop.kind is not PointerKind.Link:
+            # We don't want to traverse computeds (they don't form the
+            # actual dependency graph, real links do)
+            continue
+
+        linked = model_attr(obj, prop.name, _unset)
+        if linked in _STOP_LINK_TRAVERSAL:
+            # If users mess-up with user-defined types and smoe
+            # of the data isn't fetched, we don't want to crash
+            # with an AttributeErorr, it's not critical here.
+            # Not fetched means not used, which is good for save().
+            continue
+
+        if prop.cardinality.is_multi():
+            if is_link_wprops_set(linked):
+                for proxy in linked._items:
+                    yield unwrap_proxy_no_check(proxy)
+            else:
+                assert is_link_set(linked)
+                yield from linked._items
+        else:
+            yield unwrap_proxy(cast("GelModel", linked))
+
+
 def iter_graph(
     objs: Iterable[GelModel],
     id_tracker: IDTracker[GelModel, None],
 ) -> Iterable[GelModel]:
-    # Simple recursive traverse of a model
+    # Depth-first, pre-order traverse of a model graph.
+    #
+    # We keep a stack of iterators over linked objects instead of
+    # recursing: link chains (linked lists, deep trees) can be far
+    # deeper than the recursion limit, and nested generators would
+    # cost O(depth) for every yielded object.
+
+    stack: list[Iterator[GelModel]] = [iter(objs)]
+    while stack:
+        obj = next(stack[-1], None)
+        if obj is None:
+            stack.pop()
+            continue
 
-    def _traverse(obj: GelModel) -> Iterable[GelModel]:
         if obj in id_tracker:
-            return
+            continue
 
         id_tracker.track(obj)
         yield obj
 
-        for prop in get_pointers(type(obj)):
-            if prop.computed or prop.kind is not PointerKind.Link:
-                # We don't want to traverse computeds (they don't form the
-                # actual dependency graph, real links do)
-                continue
-
-            linked = model_attr(obj, prop.name, _unset)
-            if linked in _STOP_LINK_TRAVERSAL:
-                # If users mess-up with user-defined types and smoe
-                # of the data isn't fetched, we don't want to crash
-                # with an AttributeErorr, it's not critical here.
-                # Not fetched means not used, which is good for save().
-                continue
-
-            if prop.cardinality.is_multi():
-                if is_link_wprops_set(linked):
-                    for proxy in linked._items:
-                        yield from _traverse(unwrap_proxy_no_check(proxy))
-                else:
-                    assert is_link_set(linked)
-                    for lobj in linked._items:
-                        yield from _traverse(lobj)
-            else:
-                yield from _traverse(unwrap_proxy(cast("GelModel", linked)))
-
-    for o in objs:
-        yield from _traverse(o)
+        stack.append(iter_linked(obj))
 
 
 def get_linked_new_objects(obj: GelModel) -> Iterable[GelModel]:
@@ -572,6 +587,8 @@ def multi_prop_has_changes_recursive(
         if isinstance(collection, AbstractCollection):
             if collection.__gel_has_changes__():
                 return True
+            if collection.__gel_holds_scalars__():
+                return False
             iter_over = collection.unsafe_iter()
         else:
             iter_over = iter(collection)
@@ -599,6 +616,8 @@ def multi_prop_commit_recursive(
     def walk(collection: Iterable[Any]) -> None:
         if isinstance(collection, AbstractCollection):
             collection.__gel_commit__(**commit_kwargs)
+            if collection.__gel_holds_scalars__():
+                return
             iter_over = collection.unsafe_iter()
         else:
             iter_over = iter(collection)
@@ -613,6 +632,55 @@ def multi_prop_commit_recursive(
     walk(val)
 
 
+def discard_seen(obj: GelModel, pending: _dirty.Pending) -> bool:
+    # Record `obj` as visited (see `_dirty`), along with everything
+    # whose changes are saved as part of `obj`: its multi link and
+    # multi property collections, arrays nested in its properties,
+    # and the link properties of its links.  Return whether any of
+    # them is marked dirty.
+
+    def walk(collection: Iterable[Any]) -> bool:
+        dirty = pending.discard(collection)
+        if isinstance(collection, AbstractCollection):
+            iter_over = collection.unsafe_iter()
+        else:
+            iter_over = iter(collection)
+
+        for item in iter_over:
+            if isinstance(item, (list, tuple, AbstractCollection)):
+                dirty |= walk(item)
+        return dirty
+
+    dirty = pending.discard(obj)
+
+    for prop in get_pointers(type(obj)):
+        if prop.computed:
+            continue
+
+        val = model_attr(obj, prop.name, _unset)
+        if val in _STOP_LINK_TRAVERSAL:
+            continue
+
+        if prop.kind is PointerKind.Link:
+            if prop.cardinality.is_multi():
+                dirty |= pending.discard(val)
+                if is_link_wprops_set(val):
+                    for p in val._items:
+                        dirty |= pending.discard(get_proxy_linkprops(p))
+            elif isinstance(val, ProxyModel):
+                dirty |= pending.discard(get_proxy_linkprops(val))
+
+        elif prop.mutable and isinstance(
+            val, (tuple, list, AbstractCollection)
+        ):
+            dirty |= walk(val)
+
+        elif prop.cardinality.is_multi():
+            dirty |= pending.discard(val)
+
+    return dirty
+
+
 def model_attr(
     obj: AbstractGelSourceModel, name: str, default: Any = _missing_arg
 ) -> Any:
@@ -707,6 +775,7 @@ def make_plan(
     *,
     refetch: bool,
     warn_on_large_sync_set: bool,
+    full_traversal: bool = False,
 ) -> SavePlan:
     insert_ops: ChangeBatch = []
     update_ops: ChangeBatch = []
@@ -718,7 +787,30 @@ def make_plan(
         uuid.UUID, GelModel | IDTracker[GelModel, None]
     ] = {}
 
+    # Only objects that are marked dirty (or are held by ones that are)
+    # and new objects linked from those can have changes, so unless we
+    # also need to refetch everything we stop walking the graph as soon
+    # as all of them have been visited.  Saving one object attached to
+    # a big loaded graph then costs a walk down to that object instead
+    # of a walk of the whole graph.
+    pending = None
+    if not (refetch or full_traversal):
+        pending = _dirty.Pending()
+        for obj in objs:
+            if obj.__gel_new__:
+                pending.require(obj)
+
     for obj in iter_graph(objs, iter_graph_tracker):
+        if pending is not None:
+            if not pending:
+                break
+            if discard_seen(obj, pending) or obj.__gel_new__:
+                # New objects aren't marked (see `_dirty`): the ones
+                # linked from here must be visited too.
+                for linked in iter_linked(obj):
+                    if linked.__gel_new__ and linked not in iter_graph_tracker:
+                        pending.require(linked)
+
         tp_obj: type[GelModel] = type(obj)
 
         pointers = get_pointers(tp_obj)
@@ -1175,7 +1267,13 @@ def make_save_executor_constructor(
     refetch: bool,
     warn_on_large_sync_set: bool = False,
     save_postcheck: bool = False,
+    batch_size: int | None = None,
 ) -> Callable[[], SaveExecutor]:
+    if batch_size is None:
+        batch_size = MAX_BATCH_SIZE
+    elif batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
     plan = make_plan(
         objs,
         refetch=refetch,
@@ -1190,6 +1288,7 @@ def make_save_executor_constructor(
         refetch=refetch,
         save_postcheck=save_postcheck,
         warn_on_large_sync_set=warn_on_large_sync_set,
+        batch_size=batch_size,
     )
 
 
@@ -1208,7 +1307,8 @@ class TypeWrapper(Generic[T_co]):
         )
 
 
-# How many INSERT/UPDATE operations can be combined into a single query.
+# How many INSERT/UPDATE operations can be combined into a single query
+# by default (see the `batch_size` argument of save() and sync()).
 # Significantly improves performance, but appears to hit the ceiling of
 # improvements at around 100.
 MAX_BATCH_SIZE = 1280
@@ -1223,6 +1323,9 @@ class QueryBatch:
     changes: list[ModelChange]
     insert: bool
 
+    def get_query_args(self) -> tuple[tuple[object, ...], dict[str, object]]:
+        return (self.args,), {}
+
     def record_inserted_data(self, obj_data: Iterable[Any]) -> None:
         match self.executor.refetch, self.insert:
             case False, True:
@@ -1282,10 +1385,194 @@ class QueryRefetch:
     args: QueryRefetchArgs
     shape: RefetchShape
 
+    def get_query_args(self) -> tuple[tuple[object, ...], dict[str, object]]:
+        return (), {
+            "spec": self.args.spec,
+            "new": self.args.new,
+            "existing": self.args.existing,
+        }
+
     def record_refetched_data(self, obj_data: Iterable[GelModel]) -> None:
         self.executor.refetched_data.append((self.shape, obj_data))
 
 
+@_struct
+class SaveFlight:
+    """Queries of a save() that are sent to the server in one round trip."""
+
+    queries: list[QueryBatch | QueryRefetch]
+
+    def record_results(self, results: list[Any]) -> None:
+        for query, data in zip(self.queries, results, strict=True):
+            if isinstance(query, QueryBatch):
+                query.record_inserted_data(data)
+            else:
+                query.record_refetched_data(data)
+
+
+@dataclasses.dataclass
+class SaveQueryDebug:
+    query: Any = ""
+    max_args_number: int = 0
+    total_execs: int = 0
+    # Queries are pipelined, so this is the total time of the round trips
+    # the query was part of rather than its own execution time.
+    total_exec_time: float = 0
+    analyze: str = ""
+    analyze_args: object = None
+    args_query: str = ""
+    args_analyze: object = None
+
+
+@dataclasses.dataclass
+class SaveDebug:
+    queries: list[SaveQueryDebug] = dataclasses.field(default_factory=list)
+    # Time spent in each phase of save(), in seconds: building the save
+    # plan, compiling queries, waiting on the network, and committing
+    # the transaction and applying the results to the models.  Phases
+    # accumulate over transaction retries.
+    plan_time: float = 0
+    compile_time: float = 0
+    network_time: float = 0
+    commit_time: float = 0
+    flights: int = 0
+
+    _queries_by_text: dict[str, SaveQueryDebug] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def record_flight(self, flight: SaveFlight, exec_time: float) -> None:
+        self.flights += 1
+        self.network_time += exec_time
+
+        for query in flight.queries:
+            text = (
+                query.query
+                if isinstance(query.query, str)
+                else query.query.query
+            )
+            qdebug = self._queries_by_text.get(text)
+            if qdebug is None:
+                qdebug = self._queries_by_text[text] = SaveQueryDebug(
+                    query=query.query
+                )
+                if isinstance(query, QueryBatch):
+                    qdebug.args_query = query.args_query
+                self.queries.append(qdebug)
+
+            if isinstance(query, QueryBatch):
+                args_number = len(query.args)
+            else:
+                args_number = len(query.args.spec)
+            qdebug.max_args_number = max(qdebug.max_args_number, args_number)
+            qdebug.total_execs += 1
+            qdebug.total_exec_time += exec_time
+
+
+def _is_flat_insert(change: ModelChange) -> bool:
+    return all(
+        type(ch) is PropertyChange or type(ch) is MultiPropAdd
+        for ch in change.fields.values()
+    )
+
+
+def _is_array_type(type_name: TypeName) -> bool:
+    return isinstance(type_name, ParametricTypeName) and (
+        type_name.type_.parts in {("array",), ("std", "array")}
+    )
+
+
+def _property_arg_type(
+    ch: PropertyChange | MultiPropAdd | MultiPropRemove,
+) -> tuple[TypeName, Callable[[str], str]]:
+    # Returns the type of the query argument passing the value of a
+    # property change, and a function rendering the expression that
+    # unpacks the value from the argument.
+    #
+    # Optional values are passed as an array of zero or one elements,
+    # since tuple arguments can't have empty sets as elements, and
+    # sets of values (multi properties) as an array.  Array values are
+    # wrapped in one-element tuples, as arrays of arrays aren't
+    # supported.
+    if isinstance(ch, PropertyChange):
+        if not ch.info.cardinality.is_optional():
+            return ch.info.type, _identity_func
+        if _is_array_type(ch.info.type):
+            return (
+                _array_of_tuples_type(ch.info.type),
+                lambda x: f"(select std::array_unpack({x}).0 limit 1)",
+            )
+        else:
+            return (
+                _array_type(ch.info.type),
+                lambda x: f"(select std::array_unpack({x}) limit 1)",
+            )
+
+    if _is_array_type(ch.info.type):
+        return (
+            _array_of_tuples_type(ch.info.type),
+            lambda x: f"std::array_unpack({x}).0",
+        )
+    else:
+        return (
+            _array_type(ch.info.type),
+            lambda x: f"std::array_unpack({x})",
+        )
+
+
+def _pack_property_arg(
+    ch: PropertyChange | MultiPropAdd | MultiPropRemove,
+) -> object:
+    # Packs the value of a property change into the query argument
+    # described by _property_arg_type().
+    is_array = _is_array_type(ch.info.type)
+    if isinstance(ch, PropertyChange):
+        if not ch.info.cardinality.is_optional():
+            return ch.value
+        elif ch.value is None:
+            return []
+        elif is_array:
+            return [(ch.value,)]
+        else:
+            return [ch.value]
+
+    values = ch.added if isinstance(ch, MultiPropAdd) else ch.removed
+    if is_array:
+        return [(el,) for el in values]
+    else:
+        return values
+
+
+def _array_type(type_name: TypeName) -> TypeName:
+    return ParametricTypeName(
+        SchemaPath.from_segments("std", "array"),
+        [type_name],
+    )
+
+
+def _array_of_tuples_type(type_name: TypeName) -> TypeName:
+    return _array_type(
+        ParametricTypeName(
+            SchemaPath.from_segments("std", "tuple"),
+            [type_name],
+        ),
+    )
+
+
+def _pack_flat_insert_args(change: ModelChange) -> tuple[object, ...] | int:
+    # Must produce the same arguments as SaveExecutor._compile_change()
+    # does for inserts of properties.
+    if not change.fields:
+        return 0
+
+    args: list[object] = []
+    for ch in change.fields.values():
+        assert isinstance(ch, (PropertyChange, MultiPropAdd))
+        args.append(_pack_property_arg(ch))
+
+    return tuple(args)
+
+
 @_struct
 class CompiledQuery:
     single_query: str
@@ -1305,6 +1592,7 @@ class SaveExecutor:
     refetch: bool
     save_postcheck: bool
     warn_on_large_sync_set: bool
+    batch_size: int = MAX_BATCH_SIZE
 
     refetched_data: list[tuple[RefetchShape, Iterable[GelModel]]] = (
         dataclasses.field(init=False)
@@ -1539,13 +1827,34 @@ class SaveExecutor:
     def _compile_batch(
         self, batch: ChangeBatch, /, *, for_insert: bool
     ) -> list[QueryBatch]:
-        compiled = [
-            (
-                type(change.model),
-                self._compile_change(change, for_insert=for_insert),
-            )
-            for change in batch
-        ]
+        compiled: list[tuple[type[GelModel], CompiledQuery]] = []
+
+        # Inserts that only set properties compile to the same query for
+        # all objects of a type that set the same fields, so compile it
+        # once and only pack the arguments for the rest of them.
+        flat_inserts: dict[
+            tuple[type[GelModel], tuple[str, ...]], CompiledQuery
+        ] = {}
+
+        for change in batch:
+            model_type = type(change.model)
+            if for_insert and _is_flat_insert(change):
+                key = (model_type, tuple(change.fields))
+                template = flat_inserts.get(key)
+                if template is None:
+                    cq = self._compile_change(change, for_insert=True)
+                    flat_inserts[key] = cq
+                else:
+                    cq = CompiledQuery(
+                        single_query=template.single_query,
+                        multi_query=template.multi_query,
+                        args_query=template.args_query,
+                        arg=_pack_flat_insert_args(change),
+                        change=change,
+                    )
+            else:
+                cq = self._compile_change(change, for_insert=for_insert)
+            compiled.append((model_type, cq))
 
         # Queries must be independent of each other within the same
         # ChangeBatch, so we can sort them to group queries.
@@ -1563,7 +1872,7 @@ class SaveExecutor:
             if (
                 ctype is local_queries[-1][0][0]
                 and cq.single_query == local_queries[-1][0][1].single_query
-                and len(local_queries[-1]) < MAX_BATCH_SIZE
+                and len(local_queries[-1]) < self.batch_size
             ):
                 local_queries[-1].append((ctype, cq))
             else:
@@ -1592,6 +1901,39 @@ class SaveExecutor:
         if self.updates:
             yield self._compile_batch(self.updates, for_insert=False)
 
+    def iter_flights(self, debug: SaveDebug) -> Iterator[SaveFlight]:
+        """Yield the queries to send to the server, one flight at a time.
+
+        The results of each flight must be recorded before the next one
+        is requested: queries of later flights are compiled against the
+        ids of objects inserted by earlier ones.
+        """
+        refetched = False
+
+        batch_groups = iter(self)
+        while True:
+            st = time.monotonic()
+            batches = next(batch_groups, None)
+            if batches is None:
+                break
+
+            queries: list[QueryBatch | QueryRefetch] = list(batches)
+            if self.refetch and not any(b.insert for b in batches):
+                # Updates come last and don't produce new object ids,
+                # so the refetch queries can be sent in the same flight.
+                queries.extend(self.get_refetch_queries())
+                refetched = True
+
+            debug.compile_time += time.monotonic() - st
+            yield SaveFlight(queries=queries)
+
+        if self.refetch and not refetched:
+            st = time.monotonic()
+            queries = list(self.get_refetch_queries())
+            debug.compile_time += time.monotonic() - st
+            if queries:
+                yield SaveFlight(queries=queries)
+
     def _apply_refetched_data(self) -> None:
         for shape, obj_data in self.refetched_data:
             self._apply_refetched_data_shape(shape, obj_data)
@@ -1713,6 +2055,16 @@ class SaveExecutor:
                 model_dict[field] = new_value
 
     def _commit(self) -> None:
+        # Snapshot the dirty objects before new ones get committed below;
+        # `_commit_recursive()` still has to get to the new ones for
+        # their collections.
+        pending = None
+        if not self.refetch:
+            pending = _dirty.Pending()
+            for obj in self.new_object_ids:
+                pending.discard(obj)
+                pending.require(obj)
+
         for obj, new_id in self.new_object_ids.items():
             assert new_id is not None
 
@@ -1752,76 +2104,89 @@ class SaveExecutor:
                         _identity_func,
                     )
 
-        self._commit_recursive()
+        self._commit_recursive(pending)
 
-    def _commit_recursive(self) -> None:
-        visited: IDTracker[GelModel, None] = IDTracker()
+    def _commit_one(self, obj: GelModel) -> None:
+        # Commit `obj` along with its collections and the link props
+        # of its links; linked objects are committed by the caller.
+        obj.__gel_commit__()
 
-        def _traverse(obj: GelModel) -> None:
-            if obj in visited:
-                return
+        for prop in get_pointers(type(obj)):
+            if prop.computed:
+                # (1) we don't want to traverse computeds (they don't
+                #     form the actual dependency graph, real links do)
+                #
+                # (2) we need to commit changes to multi props and
+                #     multi links
+                continue
 
-            assert not isinstance(obj, ProxyModel)
+            linked = model_attr(obj, prop.name, _unset)
+            if linked in _STOP_LINK_TRAVERSAL:
+                # If users mess-up with user-defined types and some
+                # of the data isn't fetched, we don't want to crash
+                # with an AttributeErorr, it's not critical here.
+                # Not fetched means not used, which is good for save().
+                continue
 
-            visited.track(obj)
-            obj.__gel_commit__()
+            if prop.kind is PointerKind.Link:
+                if prop.cardinality.is_multi():
+                    if is_link_wprops_set(linked):
+                        for proxy in linked._items:
+                            get_proxy_linkprops(proxy).__gel_commit__()
+                    else:
+                        assert is_link_set(linked)
+                    linked.__gel_commit__()
+                elif isinstance(linked, ProxyModel):
+                    get_proxy_linkprops(linked).__gel_commit__()
 
-            for prop in get_pointers(type(obj)):
-                if prop.computed:
-                    # (1) we don't want to traverse computeds (they don't
-                    #     form the actual dependency graph, real links do)
-                    #
-                    # (2) we need to commit changes to multi props and
-                    #     multi links
-                    continue
+            else:
+                assert prop.kind is PointerKind.Property
+                if prop.cardinality.is_multi():
+                    assert is_prop_list(linked)
+
+                    if prop.mutable and not self.refetch:
+                        # If we're not refetching, we can't use
+                        # nested tracked lists will not get "committed"
+                        # (nothing will call "__gel_commit__" on them),
+                        # so we have to commit them manually.
+                        multi_prop_commit_recursive(linked)
+                    else:
+                        linked.__gel_commit__()
+                elif prop.mutable and not self.refetch:
+                    # Single property can be an array -- in this case
+                    # we still need to commit it recursively;
+                    # see the above comment.
+                    multi_prop_commit_recursive(linked)
+
+    def _commit_recursive(self, pending: _dirty.Pending | None = None) -> None:
+        # If `pending` is passed, only the objects it has yet to see
+        # (and things they hold) have anything to commit; see
+        # `make_plan()`.
+        #
+        # Like `iter_graph()`, this uses an explicit stack rather than
+        # recursion so that deep link chains can be committed.
+        visited: IDTracker[GelModel, None] = IDTracker()
 
-                linked = model_attr(obj, prop.name, _unset)
-                if linked in _STOP_LINK_TRAVERSAL:
-                    # If users mess-up with user-defined types and some
-                    # of the data isn't fetched, we don't want to crash
-                    # with an AttributeErorr, it's not critical here.
-                    # Not fetched means not used, which is good for save().
-                    continue
+        stack: list[Iterator[GelModel]] = [iter(self.objs)]
+        while stack:
+            obj = next(stack[-1], None)
+            if obj is None:
+                stack.pop()
+                continue
 
-                if prop.kind is PointerKind.Link:
-                    if prop.cardinality.is_multi():
-                        if is_link_wprops_set(linked):
-                            for proxy in linked._items:
-                                get_proxy_linkprops(proxy).__gel_commit__()
-                                _traverse(unwrap_proxy_no_check(proxy))
-                        else:
-                            assert is_link_set(linked)
-                            for model in linked._items:
-                                _traverse(model)
-                        linked.__gel_commit__()
-                    else:
-                        if isinstance(linked, ProxyModel):
-                            get_proxy_linkprops(linked).__gel_commit__()
-                            _traverse(unwrap_proxy_no_check(linked))
-                        else:
-                            _traverse(cast("GelModel", linked))
+            if obj in visited:
+                continue
 
-                else:
-                    assert prop.kind is PointerKind.Property
-                    if prop.cardinality.is_multi():
-                        assert is_prop_list(linked)
-
-                        if prop.mutable and not self.refetch:
-                            # If we're not refetching, we can't use
-                            # nested tracked lists will not get "committed"
-                            # (nothing will call "__gel_commit__" on them),
-                            # so we have to commit them manually.
-                            multi_prop_commit_recursive(linked)
-                        else:
-                            linked.__gel_commit__()
-                    elif prop.mutable and not self.refetch:
-                        # Single property can be an array -- in this case
-                        # we still need to commit it recursively;
-                        # see the above comment.
-                        multi_prop_commit_recursive(linked)
+            assert not isinstance(obj, ProxyModel)
 
-        for o in self.objs:
-            _traverse(o)
+            if pending is not None:
+                if not pending:
+                    break
+                discard_seen(obj, pending)
+
+            visited.track(obj)
+            self._commit_one(obj)
+            stack.append(iter_linked(obj))
 
         if self.save_postcheck:
             self._post_commit_check()
@@ -1837,13 +2202,11 @@ class SaveExecutor:
 
         visited: IDTracker[GelModel, None] = IDTracker()
 
-        def _check_recursive(obj: GelModel, path: pathlib.Path) -> None:
-            if obj in visited:
-                return
-
-            assert not isinstance(obj, ProxyModel)
-
-            visited.track(obj)
+        def _check_one(
+            obj: GelModel, path: pathlib.Path
+        ) -> list[tuple[GelModel, pathlib.Path]]:
+            # Check `obj` and return the linked objects to check next.
+            linked: list[tuple[GelModel, pathlib.Path]] = []
 
             path /= f"{type(obj).__qualname__}:{obj.id}"
 
@@ -1855,6 +2218,8 @@ class SaveExecutor:
                 raise ValueError(f"{path} has non-uuid id after save()")
             if obj.__gel_new__:
                 raise ValueError(f"{path} has __gel_new__ set")
+            if _dirty.is_marked(obj):
+                raise ValueError(f"{path} is still marked dirty after save")
 
             for prop in get_pointers(type(obj)):
                 val = model_attr(obj, prop.name, _unset)
@@ -1876,13 +2241,13 @@ class SaveExecutor:
                                         f"after save"
                                     )
                                 unwrapped = unwrap_proxy_no_check(proxy)
-                                _check_recursive(unwrapped, list_path)
+                                linked.append((unwrapped, list_path))
                         elif not prop.computed:
                             assert is_link_set(val)
                             val.__gel_post_commit_check__(link_path)
                             for i, model in enumerate(val._items):
                                 list_path = link_path / str(i)
-                                _check_recursive(model, list_path)
+                                linked.append((model, list_path))
                     else:
                         if isinstance(val, ProxyModel):
                             if get_proxy_linkprops(
@@ -1892,11 +2257,11 @@ class SaveExecutor:
                                     f"{link_path} has changed link props "
                                     f"after save"
                                 )
-                            _check_recursive(
-                                unwrap_proxy_no_check(val), link_path
+                            linked.append(
+                                (unwrap_proxy_no_check(val), link_path)
                             )
                         else:
-                            _check_recursive(cast("GelModel", val), link_path)
+                            linked.append((cast("GelModel", val), link_path))
 
                 else:
                     assert prop.kind is PointerKind.Property
@@ -1904,15 +2269,32 @@ class SaveExecutor:
                         assert is_prop_list(val)
                         val.__gel_post_commit_check__(link_path)
 
-        for o in self.objs:
-            _check_recursive(o, pathlib.Path())
+            return linked
+
+        root = pathlib.Path()
+        stack = [iter([(o, root) for o in self.objs])]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+
+            obj, path = item
+            if obj in visited:
+                continue
+
+            assert not isinstance(obj, ProxyModel)
+
+            visited.track(obj)
+            stack.append(iter(_check_one(obj, path)))
 
         # Final check: make sure that the save plan is empty
-        # in case we've missed something in `_check_recursive()`.
+        # in case we've missed something in `_check_one()`.
         plan = make_plan(
             self.objs,
             refetch=self.refetch,
             warn_on_large_sync_set=False,
+            full_traversal=True,
         )
         if plan.create_batches or plan.update_batch:
             raise ValueError("non-empty save plan after save()")
@@ -1935,11 +2317,6 @@ class SaveExecutor:
         args: list[object] = []
         args_types: list[TypeName] = []
 
-        def typename_is_array(type_name: TypeName) -> bool:
-            return isinstance(type_name, ParametricTypeName) and (
-                type_name.type_.parts in {("array",), ("std", "array")}
-            )
-
         def arg_cast(
             type_name: TypeName,
         ) -> tuple[TypeName, Callable[[str], str], Callable[[object], object]]:
@@ -1960,7 +2337,7 @@ class SaveExecutor:
             #
             # The nested tuple indirection is needed to support
             # link props that have types of arrays.
-            if typename_is_array(ch.info.type):
+            if _is_array_type(ch.info.type):
                 cast = ParametricTypeName(
                     SchemaPath.from_segments("std", "array"),
                     [
@@ -1996,78 +2373,27 @@ class SaveExecutor:
 
         for ch in change.fields.values():
             if isinstance(ch, PropertyChange):
-                if ch.info.cardinality.is_optional():
-                    tp_cast, tp_unpack, arg_pack = arg_cast(ch.info.type)
-                    arg = add_arg(
-                        tp_cast,
-                        arg_pack(ch.value),
-                    )
-                    shape_parts.append(
-                        f"{quote_ident(ch.name)} := {tp_unpack(arg)}"
-                    )
-                else:
-                    assert ch.value is not None
-                    arg = add_arg(ch.info.type, ch.value)
-                    shape_parts.append(f"{quote_ident(ch.name)} := {arg}")
+                assert (
+                    ch.value is not None or ch.info.cardinality.is_optional()
+                )
+                arg_t, unpack = _property_arg_type(ch)
+                arg = add_arg(arg_t, _pack_property_arg(ch))
+                shape_parts.append(f"{quote_ident(ch.name)} := {unpack(arg)}")
 
             elif isinstance(ch, MultiPropAdd):
-                # Since we're passing a set of values packed into an array
-                # we need to wrap elements in tuples to allow multi props
-                # or arrays etc.
-
                 assign_op = ":=" if for_insert else "+="
-                if typename_is_array(ch.info.type):
-                    arg_t = ParametricTypeName(
-                        SchemaPath.from_segments("std", "array"),
-                        [
-                            ParametricTypeName(
-                                SchemaPath.from_segments("std", "tuple"),
-                                [ch.info.type],
-                            ),
-                        ],
-                    )
-                    arg = add_arg(arg_t, [(el,) for el in ch.added])
-                    shape_parts.append(
-                        f"{quote_ident(ch.name)} {assign_op} "
-                        f"std::array_unpack({arg}).0"
-                    )
-                else:
-                    arg_t = ParametricTypeName(
-                        SchemaPath.from_segments("std", "array"),
-                        [ch.info.type],
-                    )
-                    arg = add_arg(arg_t, ch.added)
-                    shape_parts.append(
-                        f"{quote_ident(ch.name)} {assign_op} "
-                        f"std::array_unpack({arg})"
-                    )
+                arg_t, unpack = _property_arg_type(ch)
+                arg = add_arg(arg_t, _pack_property_arg(ch))
+                shape_parts.append(
+                    f"{quote_ident(ch.name)} {assign_op} {unpack(arg)}"
+                )
 
             elif isinstance(ch, MultiPropRemove):
                 assert not for_insert
 
-                if typename_is_array(ch.info.type):
-                    arg_t = ParametricTypeName(
-                        SchemaPath.from_segments("std", "array"),
-                        [
-                            ParametricTypeName(
-                                SchemaPath.from_segments("std", "tuple"),
-                                [ch.info.type],
-                            ),
-                        ],
-                    )
-                    arg = add_arg(arg_t, [(el,) for el in ch.removed])
-                    shape_parts.append(
-                        f"{quote_ident(ch.name)} -= std::array_unpack({arg}).0"
-                    )
-                else:
-                    arg_t = ParametricTypeName(
-                        SchemaPath.from_segments("std", "array"),
-                        [ch.info.type],
-                    )
-                    arg = add_arg(arg_t, ch.removed)
-                    shape_parts.append(
-                        f"{quote_ident(ch.name)} -= std::array_unpack({arg})"
-                    )
+                arg_t, unpack = _property_arg_type(ch)
+                arg = add_arg(arg_t, _pack_property_arg(ch))
+                shape_parts.append(f"{quote_ident(ch.name)} -= {unpack(arg)}")
 
             elif isinstance(ch, SingleLinkChange):
                 tid = (
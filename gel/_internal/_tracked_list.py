@@ -30,9 +30,15 @@ from collections.abc import (
     Sequence,
 )
 
+import bisect
 import copy
+import datetime
+import decimal
 import functools
+import operator
+import uuid
 
+from gel._internal import _dirty
 from gel._internal import _typing_inspect
 from gel._internal import _typing_parametric as parametric
 from gel._internal._polyfills._strenum import StrEnum
@@ -56,6 +62,25 @@ class Mode(StrEnum):
     ReadWrite = "ReadWrite"
 
 
+# Types whose instances can't be (or hold) collections: none of them
+# can be combined with `list` or `tuple` in a subclass.
+_SCALAR_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    decimal.Decimal,
+    uuid.UUID,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+)
+
+# Placeholder for an item dropped by `remove()` until the list is
+# compacted; see `AbstractTrackedList._item_list`.
+_REMOVED: Any = object()
+
+
 P = ParamSpec("P")
 R = TypeVar("R")
 S = TypeVar("S", bound="AbstractCollection[Any]", covariant=True)
@@ -81,7 +106,7 @@ def requires_read(
 
 
 class AbstractCollection(Iterable[_T_co], Generic[_T_co]):
-    __slots__ = ()
+    __slots__ = ("__weakref__",)
 
     type: ClassVar[type[_T_co]]  # type: ignore [misc]
 
@@ -133,10 +158,6 @@ class AbstractCollection(Iterable[_T_co], Generic[_T_co]):
         else:
             self._items = []
 
-            # 'extend' is optimized in LinkWithPropsSet
-            # for use in __init__
-            self.__gel_extend__(iterable)
-
             # This is a new collection set to link/prop explicitly,
             # we want to override the link/prop with this new data
             # on save. That said, this could be set to "False" by
@@ -145,6 +166,10 @@ class AbstractCollection(Iterable[_T_co], Generic[_T_co]):
                 True if __overwrite_data__ is None else __overwrite_data__
             )
 
+            # 'extend' is optimized in LinkWithPropsSet
+            # for use in __init__
+            self.__gel_extend__(iterable)
+
             self._mode = __mode__
 
     def __gel_extend__(self, it: Iterable[_T_co]) -> None:
@@ -171,6 +196,7 @@ class AbstractCollection(Iterable[_T_co], Generic[_T_co]):
         # that now we'll be tracking changes and generating update
         # queries for the collection (not replacement queries.)
         self.__gel_overwrite_data__ = False
+        _dirty.unmark(self)
 
     def __gel_post_commit_check__(self, path: Path) -> None:
         # This hook is only run in tests, when the client is configured with
@@ -183,6 +209,13 @@ class AbstractCollection(Iterable[_T_co], Generic[_T_co]):
     def __gel_basetype_iter__(self) -> Iterator[_T_co]:
         return iter(self._items)
 
+    @classmethod
+    def __gel_holds_scalars__(cls) -> bool:
+        # Element types are enforced, so e.g. a list of `str` can't hold
+        # nested collections and there's no need to walk its items.
+        tp = getattr(cls, "type", None)
+        return isinstance(tp, type) and issubclass(tp, _SCALAR_TYPES)
+
     def unsafe_iter(self) -> Iterator[_T_co]:
         """Iterate over the list disregarding the access mode."""
         return iter(self._items)
@@ -243,30 +276,174 @@ class AbstractTrackedList(
 
     __slots__ = (
         "_added_items",
+        "_dead",
+        "_delta",
+        "_index",
+        "_item_list",
+        "_modified",
+        "_original",
+        "_positions",
         "_removed_items",
+        "_unhashable",
     )
 
-    # Initial snapshot for change tracking
+    # Changes since the first `_ensure_snapshot()` call; both are None
+    # when there are none.  While `_index` is available, changes are
+    # counted in `_delta` instead (and these stay empty).
     _added_items: list[_T_co] | None
     _removed_items: list[_T_co] | None
+    # Net changes as signed occurrence counts: positive for added values,
+    # negative for removed ones.  An add followed by a remove (or vice
+    # versa) cancels out; values with a zero count are dropped.
+    #
+    # That is only right for multi properties, which are unordered.
+    # Lists holding array values are saved whole if the items differ
+    # from `_original`, the items as of the first change, which covers
+    # reordering them too.  `_modified` is False while they are known
+    # to be equal; `_original` is None if unknown (after unpickling).
+    _delta: dict[_T_co, int] | None
+    _modified: bool
+    _original: list[_T_co] | None
+    # Occurrence counts of the current items, built on demand by
+    # `_ensure_index()` and kept up to date by all mutations.  Makes
+    # `in` and `remove()` O(1).  Stays None if the items aren't hashable.
+    _index: dict[_T_co, int] | None
+    _unhashable: bool
+    # Storage for `_items`.  `remove()` overwrites the item with
+    # `_REMOVED` rather than shifting the ones after it, finding it via
+    # `_positions`, the position of each value (or a sorted list of them
+    # if it occurs more than once), built on demand.
+    # `_dead` holds the sorted positions of the `_REMOVED` placeholders,
+    # so that indexing maps to the right position in O(log n).  They are
+    # dropped in one pass when the order of the items is next needed or
+    # when they make up half the storage.
+    _item_list: list[_T_co]
+    _dead: list[int]
+    _positions: dict[_T_co, int | list[int]] | None
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self._added_items = None
         self._removed_items = None
+        self._delta = None
+        self._modified = False
+        self._original = None
         super().__init__(*args, **kwargs)
 
+    @property
+    def _items(self) -> list[_T_co]:
+        if self._dead:
+            self._compact()
+        return self._item_list
+
+    @_items.setter
+    def _items(self, items: list[_T_co]) -> None:
+        self._item_list = items
+        self._dead = []
+        self._positions = None
+        self._index = None
+        self._unhashable = False
+
+    def _compact(self) -> None:
+        items = self._item_list
+        items[:] = [item for item in items if item is not _REMOVED]
+        self._dead = []
+        self._positions = None
+
+    def _len(self) -> int:
+        return len(self._item_list) - len(self._dead)
+
+    def _locate(self, index: SupportsIndex) -> int:
+        """Return the position in `_item_list` of the item at `index`."""
+        i = operator.index(index)
+        dead = self._dead
+        if i < 0:
+            i += len(self._item_list) - len(dead)
+        if not 0 <= i < len(self._item_list) - len(dead):
+            raise IndexError("list index out of range")
+        # Find the first position with i + 1 live items up to it.
+        lo, hi = i, i + len(dead)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mid + 1 - bisect.bisect_right(dead, mid) <= i:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _ensure_positions(self) -> dict[_T_co, int | list[int]]:
+        positions = self._positions
+        if positions is None:
+            items = self._items
+            positions = dict(zip(items, range(len(items)), strict=True))
+            if len(positions) < len(items):
+                # Duplicates: the above kept the last positions.
+                positions = {}
+                for pos, item in enumerate(items):
+                    self._add_position(item, pos, positions)
+            self._positions = positions
+        return positions
+
+    def _add_position(
+        self,
+        value: _T_co,  # type: ignore [misc]
+        pos: int,
+        positions: dict[_T_co, int | list[int]] | None = None,
+    ) -> None:
+        if positions is None:
+            positions = self._positions
+            assert positions is not None
+        found = positions.get(value)
+        if found is None:
+            positions[value] = pos
+        elif isinstance(found, int):
+            positions[value] = [found, pos] if found < pos else [pos, found]
+        else:
+            bisect.insort(found, pos)
+
+    def _drop_position(self, value: _T_co, pos: int) -> None:  # type: ignore [misc]
+        positions = self._positions
+        assert positions is not None
+        found = positions[value]
+        if isinstance(found, int):
+            del positions[value]
+        else:
+            found.remove(pos)
+            if len(found) == 1:
+                positions[value] = found[0]
+
+    def _take(self, pos: int) -> _T_co:
+        """Remove the item at position `pos` of `_item_list`."""
+        items = self._item_list
+        item = items[pos]
+        if self._positions is not None:
+            self._drop_position(item, pos)
+        if pos == len(items) - 1:
+            items.pop()
+        elif self._positions is not None:
+            items[pos] = _REMOVED
+            bisect.insort(self._dead, pos)
+            if len(self._dead) * 2 > len(items):
+                self._compact()
+        else:
+            del items[pos]
+        return item
+
     def __copy__(self, *, deep: bool = False) -> Self:
         obj = type(self).__new__(type(self))
 
         obj.__gel_overwrite_data__ = self.__gel_overwrite_data__
         obj._mode = self._mode
         obj._items = copy.deepcopy(self._items) if deep else list(self._items)
-        obj._added_items = (
-            list(self._added_items) if self._added_items else None
-        )
-        obj._removed_items = (
-            list(self._removed_items) if self._removed_items else None
-        )
+        if self.__gel_has_changes__():
+            obj._added_items = self.__gel_get_added__()
+            obj._removed_items = self.__gel_get_removed__()
+        else:
+            obj._added_items = obj._removed_items = None
+        obj._delta = None
+        obj._modified = self._modified
+        obj._original = self._original
+        if _dirty.is_marked(self):
+            _dirty.mark(obj)
         return obj
 
     def __deepcopy__(self, memo: dict[int, Any]) -> Self:
@@ -276,27 +453,179 @@ class AbstractTrackedList(
         self.extend(it)
 
     def _ensure_snapshot(self) -> None:
+        if not self.__gel_overwrite_data__:
+            _dirty.mark(self)
         if self._added_items is None:
+            self._original = list(self._items)
             self._added_items = []
         if self._removed_items is None:
             self._removed_items = []
+        if self._index is not None and self._delta is None:
+            self._delta = {}
+
+    def _ensure_index(self) -> bool:
+        """Build `_index` (and `_delta`) unless done already.
+
+        Return False if the items are not hashable.
+        """
+        if self._index is not None:
+            return True
+        if self._unhashable:
+            return False
+
+        items = self._items
+        delta: dict[_T_co, int] = {}
+        try:
+            # Usually there are no duplicates; count in C if so.
+            index = dict.fromkeys(items, 1)
+            if len(index) < len(items):
+                index = {}
+                for item in items:
+                    index[item] = index.get(item, 0) + 1
+            for item in self._added_items or ():
+                delta[item] = delta.get(item, 0) + 1
+            for item in self._removed_items or ():
+                delta[item] = delta.get(item, 0) - 1
+        except TypeError:
+            self._unhashable = True
+            return False
+
+        self._index = index
+        if self._added_items is not None:
+            self._delta = {k: v for k, v in delta.items() if v}
+            self._added_items = []
+            self._removed_items = []
+        return True
+
+    def _drop_index(self) -> None:
+        # An unhashable value showed up: move the counted changes
+        # back to `_added_items` and `_removed_items`.
+        self._items  # noqa: B018  # compact first
+        delta = self._delta
+        self._index = self._delta = self._positions = None
+        self._unhashable = True
+        if delta:
+            assert self._added_items is not None
+            assert self._removed_items is not None
+            for value, count in delta.items():
+                if count > 0:
+                    self._added_items.extend([value] * count)
+                else:
+                    self._removed_items.extend([value] * -count)
+
+    def _count(self, value: _T_co, n: int) -> None:  # type: ignore [misc]
+        # Raises TypeError (before changing anything) if `value`
+        # is not hashable.
+        index = self._index
+        assert index is not None
+        count = index.get(value, 0) + n
+        if count:
+            index[value] = count
+        else:
+            del index[value]
+
+        delta = self._delta
+        assert delta is not None
+        count = delta.get(value, 0) + n
+        if count:
+            delta[value] = count
+        else:
+            del delta[value]
+
+    def _track_added(self, values: Iterable[_T_co]) -> None:
+        # Call after `_ensure_snapshot()` and after adding `values`
+        # to the items.
+        added = self._added_items
+        removed = self._removed_items
+        assert added is not None
+        assert removed is not None
+        for value in values:
+            self._modified = True
+            if self._index is not None:
+                try:
+                    self._count(value, 1)
+                except TypeError:
+                    self._drop_index()
+                else:
+                    continue
+
+            if removed:
+                try:
+                    removed.remove(value)
+                except ValueError:
+                    pass
+                else:
+                    continue
+            added.append(value)
+
+    def _track_removed(self, values: Iterable[_T_co]) -> None:
+        # Call after `_ensure_snapshot()` and after removing `values`
+        # from the items.  Call `_ensure_index()` *before* removing them,
+        # so that they are accounted for in the index.
+        added = self._added_items
+        removed = self._removed_items
+        assert added is not None
+        assert removed is not None
+        for value in values:
+            self._modified = True
+            if self._index is not None:
+                try:
+                    self._count(value, -1)
+                except TypeError:
+                    self._drop_index()
+                else:
+                    continue
+
+            if added:
+                try:
+                    added.remove(value)
+                except ValueError:
+                    pass
+                else:
+                    continue
+            removed.append(value)
 
     def __gel_replace_with_empty__(self) -> None:
         self.clear()
 
     def __gel_get_added__(self) -> list[_T_co]:
-        return [] if self._added_items is None else list(self._added_items)
-
-    def __gel_get_removed__(self) -> Iterable[_T_co]:
-        return () if self._removed_items is None else self._removed_items
+        if self._added_items is None:
+            return []
+        added = list(self._added_items)
+        if self._delta:
+            for value, count in self._delta.items():
+                if count > 0:
+                    added.extend([value] * count)
+        return added
+
+    def __gel_get_removed__(self) -> list[_T_co]:
+        if self._removed_items is None:
+            return []
+        removed = list(self._removed_items)
+        if self._delta:
+            for value, count in self._delta.items():
+                if count < 0:
+                    removed.extend([value] * -count)
+        return removed
 
     def __gel_has_changes__(self) -> bool:
         if self._added_items is None:
             return False
-        return bool(self._added_items) or bool(self._removed_items)
+        if self._added_items or self._removed_items or self._delta:
+            return True
+        # Same values as before: changed only if their order is.
+        if (
+            self._modified
+            and self._original is not None
+            and self._items == self._original
+        ):
+            self._modified = False
+        return self._modified
 
     def __gel_commit__(self) -> None:
-        self._added_items = self._removed_items = None
+        self._added_items = self._removed_items = self._delta = None
+        self._modified = False
+        self._original = None
         super().__gel_commit__()
 
     def __gel_post_commit_check__(self, path: Path) -> None:
@@ -304,6 +633,8 @@ class AbstractTrackedList(
             raise ValueError(f"{path} has non-empty `self._added_items`")
         if self._removed_items is not None:
             raise ValueError(f"{path} has non-empty `self._removed_items`")
+        if self._delta is not None:
+            raise ValueError(f"{path} has non-empty `self._delta`")
         super().__gel_post_commit_check__(path)
 
     def _check_value(self, value: Any) -> _T_co:
@@ -340,8 +671,10 @@ class AbstractTrackedList(
     def __getitem__(self, index: SupportsIndex | slice) -> _T_co | Self:
         if isinstance(index, slice):
             return type(self)(self._items[index], __mode__=Mode.ReadWrite)
+        elif self._dead:
+            return self._item_list[self._locate(index)]
         else:
-            return self._items[index]
+            return self._item_list[index]
 
     def __setitem__(
         self,
@@ -349,33 +682,45 @@ class AbstractTrackedList(
         value: _T_co | Iterable[_T_co],
     ) -> None:
         self._ensure_snapshot()
+        self._ensure_index()
         if isinstance(index, slice):
             new_values = self._check_values(value)  # type: ignore [arg-type]
-            self._items[index] = new_values
-            assert self._added_items is not None
-            self._added_items.extend(new_values)
+            items = self._items
+            old_values = items[index]
+            items[index] = new_values
+            self._positions = None
+            self._track_removed(old_values)
+            self._track_added(new_values)
         else:
             new_value = self._check_value(value)
-            self._items[index] = new_value
-            assert self._added_items is not None
-            self._added_items.append(new_value)
+            pos = self._locate(index)
+            old_value = self._item_list[pos]
+            self._item_list[pos] = new_value
+            self._track_removed((old_value,))
+            self._track_added((new_value,))
+            if self._positions is not None:
+                self._drop_position(old_value, pos)
+                self._add_position(new_value, pos)
 
     def __delitem__(self, index: SupportsIndex | slice) -> None:
         self._ensure_snapshot()
-        assert self._removed_items is not None
-
+        self._ensure_index()
         if isinstance(index, slice):
-            items = self._items[index]
-            del self._items[index]
-            self._removed_items.extend(items)
+            items = self._items
+            old_values = items[index]
+            del items[index]
+            self._positions = None
         else:
-            item = self._items[index]
-            del self._items[index]
-            self._removed_items.append(item)
+            old_values = [self._take(self._locate(index))]
+        self._track_removed(old_values)
+
+    def unsafe_len(self) -> int:
+        """Return the length of the list disregarding the access mode."""
+        return self._len()
 
     @requires_read("get the length of", unsafe="unsafe_len()")
     def __len__(self) -> int:
-        return len(self._items)
+        return self._len()
 
     @requires_read("iterate over", unsafe="unsafe_iter()")
     def __iter__(self) -> Iterator[_T_co]:
@@ -383,52 +728,93 @@ class AbstractTrackedList(
 
     @requires_read("use `in` operator on")
     def __contains__(self, item: object) -> bool:
+        if self._ensure_index():
+            assert self._index is not None
+            try:
+                return item in self._index
+            except TypeError:
+                pass
         return item in self._items
 
     def insert(self, index: SupportsIndex, value: _T_co) -> None:  # type: ignore [misc]
         value = self._check_value(value)
         self._ensure_snapshot()
         self._items.insert(index, value)
-        assert self._added_items is not None
-        self._added_items.append(value)
+        self._positions = None
+        self._track_added((value,))
 
     def extend(self, values: Iterable[_T_co]) -> None:
         if values is self:
             values = list(self)
         values = self._check_values(values)
         self._ensure_snapshot()
-        self._items.extend(values)
-        assert self._added_items is not None
-        self._added_items.extend(values)
+        items = self._item_list
+        start = len(items)
+        items.extend(values)
+        self._track_added(values)
+        if self._positions is not None:
+            for pos, value in enumerate(values, start):
+                self._add_position(value, pos)
 
     def append(self, value: _T_co) -> None:  # type: ignore [misc]
         value = self._check_value(value)
         self._ensure_snapshot()
-        self._items.append(value)
-        assert self._added_items is not None
-        self._added_items.append(value)
+        items = self._item_list
+        items.append(value)
+        self._track_added((value,))
+        if self._positions is not None:
+            self._add_position(value, len(items) - 1)
 
     def remove(self, value: _T_co) -> None:  # type: ignore [misc]
         """Remove item; raise ValueError if missing."""
         self._ensure_snapshot()
-        self._items.remove(value)
-        assert self._removed_items is not None
-        self._removed_items.append(value)
+        index = self._index if self._ensure_index() else None
+        if index is not None:
+            try:
+                present = value in index
+            except TypeError:
+                self._drop_index()
+                index = None
+            else:
+                if not present:
+                    raise ValueError("list.remove(x): x not in list")
+                found = self._ensure_positions()[value]
+                self._take(found if isinstance(found, int) else found[0])
+
+        if index is None:
+            self._items.remove(value)
+        self._track_removed((value,))
 
     def pop(self, index: SupportsIndex = -1) -> _T_co:
         """Remove and return item at index (default last)."""
         self._ensure_snapshot()
-        item = self._items.pop(index)
-        assert self._removed_items is not None
-        self._removed_items.append(item)
+        self._ensure_index()
+        if not self._len():
+            raise IndexError("pop from empty list")
+        item = self._take(self._locate(index))
+        self._track_removed((item,))
         return item
 
     def clear(self) -> None:
         """Remove all items but keep element-type enforcement."""
         self._ensure_snapshot()
-        assert self._removed_items is not None
-        self._removed_items.extend(self._items)
-        self._items.clear()
+        items = self._items
+        if self._ensure_index():
+            assert self._index is not None
+            assert self._delta is not None
+            delta = self._delta
+            for value, count in self._index.items():
+                self._modified = True
+                net = delta.get(value, 0) - count
+                if net:
+                    delta[value] = net
+                else:
+                    del delta[value]
+            self._index.clear()
+        else:
+            self._track_removed(items)
+        items.clear()
+        self._positions = None
 
     @requires_read("index items of")
     def index(
@@ -446,6 +832,11 @@ class AbstractTrackedList(
 
     @requires_read("count items of")
     def count(self, value: _T_co) -> int:  # type: ignore [misc]
+        if self._index is not None:
+            try:
+                return self._index.get(value, 0)
+            except TypeError:
+                pass
         return self._items.count(value)
 
     __hash__ = None  # type: ignore [assignment]
@@ -553,10 +944,15 @@ class TrackedList(
                 cls.__parametric_origin__,
                 cls.type,
                 self._items,
-                self._added_items,
-                self._removed_items,
+                None
+                if self._added_items is None
+                else self.__gel_get_added__(),
+                None
+                if self._removed_items is None
+                else self.__gel_get_removed__(),
                 self._mode,
                 self.__gel_overwrite_data__,
+                self.__gel_has_changes__(),
             ),
         )
 
@@ -569,6 +965,7 @@ class TrackedList(
         removed_items: list[_T_co] | None,
         mode: Mode,
         gel_overwrite_data: bool,  # noqa: FBT001
+        modified: bool | None = None,  # noqa: FBT001
     ) -> TrackedList[_T_co]:
         cls = cast(
             "type[TrackedList[_T_co]]",
@@ -579,10 +976,21 @@ class TrackedList(
         lst._items = items
         lst._added_items = added_items
         lst._removed_items = removed_items
+        lst._delta = None
+        if modified is None:
+            # Pickled before reordering was tracked
+            modified = bool(added_items or removed_items)
+        lst._modified = modified
+        lst._original = None
 
         lst._mode = mode
         lst.__gel_overwrite_data__ = gel_overwrite_data
 
+        if not gel_overwrite_data and (
+            added_items is not None or removed_items is not None
+        ):
+            _dirty.mark(lst)
+
         return lst
 
 
@@ -605,10 +1013,15 @@ class DowncastingTrackedList(
                 cls.type,
                 cls.supertype,
                 self._items,
-                self._added_items,
-                self._removed_items,
+                None
+                if self._added_items is None
+                else self.__gel_get_added__(),
+                None
+                if self._removed_items is None
+                else self.__gel_get_removed__(),
                 self._mode,
                 self.__gel_overwrite_data__,
+                self.__gel_has_changes__(),
             ),
         )
 
@@ -622,6 +1035,7 @@ class DowncastingTrackedList(
         removed_items: list[_T_co] | None,
         mode: Mode,
         gel_overwrite_data: bool,  # noqa: FBT001
+        modified: bool | None = None,  # noqa: FBT001
     ) -> DowncastingTrackedList[_T_co, _BT]:
         cls = cast(
             "type[DowncastingTrackedList[_T_co, _BT]]",
@@ -632,8 +1046,19 @@ class DowncastingTrackedList(
         lst._items = items
         lst._added_items = added_items
         lst._removed_items = removed_items
+        lst._delta = None
+        if modified is None:
+            # Pickled before reordering was tracked
+            modified = bool(added_items or removed_items)
+        lst._modified = modified
+        lst._original = None
 
         lst._mode = mode
         lst.__gel_overwrite_data__ = gel_overwrite_data
 
+        if not gel_overwrite_data and (
+            added_items is not None or removed_items is not None
+        ):
+            _dirty.mark(lst)
+
         return lst
@@ -36,6 +36,10 @@ from . import errors
 from . import options
 from .protocol import protocol  # pyright: ignore [reportAttributeAccessIssue]
 
+if typing.TYPE_CHECKING:
+    from gel._internal import _query_cache
+    from gel.datatypes.columns import Columns
+
 __all__ = (
     "QueryWithArgs",
     "QueryCache",
@@ -47,6 +51,10 @@ __all__ = (
     "QueryJsonContext",
     "QuerySingleJsonContext",
     "QueryRequiredSingleJsonContext",
+    "QueryColumnsContext",
+    "QueryJsonElementsContext",
+    "QueryJsonBytesContext",
+    "QueryJsonBytesElementsContext",
     "Executor",
     "ExecuteContext",
     "AsyncIOExecutor",
@@ -175,12 +183,16 @@ class QueryWithArgs(Generic[_T_ql]):
 class QueryCache(typing.NamedTuple):
     codecs_registry: protocol.CodecsRegistry
     query_cache: protocol.LRUMapping
+    persistent_cache: _query_cache.PersistentQueryCache | None = None
 
 
 class QueryOptions(typing.NamedTuple):
     output_format: protocol.OutputFormat
     expect_one: bool
     required_one: bool
+    columnar: bool = False
+    parse_json: bool = False
+    json_bytes: bool = False
 
 
 @dataclasses.dataclass(kw_only=True, frozen=True)
@@ -193,6 +205,8 @@ class BaseQueryContext(Generic[_T_ql]):
     warning_handler: options.WarningHandler
     annotations: dict[str, str]
     transaction_options: options.TransactionOptions | None
+    lazy_decoding: bool = False
+    identity_map: options.IdentityMap | None = None
 
     def lower(
         self, *, allow_capabilities: enums.Capability
@@ -204,6 +218,7 @@ class BaseQueryContext(Generic[_T_ql]):
             kwargs=self.query.kwargs,
             reg=self.cache.codecs_registry,
             qc=self.cache.query_cache,
+            persistent_cache=self.cache.persistent_cache,
             input_language=self.query.input_language,
             output_format=self.query_options.output_format,
             expect_one=self.query_options.expect_one,
@@ -213,6 +228,11 @@ class BaseQueryContext(Generic[_T_ql]):
             state=self.state.as_dict() if self.state else None,
             annotations=self.annotations,
             transaction_options=self.transaction_options,
+            columnar=self.query_options.columnar,
+            lazy=self.lazy_decoding,
+            parse_json=self.query_options.parse_json,
+            json_bytes=self.query_options.json_bytes,
+            identity_map=self.identity_map,
         )
 
 
@@ -270,6 +290,46 @@ class QueryRequiredSingleJsonContext(BaseQueryContext[_T_ql]):
     )
 
 
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class QueryColumnsContext(BaseQueryContext[_T_ql]):
+    query_options: QueryOptions = QueryOptions(
+        output_format=protocol.OutputFormat.BINARY,
+        expect_one=False,
+        required_one=False,
+        columnar=True,
+    )
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class QueryJsonElementsContext(BaseQueryContext[_T_ql]):
+    query_options: QueryOptions = QueryOptions(
+        output_format=protocol.OutputFormat.JSON_ELEMENTS,
+        expect_one=False,
+        required_one=False,
+        parse_json=True,
+    )
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class QueryJsonBytesContext(BaseQueryContext[_T_ql]):
+    query_options: QueryOptions = QueryOptions(
+        output_format=protocol.OutputFormat.JSON,
+        expect_one=False,
+        required_one=False,
+        json_bytes=True,
+    )
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class QueryJsonBytesElementsContext(BaseQueryContext[_T_ql]):
+    query_options: QueryOptions = QueryOptions(
+        output_format=protocol.OutputFormat.JSON_ELEMENTS,
+        expect_one=False,
+        required_one=False,
+        json_bytes=True,
+    )
+
+
 @dataclasses.dataclass(kw_only=True, frozen=True)
 class ExecuteContext(Generic[_T_ql]):
     query: QueryWithArgs[_T_ql]
@@ -289,6 +349,7 @@ class ExecuteContext(Generic[_T_ql]):
             kwargs=self.query.kwargs,
             reg=self.cache.codecs_registry,
             qc=self.cache.query_cache,
+            persistent_cache=self.cache.persistent_cache,
             input_language=self.query.input_language,
             output_format=protocol.OutputFormat.NONE,
             allow_capabilities=allow_capabilities,
@@ -353,6 +414,12 @@ class BaseReadOnlyExecutor(abc.ABC):
     def _get_annotations(self) -> dict[str, str]:
         return {}
 
+    def _get_lazy_decoding(self) -> bool:
+        return False
+
+    def _get_identity_map(self) -> options.IdentityMap | None:
+        return None
+
 
 class ReadOnlyExecutor(BaseReadOnlyExecutor):
     """Subclasses can execute *at least* read-only queries"""
@@ -383,10 +450,21 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
         self, query_context: QueryRequiredSingleJsonContext[_T_ql]
     ) -> str: ...
 
+    @overload
+    def _query(self, query_context: QueryColumnsContext[_T_ql]) -> Columns: ...
+
+    @overload
+    def _query(self, query_context: QueryJsonBytesContext[_T_ql]) -> bytes: ...
+
     @abc.abstractmethod
     def _query(
         self, query_context: BaseQueryContext[_T_ql]
-    ) -> list[_T_ql] | _T_ql | str | None: ...
+    ) -> list[_T_ql] | _T_ql | str | bytes | Columns | None: ...
+
+    @abc.abstractmethod
+    def _query_iter(
+        self, query_context: BaseQueryContext[_T_ql]
+    ) -> typing.Iterator[_T_ql]: ...
 
     @abc.abstractmethod
     def _get_active_tx_options(
@@ -426,6 +504,160 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
+            )
+        )
+
+    @typing.overload
+    def query_iter(
+        self,
+        query: Queryable[_T_ql],
+        /,
+        **kwargs: Any,
+    ) -> typing.Iterator[_T_ql]: ...
+
+    @typing.overload
+    def query_iter(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.Iterator[Any]: ...
+
+    def query_iter(
+        self,
+        query: str | Queryable[_T_ql],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.Iterator[Any]:
+        """Run a query and iterate over its results as they arrive.
+
+        Unlike query(), the result set is never fully materialized:
+        rows are decoded and yielded as the server streams them, so
+        memory use stays flat regardless of the result size.  The
+        connection is held until the iterator is exhausted or closed;
+        closing it early discards the rest of the result.  Streamed
+        queries are not retried.
+        """
+        return self._query_iter(
+            QueryContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
+            )
+        )
+
+    def query_json_iter(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.Iterator[Any]:
+        """Run a query and iterate over its results parsed from JSON.
+
+        Each result element is sent by the server as a separate JSON
+        document and parsed straight into Python objects as it arrives,
+        so the JSON text of the whole result is never built.  The
+        client's *decode_json* parser is used if configured, otherwise
+        the fastest available one (orjson, msgspec or json).  Streaming
+        works like in query_iter().
+        """
+        return self._query_iter(
+            QueryJsonElementsContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+            )
+        )
+
+    def query_json_bytes(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> bytes:
+        """Like query_json(), but return the UTF-8 encoded JSON as bytes.
+
+        The bytes are taken from the received message as is, which
+        saves decoding the result into a str when it is only going to
+        be written out again, e.g. as an HTTP response body.
+        """
+        return self._query(
+            QueryJsonBytesContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+            )
+        )
+
+    def query_json_bytes_iter(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.Iterator[bytes]:
+        """Run a query and iterate over its results as JSON bytes.
+
+        Each result element is yielded as a UTF-8 encoded JSON document
+        as soon as it arrives.  Streaming works like in query_iter().
+        """
+        return self._query_iter(
+            QueryJsonBytesElementsContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+            )
+        )
+
+    def query_columns(
+        self,
+        query: str | Queryable[_T_ql],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Columns:
+        """Run a query and return its result as columns.
+
+        Each output field becomes one column holding the values of all
+        rows.  Required fields of fixed-width scalar types (integers,
+        floats, bool, uuid and datetime) are decoded straight into
+        contiguous array.array buffers without creating a Python object
+        per value; see :class:`gel.Columns`.
+        """
+        return self._query(
+            QueryColumnsContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -506,6 +738,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
             )
         )
 
@@ -534,6 +768,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
             )
         )
 
@@ -549,6 +785,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -567,6 +804,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -585,6 +823,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -609,6 +848,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -634,6 +874,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -717,9 +958,24 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
         self, query_context: QueryRequiredSingleJsonContext[_T_ql]
     ) -> str: ...
 
+    @overload
+    async def _query(
+        self, query_context: QueryColumnsContext[_T_ql]
+    ) -> Columns: ...
+
+    @overload
+    async def _query(
+        self, query_context: QueryJsonBytesContext[_T_ql]
+    ) -> bytes: ...
+
     @abc.abstractmethod
     async def _query(self, query_context: BaseQueryContext[_T_ql]) -> Any: ...
 
+    @abc.abstractmethod
+    def _query_iter(
+        self, query_context: BaseQueryContext[_T_ql]
+    ) -> typing.AsyncIterator[_T_ql]: ...
+
     @abc.abstractmethod
     def _get_active_tx_options(
         self,
@@ -758,6 +1014,163 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
+            )
+        )
+
+    @typing.overload
+    def query_iter(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.AsyncIterator[Any]: ...
+
+    @typing.overload
+    def query_iter(
+        self,
+        query: Queryable[_T_ql],
+        /,
+        **kwargs: Any,
+    ) -> typing.AsyncIterator[_T_ql]: ...
+
+    def query_iter(
+        self,
+        query: str | Queryable[_T_ql],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.AsyncIterator[Any]:
+        """Run a query and asynchronously iterate over its results.
+
+        Unlike query(), the result set is never fully materialized:
+        rows are decoded and yielded as the server streams them, and
+        reading from the network is paused while the consumer falls
+        behind.  The connection is held until the iterator is exhausted
+        or closed (use contextlib.aclosing() when breaking out early);
+        closing it early discards the rest of the result.  Streamed
+        queries are not retried.
+        """
+        return self._query_iter(
+            QueryContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
+            )
+        )
+
+    def query_json_iter(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.AsyncIterator[Any]:
+        """Run a query and asynchronously iterate over its results
+        parsed from JSON.
+
+        Each result element is sent by the server as a separate JSON
+        document and parsed straight into Python objects as it arrives,
+        so the JSON text of the whole result is never built.  The
+        client's *decode_json* parser is used if configured, otherwise
+        the fastest available one (orjson, msgspec or json).  Streaming
+        works like in query_iter().
+        """
+        return self._query_iter(
+            QueryJsonElementsContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+            )
+        )
+
+    async def query_json_bytes(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> bytes:
+        """Like query_json(), but return the UTF-8 encoded JSON as bytes.
+
+        The bytes are taken from the received message as is, which
+        saves decoding the result into a str when it is only going to
+        be written out again, e.g. as an HTTP response body.
+        """
+        return await self._query(
+            QueryJsonBytesContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+            )
+        )
+
+    def query_json_bytes_iter(
+        self,
+        query: str,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> typing.AsyncIterator[bytes]:
+        """Run a query and asynchronously iterate over its results as
+        JSON bytes.
+
+        Each result element is yielded as a UTF-8 encoded JSON document
+        as soon as it arrives.  Streaming works like in query_iter().
+        """
+        return self._query_iter(
+            QueryJsonBytesElementsContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+            )
+        )
+
+    async def query_columns(
+        self,
+        query: str | Queryable[_T_ql],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Columns:
+        """Run a query and return its result as columns.
+
+        Each output field becomes one column holding the values of all
+        rows.  Required fields of fixed-width scalar types (integers,
+        floats, bool, uuid and datetime) are decoded straight into
+        contiguous array.array buffers without creating a Python object
+        per value; see :class:`gel.Columns`.
+        """
+        return await self._query(
+            QueryColumnsContext(
+                query=QueryWithArgs.from_query(query, args, kwargs),
+                cache=self._get_query_cache(),
+                retry_options=self._get_retry_options(),
+                state=self._get_state(),
+                transaction_options=self._get_active_tx_options(),
+                warning_handler=self._get_warning_handler(),
+                annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -849,6 +1262,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
             )
         )
 
@@ -885,6 +1300,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
+                identity_map=self._get_identity_map(),
             )
         )
 
@@ -904,6 +1321,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -923,6 +1341,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -942,6 +1361,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -967,6 +1387,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -992,6 +1413,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
                 transaction_options=self._get_active_tx_options(),
                 warning_handler=self._get_warning_handler(),
                 annotations=self._get_annotations(),
+                lazy_decoding=self._get_lazy_decoding(),
             )
         )
 
@@ -25,19 +25,23 @@ import asyncio
 import contextlib
 import datetime
 import logging
+import os
 import socket
 import ssl
+import time
 import typing
 
 from . import abstract
 from . import base_client
 from . import con_utils
 from . import errors
+from . import metrics
 from . import transaction
 from .protocol import asyncio_proto  # type: ignore [attr-defined, unused-ignore]
 from .protocol.protocol import InputLanguage, OutputFormat
 
-from ._internal._save import make_save_executor_constructor
+from ._internal import _json
+from ._internal._save import SaveDebug, make_save_executor_constructor
 
 if typing.TYPE_CHECKING:
     from ._internal._qbmodel._pydantic import GelModel
@@ -70,10 +74,16 @@ class AsyncIOConnection(base_client.BaseConnection[asyncio.Event]):
         addr: str | tuple[str, int],
         timeout: float | None,
     ) -> None:
+        start = time.monotonic()
         try:
-            await asyncio.wait_for(self._connect_addr(addr), timeout)
+            peer = await asyncio.wait_for(self._connect_addr(addr), timeout)
         except asyncio.TimeoutError as e:
+            self._on_connect_attempt(addr, time.monotonic() - start, e)
             raise TimeoutError from e
+        except Exception as e:
+            self._on_connect_attempt(addr, time.monotonic() - start, e)
+            raise
+        self._on_connect_attempt(peer, time.monotonic() - start, None)
 
     async def sleep(self, seconds: float) -> None:
         await asyncio.sleep(seconds)
@@ -91,12 +101,13 @@ class AsyncIOConnection(base_client.BaseConnection[asyncio.Event]):
                 self._cleanup()
 
     def _protocol_factory(self) -> asyncio_proto.AsyncIOProtocol:
-        return asyncio_proto.AsyncIOProtocol(self._params, self._loop)
+        return asyncio_proto.BufferedAsyncIOProtocol(self._params, self._loop)
 
     async def _connect_addr(
         self,
         addr: str | tuple[str, int],
-    ) -> None:
+    ) -> str | tuple[str, int]:
+        """Connect to *addr* and return the address actually connected to."""
         tr = None
 
         try:
@@ -107,6 +118,8 @@ class AsyncIOConnection(base_client.BaseConnection[asyncio.Event]):
                 )
             else:
                 try:
+                    # With several resolved addresses, race them with
+                    # staggered starts instead of trying one by one.
                     tr, pr = await self._loop.create_connection(
                         self._protocol_factory,
                         *addr,
@@ -114,6 +127,8 @@ class AsyncIOConnection(base_client.BaseConnection[asyncio.Event]):
                         server_hostname=(
                             self._params.tls_server_name or addr[0]
                         ),
+                        happy_eyeballs_delay=base_client.HAPPY_EYEBALLS_DELAY,
+                        interleave=1,
                     )
                 except ssl.CertificateError as e:
                     raise con_utils.wrap_error(e) from e
@@ -149,6 +164,12 @@ class AsyncIOConnection(base_client.BaseConnection[asyncio.Event]):
         self._protocol = pr
         self._addr = addr
 
+        if isinstance(addr, str):
+            return addr
+        con_utils.save_tls_session(tr.get_extra_info("ssl_object"))
+        peer = tr.get_extra_info("peername")
+        return (peer[0], peer[1]) if peer else addr
+
     def _dispatch_log_message(self, msg: errors.EdgeDBMessage) -> None:
         for cb in self._log_listeners:
             self._loop.call_soon(cb, self, msg)  # type: ignore [arg-type]
@@ -190,7 +211,7 @@ class _PoolConnectionHolder(
 class _AsyncIOPoolImpl(
     base_client.BasePoolImpl[AsyncIOConnection, asyncio.Event],
 ):
-    __slots__ = ("_loop",)
+    __slots__ = ("_close_tasks", "_loop", "_reap_handle")
     _holder_class = _PoolConnectionHolder
 
     _queue: asyncio.LifoQueue[_PoolConnectionHolder]
@@ -202,6 +223,15 @@ class _AsyncIOPoolImpl(
         *,
         max_concurrency: int | None,
         connection_factory: type[AsyncIOConnection],
+        min_size: int = 0,
+        max_idle_time: float | None = None,
+        max_lifetime: float | None = None,
+        query_cache_size: int | None = None,
+        codec_cache_size: int | None = None,
+        persistent_query_cache: bool | str | os.PathLike[str] = False,
+        pool_metrics: metrics.PoolMetrics | None = None,
+        decode_json: bool | _json.JSONLoads = False,
+        share_codecs: bool = False,
     ) -> None:
         if not issubclass(connection_factory, AsyncIOConnection):
             raise TypeError(
@@ -210,6 +240,9 @@ class _AsyncIOPoolImpl(
                 f"got {connection_factory}"
             )
         self._loop: asyncio.AbstractEventLoop | None = None
+        # Closes of reaped connections that are still running
+        self._close_tasks: set[asyncio.Task[None]] = set()
+        self._reap_handle: asyncio.TimerHandle | None = None
 
         def _conn_factory(*args: Any) -> AsyncIOConnection:
             assert self._loop is not None
@@ -219,6 +252,15 @@ class _AsyncIOPoolImpl(
             connect_args,
             _conn_factory,
             max_concurrency=max_concurrency,
+            min_size=min_size,
+            max_idle_time=max_idle_time,
+            max_lifetime=max_lifetime,
+            query_cache_size=query_cache_size,
+            codec_cache_size=codec_cache_size,
+            persistent_query_cache=persistent_query_cache,
+            pool_metrics=pool_metrics,
+            decode_json=decode_json,
+            share_codecs=share_codecs,
         )
 
     def _ensure_initialized(self) -> None:
@@ -253,16 +295,70 @@ class _AsyncIOPoolImpl(
                 # Record the timeout, as we will apply it by default
                 # in release().
                 ch._timeout = timeout
+                if self._metrics is not None:
+                    self._record_acquire(ch, start)
                 return proxy
 
         if self._closing:
             raise errors.InterfaceError("pool is closing")
 
+        start = time.monotonic() if self._metrics is not None else 0.0
+
         if timeout is None:
             return await _acquire_impl()
         else:
             return await asyncio.wait_for(_acquire_impl(), timeout=timeout)
 
+    def _get_free_holder_nowait(self) -> _PoolConnectionHolder | None:
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    async def _connect_holders(
+        self,
+        holders: list[
+            base_client.PoolConnectionHolder[AsyncIOConnection, asyncio.Event]
+        ],
+    ) -> None:
+        results = await asyncio.gather(
+            *[ch.connect() for ch in holders], return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _reap_connections(self) -> None:
+        self._reap_free_connections()
+
+    def _reap_free_connections(self) -> None:
+        assert self._loop is not None
+        free = (ch for ch in self._holders if ch._release_event.is_set())
+        for con in self._detach_expired_connections(free):
+            task = self._loop.create_task(con.aclose())
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+    def _schedule_reap(self, delay: float) -> None:
+        if self._reap_handle is None and self._loop is not None:
+            self._reap_handle = self._loop.call_later(delay, self._on_reap)
+
+    def _cancel_reap(self) -> None:
+        if self._reap_handle is not None:
+            self._reap_handle.cancel()
+            self._reap_handle = None
+
+    def _on_reap(self) -> None:
+        self._reap_handle = None
+        if self._closing or self._closed:
+            return
+        self._reap_free_connections()
+        self._maybe_schedule_reap()
+
+    def _run_in_background(self, func: typing.Callable[[], None]) -> None:
+        assert self._loop is not None
+        self._loop.run_in_executor(None, func)
+
     async def _release(
         self,
         connection: base_client.PoolConnectionHolder[
@@ -314,6 +410,8 @@ class _AsyncIOPoolImpl(
             close_coros = [ch.close() for ch in self._holders]
             await asyncio.gather(*close_coros)
 
+            await asyncio.gather(*self._close_tasks, return_exceptions=True)
+
         except (Exception, asyncio.CancelledError):
             self.terminate()
             raise
@@ -322,6 +420,7 @@ class _AsyncIOPoolImpl(
             warning_callback.cancel()
             self._closed = True
             self._closing = False
+            self._after_close()
 
     def _warn_on_long_close(self) -> None:
         logger.warning(
@@ -378,6 +477,17 @@ class AsyncIOIteration(transaction.BaseTransaction, abstract.AsyncIOExecutor):
         with self._exclusive():
             return await super()._query(query_context)
 
+    async def _query_iter(
+        self,
+        query_context: abstract.BaseQueryContext[Any],
+    ) -> typing.AsyncGenerator[Any, None]:
+        with self._exclusive():
+            async with contextlib.aclosing(
+                super()._query_iter(query_context)
+            ) as rows:
+                async for row in rows:
+                    yield row
+
     async def _execute(
         self,
         execute_context: abstract.ExecuteContext[Any],
@@ -667,66 +777,72 @@ class AsyncIOClient(
         refetch: bool,
         objs: tuple[GelModel, ...],
         warn_on_large_sync_set: bool = False,
+        batch_size: int | None = None,
     ) -> None:
         opts = self._get_debug_options()
+        debug = SaveDebug()
 
+        st = time.monotonic()
         make_executor = make_save_executor_constructor(
             objs,
             refetch=refetch,
             save_postcheck=opts.save_postcheck,
             warn_on_large_sync_set=warn_on_large_sync_set,
+            batch_size=batch_size,
         )
+        debug.plan_time = time.monotonic() - st
 
         async for tx in self._batch():
             async with tx:
                 executor = make_executor()
 
-                for batches in executor:
-                    for batch in batches:
-                        await tx.send_query(batch.query, batch.args)
-                    batch_ids = await tx.wait()
-                    for ids, batch in zip(batch_ids, batches, strict=True):
-                        batch.record_inserted_data(ids)
-
-                if refetch:
-                    ref_queries = executor.get_refetch_queries()
-                    for ref in ref_queries:
-                        await tx.send_query(
-                            ref.query,
-                            spec=ref.args.spec,
-                            new=ref.args.new,
-                            existing=ref.args.existing,
-                        )
-
-                    refetch_data = await tx.wait()
-
-                    for ref_data, ref in zip(
-                        refetch_data, ref_queries, strict=True
-                    ):
-                        ref.record_refetched_data(ref_data)
+                for flight in executor.iter_flights(debug):
+                    st = time.monotonic()
+                    for query in flight.queries:
+                        args, kwargs = query.get_query_args()
+                        await tx.send_query(query.query, *args, **kwargs)
+                    results = await tx.wait()
+                    debug.record_flight(flight, time.monotonic() - st)
+                    flight.record_results(results)
+
+                st = time.monotonic()
 
         executor.commit()
+        debug.commit_time = time.monotonic() - st
+
+        if opts.save_debug is not None:
+            opts.save_debug(debug)
 
     async def save(
         self,
         *objs: GelModel,
+        batch_size: int | None = None,
     ) -> None:
         """Persist objects without refetching updated data back.
 
         This is a subset of `sync()`, optimized to avoid refetching.
+
+        *batch_size* limits how many objects are inserted or updated
+        by a single query.
         """
-        await self._save_impl(refetch=False, objs=objs)
+        await self._save_impl(refetch=False, objs=objs, batch_size=batch_size)
 
     async def sync(
         self,
         *objs: GelModel,
         warn_on_large_sync: bool = True,
+        batch_size: int | None = None,
     ) -> None:
-        """Persist objects and refetch updated data back into them."""
+        """Persist objects and refetch updated data back into them.
+
+        *batch_size* limits how many objects are inserted or updated
+        by a single query.
+        """
         await self._save_impl(
             refetch=True,
             objs=objs,
             warn_on_large_sync_set=warn_on_large_sync,
+            batch_size=batch_size,
         )
 
     async def __aenter__(self) -> Self:
@@ -765,6 +881,9 @@ def create_async_client(
     dsn: str | None = None,
     *,
     max_concurrency: int | None = None,
+    min_size: int = 0,
+    max_idle_time: float | None = None,
+    max_lifetime: float | None = None,
     host: str | None = None,
     port: int | None = None,
     credentials: str | None = None,
@@ -779,10 +898,19 @@ def create_async_client(
     tls_security: str | None = None,
     wait_until_available: int = 30,
     timeout: int = 10,
+    query_cache_size: int | None = None,
+    codec_cache_size: int | None = None,
+    persistent_query_cache: bool | str | os.PathLike[str] = False,
+    pool_metrics: metrics.PoolMetrics | None = None,
+    decode_json: bool | _json.JSONLoads = False,
+    share_codecs: bool = False,
 ) -> AsyncIOClient:
     return AsyncIOClient(
         connection_class=AsyncIOConnection,
         max_concurrency=max_concurrency,
+        min_size=min_size,
+        max_idle_time=max_idle_time,
+        max_lifetime=max_lifetime,
         # connect arguments
         dsn=dsn,
         host=host,
@@ -799,4 +927,10 @@ def create_async_client(
         tls_security=tls_security,
         wait_until_available=wait_until_available,
         timeout=timeout,
+        query_cache_size=query_cache_size,
+        codec_cache_size=codec_cache_size,
+        persistent_query_cache=persistent_query_cache,
+        pool_metrics=pool_metrics,
+        decode_json=decode_json,
+        share_codecs=share_codecs,
     )
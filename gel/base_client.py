@@ -22,20 +22,38 @@ from typing import Any, Generic, TypeVar, Protocol
 from typing_extensions import Self
 
 import abc
+import contextlib
 import dataclasses
+import os
 import random
 import time
 import typing
+import uuid
 
 from . import abstract
 from . import con_utils
 from . import enums
 from . import errors
+from . import metrics as _metrics
 from . import options as _options
 from .protocol import protocol  # pyright: ignore [reportAttributeAccessIssue]
+from ._internal import _json
+from ._internal import _query_cache
 
 
 QUERY_CACHE_SIZE = 1000
+CODEC_CACHE_SIZE = 1000
+# Type id of std::json.
+JSON_TYPE_ID = uuid.UUID("00000000-0000-0000-0000-00000000010f")
+
+# How often the pool checks its free connections for expiry, in seconds,
+# unless max_idle_time or max_lifetime are shorter.
+REAP_INTERVAL = 1.0
+
+# When a host resolves to several addresses, connection attempts to them
+# are started this many seconds apart (RFC 8305 "Happy Eyeballs") and the
+# first one to succeed is used.
+HAPPY_EYEBALLS_DELAY = 0.25
 
 
 class EventProtocol(Protocol):
@@ -57,6 +75,9 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
     _config: con_utils.ClientConfiguration
     _params: con_utils.ResolvedConnectConfig
     _log_listeners: set[typing.Callable[[Self, errors.EdgeDBMessage], object]]
+    _connect_attempts: list[
+        tuple[str | tuple[str, int], float, Exception | None]
+    ]
     __slots__ = (
         "__weakref__",
         "_protocol",
@@ -66,6 +87,7 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
         "_params",
         "_log_listeners",
         "_holder",
+        "_connect_attempts",
     )
 
     def __init__(
@@ -81,6 +103,7 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
         self._params = params
         self._log_listeners = set()
         self._holder = None
+        self._connect_attempts = []
 
     @abc.abstractmethod
     def _dispatch_log_message(self, msg: errors.EdgeDBMessage) -> None: ...
@@ -92,6 +115,25 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
     def connected_addr(self) -> str | tuple[str, int] | None:
         return self._addr
 
+    def _get_metrics(self) -> _metrics.PoolMetrics | None:
+        # Connections only report metrics while they belong to a pool;
+        # the initial connect is reported by the pool itself.
+        if self._holder is None:
+            return None
+        return self._holder._pool._metrics
+
+    def _on_connect_attempt(
+        self,
+        addr: str | tuple[str, int],
+        connect_time: float,
+        error: Exception | None,
+    ) -> None:
+        if (metrics := self._get_metrics()) is not None:
+            metrics.on_connect_attempt(addr, connect_time, error)
+        else:
+            # Reported by the pool once the connection joins it.
+            self._connect_attempts.append((addr, connect_time, error))
+
     def _get_last_status(self) -> str | None:
         if self._protocol is None:
             return None
@@ -152,6 +194,7 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
         else:
             max_time = start + self._config.wait_until_available  # type: ignore [assignment]
         iteration = 1
+        self._connect_attempts.clear()
 
         while True:
             for addr in self._addrs:
@@ -180,6 +223,10 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
                     )
                     raise nice_err from e.__cause__
                 else:
+                    if (metrics := self._get_metrics()) is not None:
+                        metrics.on_connect(
+                            time.monotonic() - start, reconnect=True
+                        )
                     return
 
             iteration += 1
@@ -237,6 +284,8 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
                 rule = retry_options.get_rule_for_exception(e)
                 if i >= rule.attempts:
                     raise e
+                if (metrics := self._get_metrics()) is not None:
+                    metrics.on_retry(i, e)
                 await self.sleep(rule.backoff(i))
                 reconnect = self.is_closed()
 
@@ -247,6 +296,15 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
             await self.connect()
 
         if self._protocol.is_legacy:
+            if query_context.query_options.columnar:
+                raise errors.InterfaceError(
+                    "query_columns() is not supported by the legacy protocol"
+                )
+            if query_context.query_options.json_bytes:
+                raise errors.InterfaceError(
+                    "query_json_bytes() is not supported by the legacy "
+                    "protocol"
+                )
             allow_capabilities = enums.Capability.LEGACY_EXECUTE
         else:
             allow_capabilities = enums.Capability.EXECUTE
@@ -265,6 +323,29 @@ class BaseConnection(Generic[_T_Event], metaclass=abc.ABCMeta):
             _inner, query_context.retry_options, ctx
         )
 
+    async def raw_query_iter(
+        self, query_context: abstract.BaseQueryContext[Any]
+    ) -> typing.AsyncGenerator[list[Any], None]:
+        if self.is_closed():
+            await self.connect()
+
+        if self._protocol.is_legacy:
+            raise errors.InterfaceError(
+                "query_iter() is not supported by the legacy protocol"
+            )
+        ctx = query_context.lower(allow_capabilities=enums.Capability.EXECUTE)
+
+        # Rows may have been handed out already by the time an error
+        # is seen, so streamed queries are never retried.
+        async with contextlib.aclosing(
+            self._protocol.query_iter(ctx)
+        ) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+        if ctx.warnings:
+            query_context.warning_handler(ctx.warnings, None)
+
     async def _execute(
         self, execute_context: abstract.ExecuteContext[Any]
     ) -> None:
@@ -352,6 +433,9 @@ class PoolConnectionHolder(abc.ABC, Generic[_T_Conn, _T_Event]):
         "_release_event",
         "_timeout",
         "_generation",
+        "_connected_at",
+        "_released_at",
+        "_acquired_at",
     )
     _event_class: type[_T_Event]
 
@@ -361,6 +445,9 @@ class PoolConnectionHolder(abc.ABC, Generic[_T_Conn, _T_Event]):
 
         self._timeout: float | None = None
         self._generation: int | None = None
+        self._connected_at = 0.0
+        self._released_at = 0.0
+        self._acquired_at = 0.0
 
         self._release_event = self._event_class()
         self._release_event.set()
@@ -385,18 +472,43 @@ class PoolConnectionHolder(abc.ABC, Generic[_T_Conn, _T_Event]):
                 "connection already exists"
             )
 
+        start = time.monotonic()
         self._con = await self._pool._get_new_connection()
         assert self._con._holder is None
         self._con._holder = self
         self._generation = self._pool._generation
+        now = time.monotonic()
+        if (metrics := self._pool._metrics) is not None:
+            for attempt in self._con._connect_attempts:
+                metrics.on_connect_attempt(*attempt)
+            metrics.on_connect(now - start, reconnect=self._connected_at != 0)
+        self._con._connect_attempts.clear()
+        self._connected_at = self._released_at = now
+
+    def is_expired(self, *, check_idle: bool = True) -> bool:
+        """Whether the connection is past the pool max lifetime or,
+        if *check_idle* is set, has been idle longer than allowed."""
+        pool = self._pool
+        if pool._max_lifetime is None and pool._max_idle_time is None:
+            return False
+        now = time.monotonic()
+        return (
+            pool._max_lifetime is not None
+            and now - self._connected_at > pool._max_lifetime
+        ) or (
+            check_idle
+            and pool._max_idle_time is not None
+            and now - self._released_at > pool._max_idle_time
+        )
 
     async def acquire(self) -> _T_Conn:
         if self._con is None or self._con.is_closed():
             self._con = None
             await self.connect()
 
-        elif self._generation != self._pool._generation:
-            # Connections have been expired, re-connect the holder.
+        elif self._generation != self._pool._generation or self.is_expired():
+            # Connections have been expired, or this one has been open
+            # or idle for too long; re-connect the holder.
             self._con._holder = None  # don't release the connection
             await self.close(wait=False)
             self._con = None
@@ -425,10 +537,12 @@ class PoolConnectionHolder(abc.ABC, Generic[_T_Conn, _T_Event]):
 
         self._timeout = None
 
-        if self._generation != self._pool._generation:
+        if self._generation != self._pool._generation or self.is_expired(
+            check_idle=False
+        ):
             # The connection has expired because it belongs to
             # an older generation (BasePoolImpl.expire_connections() has
-            # been called.)
+            # been called), or because it has reached its max lifetime.
             await self.close()
             return
 
@@ -453,6 +567,7 @@ class PoolConnectionHolder(abc.ABC, Generic[_T_Conn, _T_Event]):
             return
 
         self._release_event.set()
+        self._released_at = time.monotonic()
 
         # Put ourselves back to the pool queue.
         self._pool._queue.put_nowait(self)
@@ -466,16 +581,76 @@ class ConnectionInfo:
     config: con_utils.ClientConfiguration
 
 
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    """Counters of one of the client caches.
+
+    All counters are cumulative over the lifetime of the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @classmethod
+    def _from_lru(
+        cls, lru: protocol.LRUMapping | protocol.SharedCodecsCache
+    ) -> Self:
+        return cls(
+            hits=lru.hits,
+            misses=lru.misses,
+            evictions=lru.evictions,
+            size=len(lru),
+            maxsize=lru.maxsize,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class QueryCacheStats:
+    """Counters of the client query and codec caches.
+
+    A steadily growing number of *query_cache* evictions means that
+    the application runs more distinct queries than the cache can
+    hold, and some of them are parsed by the server over and over;
+    consider raising *query_cache_size*.  The same applies to *codecs*
+    and *codec_cache_size*, with *codec_builds* counting the type
+    codecs that had to be built from server type descriptors.  *codecs*
+    counts one lookup for each input and output type the server
+    describes for a query that is not in the query cache.
+    *shared_codecs* counts the lookups in the process-wide codecs cache
+    of clients created with ``share_codecs=True``, it is ``None`` for
+    other clients.
+    """
+
+    query_cache: CacheStats
+    codecs: CacheStats
+    codec_builds: int
+    shared_codecs: CacheStats | None = None
+
+
 class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
     __slots__ = (
         "_connect_args",
         "_codecs_registry",
         "_query_cache",
+        "_query_cache_size",
+        "_codec_cache_size",
+        "_json_parser",
+        "_shared_codecs_cache",
+        "_persistent_cache",
         "_tx_needs_serializable_cache",
         "_connection_factory",
         "_queue",
         "_user_max_concurrency",
         "_max_concurrency",
+        "_min_size",
+        "_max_idle_time",
+        "_max_lifetime",
+        "_next_reap",
+        "_reap_interval",
+        "_metrics",
         "_first_connect_lock",
         "_working_addr",
         "_working_config",
@@ -496,11 +671,48 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
         connection_factory: typing.Callable[..., _T_Conn],
         *,
         max_concurrency: int | None,
+        min_size: int = 0,
+        max_idle_time: float | None = None,
+        max_lifetime: float | None = None,
+        query_cache_size: int | None = None,
+        codec_cache_size: int | None = None,
+        persistent_query_cache: bool | str | os.PathLike[str] = False,
+        pool_metrics: _metrics.PoolMetrics | None = None,
+        decode_json: bool | _json.JSONLoads = False,
+        share_codecs: bool = False,
     ) -> None:
+        if query_cache_size is None:
+            query_cache_size = QUERY_CACHE_SIZE
+        elif query_cache_size <= 0:
+            raise ValueError(
+                "query_cache_size is expected to be greater than zero"
+            )
+        if codec_cache_size is None:
+            codec_cache_size = CODEC_CACHE_SIZE
+        elif codec_cache_size <= 0:
+            raise ValueError(
+                "codec_cache_size is expected to be greater than zero"
+            )
+
         self._connection_factory = connection_factory
         self._connect_args = connect_args
-        self._codecs_registry = protocol.CodecsRegistry()
-        self._query_cache = protocol.LRUMapping(maxsize=QUERY_CACHE_SIZE)
+        self._query_cache_size = query_cache_size
+        self._codec_cache_size = codec_cache_size
+        self._json_parser = _json.resolve_parser(decode_json=decode_json)
+        self._shared_codecs_cache = (
+            protocol.get_shared_codecs_cache() if share_codecs else None
+        )
+        self._codecs_registry = self._new_codecs_registry()
+        self._query_cache = protocol.LRUMapping(maxsize=query_cache_size)
+        self._persistent_cache: _query_cache.PersistentQueryCache | None
+        if persistent_query_cache is False:
+            self._persistent_cache = None
+        elif persistent_query_cache is True:
+            self._persistent_cache = _query_cache.PersistentQueryCache()
+        else:
+            self._persistent_cache = _query_cache.PersistentQueryCache(
+                persistent_query_cache
+            )
         # Whether a transaction() call from a particular source location
         # needs to use Serializable. See transaction.BaseRetry for details.
         self._tx_needs_serializable_cache = protocol.LRUMapping(
@@ -515,6 +727,29 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
         self._user_max_concurrency = max_concurrency
         self._max_concurrency = max_concurrency if max_concurrency else 1
 
+        if min_size < 0:
+            raise ValueError("min_size is expected to be greater or equal 0")
+        if max_concurrency is not None and min_size > max_concurrency:
+            raise ValueError(
+                "min_size is expected to be less or equal max_concurrency"
+            )
+        if max_idle_time is not None and max_idle_time <= 0:
+            raise ValueError(
+                "max_idle_time is expected to be greater than zero"
+            )
+        if max_lifetime is not None and max_lifetime <= 0:
+            raise ValueError(
+                "max_lifetime is expected to be greater than zero"
+            )
+
+        self._min_size = min_size
+        self._max_idle_time = max_idle_time
+        self._max_lifetime = max_lifetime
+        self._next_reap = 0.0
+        limits = [t for t in (max_idle_time, max_lifetime) if t is not None]
+        self._reap_interval = min(REAP_INTERVAL, *limits) if limits else None
+        self._metrics = pool_metrics
+
         self._holders: list[PoolConnectionHolder[_T_Conn, _T_Event]] = []
         self._queue: Any = None
 
@@ -547,6 +782,63 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
     @abc.abstractmethod
     async def close(self, timeout: float | None = None) -> None: ...
 
+    @abc.abstractmethod
+    def _get_free_holder_nowait(
+        self,
+    ) -> PoolConnectionHolder[_T_Conn, _T_Event] | None: ...
+
+    @abc.abstractmethod
+    async def _connect_holders(
+        self, holders: list[PoolConnectionHolder[_T_Conn, _T_Event]]
+    ) -> None:
+        """Connect *holders* concurrently, raise the first error if any."""
+
+    @abc.abstractmethod
+    async def _reap_connections(self) -> None:
+        """Close the free connections that have expired."""
+
+    @abc.abstractmethod
+    def _schedule_reap(self, delay: float) -> None:
+        """Call _reap_connections() in *delay* seconds, unless a call
+        is scheduled already."""
+
+    @abc.abstractmethod
+    def _cancel_reap(self) -> None:
+        """Cancel the scheduled _reap_connections() call, if any."""
+
+    def _maybe_schedule_reap(self) -> None:
+        # An idle pool gets no release() calls, so expired connections
+        # are also reaped on a timer while there may be any.
+        if (
+            self._reap_interval is not None
+            and not self._closing
+            and not self._closed
+            and self._count_connected() > self._min_size
+        ):
+            self._schedule_reap(self._reap_interval)
+
+    @abc.abstractmethod
+    def _run_in_background(self, func: typing.Callable[[], None]) -> None:
+        """Call *func* without blocking the caller.
+
+        *func* must handle its own errors: nobody waits for it.
+        """
+
+    def _new_codecs_registry(self) -> Any:
+        reg = protocol.CodecsRegistry(
+            cache_size=self._codec_cache_size,
+            shared_cache=self._shared_codecs_cache,
+        )
+        if self._json_parser is not None:
+            loads, dumps = self._json_parser
+            reg.set_type_codec(
+                JSON_TYPE_ID,
+                encoder=dumps,
+                decoder=loads,
+                format="json",
+            )
+        return reg
+
     @property
     def codecs_registry(self) -> Any:
         return self._codecs_registry
@@ -555,6 +847,41 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
     def query_cache(self) -> Any:
         return self._query_cache
 
+    @property
+    def persistent_cache(self) -> _query_cache.PersistentQueryCache | None:
+        return self._persistent_cache
+
+    def get_cache_stats(self) -> QueryCacheStats:
+        return QueryCacheStats(
+            query_cache=CacheStats._from_lru(self._query_cache),
+            codecs=CacheStats._from_lru(self._codecs_registry.codecs),
+            codec_builds=self._codecs_registry.codec_builds,
+            shared_codecs=(
+                None
+                if self._shared_codecs_cache is None
+                else CacheStats._from_lru(self._shared_codecs_cache)
+            ),
+        )
+
+    def _save_persistent_cache(self) -> None:
+        if self._persistent_cache is not None:
+            self._persistent_cache.save()
+
+    def _after_close(self) -> None:
+        self._cancel_reap()
+        self._save_persistent_cache()
+        # Don't keep keys derived from the password around.
+        if self._working_params is not None:
+            self._working_params.clear_scram_keys()
+
+    def _maybe_save_persistent_cache(self) -> None:
+        # Queries only add entries to the persistent cache in memory;
+        # they are written out every SAVE_INTERVAL seconds, off the
+        # query path, and when the pool is closed.
+        cache = self._persistent_cache
+        if cache is not None and cache.claim_save():
+            self._run_in_background(cache.save_claimed)
+
     def _resize_holder_pool(self) -> None:
         resize_diff = self._max_concurrency - len(self._holders)
 
@@ -607,8 +934,10 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
 
         connect_kwargs["dsn"] = dsn
         self._connect_args = connect_kwargs
-        self._codecs_registry = protocol.CodecsRegistry()
-        self._query_cache = protocol.LRUMapping(maxsize=QUERY_CACHE_SIZE)
+        self._codecs_registry = self._new_codecs_registry()
+        self._query_cache = protocol.LRUMapping(maxsize=self._query_cache_size)
+        if self._persistent_cache is not None:
+            self._persistent_cache.reset()
         self._working_addr = None
         self._working_config = None
         self._working_params = None
@@ -629,6 +958,13 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
         self._working_config = client_config
         self._working_params = connect_config
 
+        if self._persistent_cache is not None:
+            self._persistent_cache.load(
+                f"{connect_config.address}/{connect_config.branch}"
+                f"/{connect_config.user}",
+                con._protocol.protocol_version,
+            )
+
         if self._user_max_concurrency is None:
             suggested_concurrency = con.get_settings().get(
                 "suggested_pool_concurrency"
@@ -673,7 +1009,16 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
                 f"{connection!r} is not a member of this pool"
             )
 
-        return await self._release(ch)  # pyright: ignore [reportArgumentType]
+        acquired_at = ch._acquired_at
+        await self._release(ch)  # pyright: ignore [reportArgumentType]
+        if self._metrics is not None:
+            self._metrics.on_release(
+                time.monotonic() - acquired_at,
+                self._max_concurrency - self.get_free_size(),
+            )
+        await self._reap_connections()
+        self._maybe_schedule_reap()
+        self._maybe_save_persistent_cache()
 
     def terminate(self) -> None:
         """Terminate all connections in the pool."""
@@ -682,6 +1027,7 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
         for ch in self._holders:
             ch.terminate()
         self._closed = True
+        self._after_close()
 
     def expire_connections(self) -> None:
         """Expire all currently open connections.
@@ -694,16 +1040,90 @@ class BasePoolImpl(abc.ABC, Generic[_T_Conn, _T_Event]):
     async def ensure_connected(self) -> ConnectionInfo:
         self._ensure_initialized()
 
-        for ch in self._holders:
-            if ch._con is not None and not ch._con.is_closed():
-                return self._make_connection_info()
+        if not self._count_connected():
+            ch = self._holders[0]
+            ch._con = None
+            await ch.connect()
 
-        ch = self._holders[0]
-        ch._con = None
-        await ch.connect()
+        if self._min_size:
+            await self._prewarm()
 
         return self._make_connection_info()
 
+    def _record_acquire(
+        self, ch: PoolConnectionHolder[_T_Conn, _T_Event], start: float
+    ) -> None:
+        assert self._metrics is not None
+        ch._acquired_at = now = time.monotonic()
+        self._metrics.on_acquire(
+            now - start, self._max_concurrency - self.get_free_size()
+        )
+
+    def _count_connected(self) -> int:
+        return sum(
+            1
+            for ch in self._holders
+            if ch._con is not None and not ch._con.is_closed()
+        )
+
+    async def _prewarm(self) -> None:
+        needed = min(self._min_size, self._max_concurrency)
+        needed -= self._count_connected()
+
+        # Check the free holders out of the queue while they connect,
+        # so that they are not acquired concurrently.
+        holders: list[PoolConnectionHolder[_T_Conn, _T_Event]] = []
+        connected = []
+        while len(holders) < needed:
+            ch = self._get_free_holder_nowait()
+            if ch is None:
+                break
+            if ch._con is None or ch._con.is_closed():
+                ch._con = None
+                holders.append(ch)
+            else:
+                connected.append(ch)
+        for ch in connected:
+            self._queue.put_nowait(ch)
+        if not holders:
+            return
+
+        try:
+            await self._connect_holders(holders)
+        finally:
+            for ch in holders:
+                self._queue.put_nowait(ch)
+
+    def _detach_expired_connections(
+        self, free: typing.Iterable[PoolConnectionHolder[_T_Conn, _T_Event]]
+    ) -> list[_T_Conn]:
+        """Detach expired connections from the *free* holders.
+
+        Connections are kept open as long as the pool would otherwise
+        have fewer than min_size of them.  The caller is responsible
+        for closing the returned connections.
+        """
+        if self._reap_interval is None:
+            return []
+        now = time.monotonic()
+        if now < self._next_reap:
+            return []
+        self._next_reap = now + self._reap_interval
+
+        connected = self._count_connected()
+        expired = []
+        for ch in free:
+            if connected <= self._min_size:
+                break
+            con = ch._con
+            if con is None or con.is_closed() or not ch.is_expired():
+                continue
+            con._holder = None
+            ch._con = None
+            expired.append(con)
+            connected -= 1
+        return expired
+
     def _make_connection_info(self) -> ConnectionInfo:
         assert self._working_addr is not None
         assert self._working_config is not None
@@ -798,10 +1218,11 @@ class BaseClient(
         return abstract.QueryCache(
             codecs_registry=self._impl.codecs_registry,
             query_cache=self._impl.query_cache,
+            persistent_cache=self._impl.persistent_cache,
         )
 
     def _get_debug_options(self) -> _options.Debug:
-        return self._options._debug  # type: ignore [no-any-return]
+        return self._options._debug
 
     def _get_retry_options(self) -> _options.RetryOptions | None:
         # This is overloaded in transaction.py to return None, to prevent
@@ -825,6 +1246,12 @@ class BaseClient(
     def _get_annotations(self) -> dict[str, str]:
         return self._options.annotations  # type: ignore [no-any-return]
 
+    def _get_lazy_decoding(self) -> bool:
+        return self._options.lazy_decoding  # type: ignore [no-any-return]
+
+    def _get_identity_map(self) -> _options.IdentityMap | None:
+        return self._options.identity_map
+
     @property
     def max_concurrency(self) -> int:
         """Max number of connections in the pool."""
@@ -837,6 +1264,12 @@ class BaseClient(
 
         return self._impl.get_free_size()
 
+    @property
+    def cache_stats(self) -> QueryCacheStats:
+        """Hit, miss and eviction counters of the query and codec caches."""
+
+        return self._impl.get_cache_stats()
+
     async def _query(
         self, query_context: abstract.BaseQueryContext[_T_co]
     ) -> Any:
@@ -846,6 +1279,20 @@ class BaseClient(
         finally:
             await self._impl.release(con)
 
+    async def _query_iter(
+        self, query_context: abstract.BaseQueryContext[_T_co]
+    ) -> typing.AsyncGenerator[Any, None]:
+        con = await self._impl.acquire()
+        try:
+            async with contextlib.aclosing(
+                con.raw_query_iter(query_context)
+            ) as chunks:
+                async for chunk in chunks:
+                    for row in chunk:
+                        yield row
+        finally:
+            await self._impl.release(con)
+
     async def _execute(
         self, execute_context: abstract.ExecuteContext[_T_co]
     ) -> None:
@@ -19,9 +19,10 @@
 from __future__ import annotations
 from typing import Any, TypeVar
 
+import concurrent.futures
 import contextlib
-import dataclasses
 import datetime
+import os
 import queue
 import socket
 import ssl
@@ -34,11 +35,17 @@ from . import abstract
 from . import base_client
 from . import con_utils
 from . import errors
+from . import metrics
 from . import transaction
 from .protocol import blocking_proto  # type: ignore [attr-defined, unused-ignore]
 from .protocol.protocol import InputLanguage, OutputFormat
 
-from ._internal._save import make_save_executor_constructor
+from ._internal import _json
+from ._internal._save import (
+    SaveDebug,
+    SaveQueryDebug,  # noqa: F401
+    make_save_executor_constructor,
+)
 
 if typing.TYPE_CHECKING:
     from ._internal._qbmodel._pydantic import GelModel
@@ -52,24 +59,6 @@ _T = TypeVar("_T")
 _T_co = TypeVar("_T_co", covariant=True)
 
 
-@dataclasses.dataclass
-class SaveDebug:
-    queries: list[SaveQueryDebug]
-    plan_time: float
-
-
-@dataclasses.dataclass
-class SaveQueryDebug:
-    query: Any = ""
-    max_args_number: int = 0
-    total_execs: int = 0
-    total_exec_time: float = 0
-    analyze: str = ""
-    analyze_args: object = None
-    args_query: str = ""
-    args_analyze: object = None
-
-
 def iter_coroutine(coro: typing.Coroutine[None, None, _T]) -> _T:
     try:
         coro.send(None)
@@ -83,6 +72,20 @@ def iter_coroutine(coro: typing.Coroutine[None, None, _T]) -> _T:
         coro.close()
 
 
+def iter_async_generator(
+    agen: typing.AsyncGenerator[_T, None],
+) -> typing.Iterator[_T]:
+    try:
+        while True:
+            try:
+                item = iter_coroutine(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        iter_coroutine(agen.aclose())
+
+
 class BlockingIOConnection(base_client.BaseConnection[threading.Event]):
     __slots__ = ("_ping_wait_time",)
 
@@ -112,45 +115,154 @@ class BlockingIOConnection(base_client.BaseConnection[threading.Event]):
                 err = errors.ClientConnectionFailedTemporarilyError(str(e))
                 raise err from e
 
-        for i, res in enumerate(res_list):
-            af, socktype, proto, _, sa = res
-            try:
-                sock = socket.socket(af, socktype, proto)
-            except OSError as e:
-                sock.close()  # pyright: ignore[reportPossiblyUnboundVariable]
-                if i < len(res_list) - 1:
-                    continue
-                else:
-                    raise con_utils.wrap_error(e) from e
+        candidates = list(res_list)
+        while True:
+            sock, sa, start, candidates = self._race_connect(
+                candidates, deadline
+            )
             try:
-                await self._connect_addr(sock, addr, sa, deadline)
-            except TimeoutError:
+                await self._connect_addr(sock, addr, deadline)
+            except TimeoutError as e:
+                self._on_connect_attempt(sa, time.monotonic() - start, e)
                 raise
-            except Exception:
-                if i < len(res_list) - 1:
+            except Exception as e:
+                self._on_connect_attempt(sa, time.monotonic() - start, e)
+                if candidates:
                     continue
-                else:
-                    raise
+                raise
             else:
+                self._on_connect_attempt(sa, time.monotonic() - start, None)
                 break
 
+    def _race_connect(
+        self,
+        candidates: list[Any],
+        deadline: float,
+    ) -> tuple[socket.socket, Any, float, list[Any]]:
+        """Open a socket to the first of *candidates* accepting it.
+
+        Like asyncio's Happy Eyeballs, the attempts are made in threads
+        started HAPPY_EYEBALLS_DELAY apart, or as soon as the previous
+        one fails.  Return the connected socket, its address, the time
+        its attempt started and the candidates that have not failed.
+        """
+        if len(candidates) == 1:
+            # Nothing to race: connect in this thread.
+            return self._connect_one(candidates[0], deadline)
+
+        results: queue.Queue[
+            tuple[Any, socket.socket | None, float, Exception | None]
+        ] = queue.Queue()
+        lock = threading.Lock()
+        done = False
+
+        def attempt(res: Any) -> None:
+            af, socktype, proto, _, sa = res
+            start = time.monotonic()
+            sock = None
+            try:
+                sock = socket.socket(af, socktype, proto)
+                sock.settimeout(max(deadline - start, 0))
+                sock.connect(sa)
+            except Exception as e:
+                if sock is not None:
+                    sock.close()
+                results.put((res, None, start, e))
+                return
+            with lock:
+                if done:
+                    # Lost the race.
+                    sock.close()
+                    return
+                results.put((res, sock, start, None))
+
+        pending = list(candidates)
+        failed: list[Any] = []
+        running = 0
+        last_error: Exception | None = None
+        try:
+            while pending or running:
+                if pending:
+                    threading.Thread(
+                        target=attempt, args=(pending.pop(0),), daemon=True
+                    ).start()
+                    running += 1
+                time_left = deadline - time.monotonic()
+                if time_left <= 0:
+                    raise TimeoutError
+                if pending:
+                    time_left = min(
+                        time_left, base_client.HAPPY_EYEBALLS_DELAY
+                    )
+                try:
+                    res, sock, started_at, error = results.get(
+                        timeout=time_left
+                    )
+                except queue.Empty:
+                    continue
+                running -= 1
+                if sock is not None:
+                    return (
+                        sock,
+                        res[4],
+                        started_at,
+                        [
+                            c
+                            for c in candidates
+                            if c is not res and c not in failed
+                        ],
+                    )
+                failed.append(res)
+                self._on_connect_attempt(
+                    res[4], time.monotonic() - started_at, error
+                )
+                last_error = error
+        finally:
+            with lock:
+                done = True
+            # Close the sockets of attempts that succeeded while we
+            # were returning or giving up.
+            while not results.empty():
+                _, extra, _, _ = results.get_nowait()
+                if extra is not None:
+                    extra.close()
+
+        assert last_error is not None
+        if not isinstance(last_error, OSError):
+            raise last_error
+        raise con_utils.wrap_error(last_error) from last_error
+
+    def _connect_one(
+        self,
+        res: Any,
+        deadline: float,
+    ) -> tuple[socket.socket, Any, float, list[Any]]:
+        af, socktype, proto, _, sa = res
+        start = time.monotonic()
+        time_left = deadline - start
+        if time_left <= 0:
+            raise TimeoutError
+        try:
+            sock = socket.socket(af, socktype, proto)
+        except OSError as e:
+            self._on_connect_attempt(sa, time.monotonic() - start, e)
+            raise con_utils.wrap_error(e) from e
+        try:
+            sock.settimeout(time_left)
+            sock.connect(sa)
+        except OSError as e:
+            sock.close()
+            self._on_connect_attempt(sa, time.monotonic() - start, e)
+            raise con_utils.wrap_error(e) from e
+        return sock, sa, start, []
+
     async def _connect_addr(
         self,
         sock: socket.socket,
         addr: str | tuple[str, int],
-        sa: str | tuple[str, int],
         deadline: float,
     ) -> None:
         try:
-            time_left = deadline - time.monotonic()
-            if time_left <= 0:
-                raise TimeoutError
-            try:
-                sock.settimeout(time_left)
-                sock.connect(sa)
-            except OSError as e:
-                raise con_utils.wrap_error(e) from e
-
             if not isinstance(addr, str):
                 time_left = deadline - time.monotonic()
                 if time_left <= 0:
@@ -193,6 +305,8 @@ class BlockingIOConnection(base_client.BaseConnection[threading.Event]):
 
             self._protocol = proto
             self._addr = addr
+            if not isinstance(addr, str):
+                con_utils.save_tls_session(sock)
             settings = self.get_settings()
             system_config = settings.get("system_config") if settings else None
             session_idle_timeout = (
@@ -290,6 +404,15 @@ class _PoolImpl(
         *,
         max_concurrency: int | None,
         connection_factory: type[BlockingIOConnection],
+        min_size: int = 0,
+        max_idle_time: float | None = None,
+        max_lifetime: float | None = None,
+        query_cache_size: int | None = None,
+        codec_cache_size: int | None = None,
+        persistent_query_cache: bool | str | os.PathLike[str] = False,
+        pool_metrics: metrics.PoolMetrics | None = None,
+        decode_json: bool | _json.JSONLoads = False,
+        share_codecs: bool = False,
     ) -> None:
         if not issubclass(connection_factory, BlockingIOConnection):
             raise TypeError(
@@ -301,7 +424,18 @@ class _PoolImpl(
             connect_args,
             connection_factory,
             max_concurrency=max_concurrency,
+            min_size=min_size,
+            max_idle_time=max_idle_time,
+            max_lifetime=max_lifetime,
+            query_cache_size=query_cache_size,
+            codec_cache_size=codec_cache_size,
+            persistent_query_cache=persistent_query_cache,
+            pool_metrics=pool_metrics,
+            decode_json=decode_json,
+            share_codecs=share_codecs,
         )
+        self._reap_lock = threading.Lock()
+        self._reap_timer: threading.Timer | None = None
 
     def _ensure_initialized(self) -> None:
         if self._queue is None:
@@ -331,6 +465,7 @@ class _PoolImpl(
         if self._closing:
             raise errors.InterfaceError("pool is closing")
 
+        start = time.monotonic() if self._metrics is not None else 0.0
         ch = self._queue.get(timeout=timeout)
         try:
             con = await ch.acquire()
@@ -341,8 +476,64 @@ class _PoolImpl(
             # Record the timeout, as we will apply it by default
             # in release().
             ch._timeout = timeout
+            if self._metrics is not None:
+                self._record_acquire(ch, start)
             return con
 
+    def _get_free_holder_nowait(self) -> _PoolConnectionHolder | None:
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    async def _connect_holders(
+        self,
+        holders: list[
+            base_client.PoolConnectionHolder[
+                BlockingIOConnection, threading.Event
+            ]
+        ],
+    ) -> None:
+        with concurrent.futures.ThreadPoolExecutor(len(holders)) as executor:
+            futures = [
+                executor.submit(iter_coroutine, ch.connect()) for ch in holders
+            ]
+        for future in futures:
+            future.result()
+
+    async def _reap_connections(self) -> None:
+        with self._queue.mutex:
+            expired = self._detach_expired_connections(self._queue.queue)
+        for con in expired:
+            with contextlib.suppress(Exception):
+                await con.close()
+
+    def _schedule_reap(self, delay: float) -> None:
+        with self._reap_lock:
+            if self._reap_timer is not None:
+                return
+            timer = self._reap_timer = threading.Timer(delay, self._on_reap)
+        timer.daemon = True
+        timer.start()
+
+    def _cancel_reap(self) -> None:
+        with self._reap_lock:
+            timer, self._reap_timer = self._reap_timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _on_reap(self) -> None:
+        # Runs in the timer thread.
+        with self._reap_lock:
+            self._reap_timer = None
+        if self._closing or self._closed:
+            return
+        iter_coroutine(self._reap_connections())
+        self._maybe_schedule_reap()
+
+    def _run_in_background(self, func: typing.Callable[[], None]) -> None:
+        threading.Thread(target=func, daemon=True).start()
+
     async def _release(
         self,
         connection: base_client.PoolConnectionHolder[
@@ -394,6 +585,7 @@ class _PoolImpl(
         finally:
             self._closed = True
             self._closing = False
+            self._after_close()
 
 
 class Iteration(transaction.BaseTransaction, abstract.Executor):
@@ -435,6 +627,12 @@ class Iteration(transaction.BaseTransaction, abstract.Executor):
         with self._exclusive():
             return iter_coroutine(super()._query(query_context))  # type: ignore [arg-type]
 
+    def _query_iter(
+        self, query_context: abstract.BaseQueryContext[Any]
+    ) -> typing.Iterator[Any]:
+        with self._exclusive():
+            yield from iter_async_generator(super()._query_iter(query_context))
+
     def _execute(self, execute_context: abstract.ExecuteContext[Any]) -> None:  # type: ignore[override]
         with self._exclusive():
             iter_coroutine(super()._execute(execute_context))
@@ -688,71 +886,82 @@ class Client(
         refetch: bool,
         objs: tuple[GelModel, ...],
         warn_on_large_sync_set: bool = False,
+        batch_size: int | None = None,
     ) -> None:
         opts = self._get_debug_options()
+        debug = SaveDebug()
 
+        st = time.monotonic()
         make_executor = make_save_executor_constructor(
             objs,
             refetch=refetch,
             save_postcheck=opts.save_postcheck,
             warn_on_large_sync_set=warn_on_large_sync_set,
+            batch_size=batch_size,
         )
+        debug.plan_time = time.monotonic() - st
 
         for tx in self._batch():
             with tx:
                 executor = make_executor()
 
-                for batches in executor:
-                    for batch in batches:
-                        tx.send_query(batch.query, batch.args)
-                    batch_ids = tx.wait()
-                    for ids, batch in zip(batch_ids, batches, strict=True):
-                        batch.record_inserted_data(ids)
-
-                if refetch:
-                    ref_queries = executor.get_refetch_queries()
-                    for ref in ref_queries:
-                        tx.send_query(
-                            ref.query,
-                            spec=ref.args.spec,
-                            new=ref.args.new,
-                            existing=ref.args.existing,
-                        )
+                for flight in executor.iter_flights(debug):
+                    st = time.monotonic()
+                    for query in flight.queries:
+                        args, kwargs = query.get_query_args()
+                        tx.send_query(query.query, *args, **kwargs)
+                    results = tx.wait()
+                    debug.record_flight(flight, time.monotonic() - st)
+                    flight.record_results(results)
 
-                    refetch_data = tx.wait()
-
-                    for ref_data, ref in zip(
-                        refetch_data, ref_queries, strict=True
-                    ):
-                        ref.record_refetched_data(ref_data)
+                st = time.monotonic()
 
         executor.commit()
+        debug.commit_time = time.monotonic() - st
+
+        if opts.save_debug is not None:
+            opts.save_debug(debug)
 
     def save(
         self,
         *objs: GelModel,
+        batch_size: int | None = None,
     ) -> None:
         """Persist objects without refetching updated data back.
 
         This is a subset of `sync()`, optimized to avoid refetching.
+
+        *batch_size* limits how many objects are inserted or updated
+        by a single query.
         """
-        self._save_impl(refetch=False, objs=objs)
+        self._save_impl(refetch=False, objs=objs, batch_size=batch_size)
 
     def sync(
         self,
         *objs: GelModel,
         warn_on_large_sync: bool = True,
+        batch_size: int | None = None,
     ) -> None:
-        """Persist objects and refetch updated data back into them."""
+        """Persist objects and refetch updated data back into them.
+
+        *batch_size* limits how many objects are inserted or updated
+        by a single query.
+        """
         self._save_impl(
             refetch=True,
             objs=objs,
             warn_on_large_sync_set=warn_on_large_sync,
+            batch_size=batch_size,
         )
 
     def _query(self, query_context: abstract.BaseQueryContext[_T_co]) -> Any:
         return iter_coroutine(super()._query(query_context))
 
+    def _query_iter(  # type: ignore [override]
+        self, query_context: abstract.BaseQueryContext[_T_co]
+    ) -> typing.Iterator[Any]:
+        return iter_async_generator(super()._query_iter(query_context))
+
     def _execute(  # type: ignore [override]
         self, execute_context: abstract.ExecuteContext[_T_co]
     ) -> None:
@@ -825,6 +1034,9 @@ def create_client(
     dsn: str | None = None,
     *,
     max_concurrency: int | None = None,
+    min_size: int = 0,
+    max_idle_time: float | None = None,
+    max_lifetime: float | None = None,
     host: str | None = None,
     port: int | None = None,
     credentials: str | None = None,
@@ -839,10 +1051,19 @@ def create_client(
     tls_security: str | None = None,
     wait_until_available: int = 30,
     timeout: int = 10,
+    query_cache_size: int | None = None,
+    codec_cache_size: int | None = None,
+    persistent_query_cache: bool | str | os.PathLike[str] = False,
+    pool_metrics: metrics.PoolMetrics | None = None,
+    decode_json: bool | _json.JSONLoads = False,
+    share_codecs: bool = False,
 ) -> Client:
     return Client(
         connection_class=BlockingIOConnection,
         max_concurrency=max_concurrency,
+        min_size=min_size,
+        max_idle_time=max_idle_time,
+        max_lifetime=max_lifetime,
         # connect arguments
         dsn=dsn,
         host=host,
@@ -859,4 +1080,10 @@ def create_client(
         tls_security=tls_security,
         wait_until_available=wait_until_available,
         timeout=timeout,
+        query_cache_size=query_cache_size,
+        codec_cache_size=codec_cache_size,
+        persistent_query_cache=persistent_query_cache,
+        pool_metrics=pool_metrics,
+        decode_json=decode_json,
+        share_codecs=share_codecs,
     )
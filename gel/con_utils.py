@@ -33,6 +33,7 @@ from gel._internal import _platform
 
 from . import errors
 from . import credentials as cred_utils
+from . import scram
 
 
 EDGEDB_PORT = 5656
@@ -200,6 +201,27 @@ def _getenv(key: str) -> typing.Optional[str]:
     return _getenv_and_key(key)[0]
 
 
+class _ResumableSSLContext(ssl.SSLContext):
+    """An SSLContext offering the last saved session to the server.
+
+    A resumed session skips the certificate exchange and verification
+    of a full TLS handshake.  The session is saved with
+    save_tls_session() once a connection is established.
+    """
+
+    session: typing.Optional[ssl.SSLSession] = None
+
+    def wrap_socket(self, *args, session=None, **kwargs):
+        if session is None:
+            session = self.session
+        return super().wrap_socket(*args, session=session, **kwargs)
+
+    def wrap_bio(self, *args, session=None, **kwargs):
+        if session is None:
+            session = self.session
+        return super().wrap_bio(*args, session=session, **kwargs)
+
+
 class ResolvedConnectConfig:
     _host = None
     _host_source = None
@@ -380,6 +402,28 @@ class ResolvedConnectConfig:
 
         return "strict"
 
+    _scram_keys = None
+
+    def get_scram_keys(self, salt, iterations):
+        """Return the SCRAM ClientKey and ServerKey for the password.
+
+        The server sends the same salt and iteration count on every
+        login of a user, so the keys are derived once and kept here,
+        where all connections of a client find them.
+        """
+        if self._scram_keys is None:
+            self._scram_keys = {}
+        keys = self._scram_keys.get((salt, iterations))
+        if keys is None:
+            keys = scram.get_client_and_server_keys(
+                self.password or "", salt, iterations
+            )
+            self._scram_keys[salt, iterations] = keys
+        return keys
+
+    def clear_scram_keys(self):
+        self._scram_keys = None
+
     _ssl_ctx = None
 
     @property
@@ -392,7 +436,7 @@ class ResolvedConnectConfig:
         return self._ssl_ctx
 
     def make_ssl_ctx(self) -> ssl.SSLContext:
-        ssl_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_ctx = _ResumableSSLContext(ssl.PROTOCOL_TLS_CLIENT)
 
         if self._tls_ca_data:
             ssl_ctx.load_verify_locations(cadata=self._tls_ca_data)
@@ -1254,6 +1298,18 @@ def check_alpn_protocol(ssl_obj):
         )
 
 
+def save_tls_session(ssl_obj):
+    """Let new connections resume the TLS session of *ssl_obj*.
+
+    Call this after the first server messages are received: with TLS 1.3
+    the session tickets are only sent after the handshake.
+    """
+    ctx = ssl_obj.context
+    session = ssl_obj.session
+    if isinstance(ctx, _ResumableSSLContext) and session is not None:
+        ctx.session = session
+
+
 def render_client_no_connection_error(prefix, addr, attempts, duration):
     if isinstance(addr, str):
         msg = (
@@ -0,0 +1,175 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import annotations
+from typing import (
+    Any,
+    Iterator,
+    Mapping,
+    Sequence,
+    Union,
+)
+
+import array
+import itertools
+
+
+Column = Union["array.array[Any]", list[Any]]
+
+# Column kinds, see gel/protocol/columns.pyx.
+_NUMPY_DTYPES = {
+    "int16": "int16",
+    "int32": "int32",
+    "int64": "int64",
+    "float32": "float32",
+    "float64": "float64",
+    "bool": "bool",
+    "uuid": "uint8",
+    "datetime": "datetime64[us]",
+    "vector": "float32",
+}
+
+
+class Columns(Mapping[str, Column]):
+    """Result of query_columns(): one column per output field.
+
+    Fields of a fixed-width scalar type are stored in contiguous
+    buffers supporting the buffer protocol:
+
+    * ``std::int16``, ``std::int32``, ``std::int64``, ``std::float32``,
+      ``std::float64`` and ``std::bool`` in an :class:`array.array`;
+    * ``std::datetime`` and ``cal::local_datetime`` in an
+      :class:`array.array` of int64 microseconds since the Unix epoch;
+    * ``std::uuid`` in an :class:`array.array` of unsigned bytes
+      holding the 16 raw bytes of each UUID in turn;
+    * ``ext::pgvector::vector`` and ``ext::pgvector::halfvec`` in one
+      float32 :class:`array.array` holding the vectors of all rows one
+      after another, see :meth:`row_offsets`.
+
+    All other fields, as well as optional ones (which may be empty),
+    are decoded into a list of Python objects, as query() would do.
+    Columns are keyed by field name; elements of unnamed tuples and
+    plain scalar results are named by their position (``"0"``,
+    ``"1"``, ...).  Columns can also be looked up by position.
+    """
+
+    __slots__ = ("_columns", "_kinds", "_names", "_offsets", "_rows")
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        kinds: Sequence[str],
+        columns: Sequence[Column],
+        rows: int,
+        offsets: Sequence[array.array[int] | None] | None = None,
+    ) -> None:
+        self._names = tuple(names)
+        self._kinds = dict(zip(self._names, kinds, strict=True))
+        self._columns = dict(zip(self._names, columns, strict=True))
+        self._rows = rows
+        if offsets is None:
+            self._offsets = {}
+        else:
+            self._offsets = {
+                n: o
+                for n, o in zip(self._names, offsets, strict=True)
+                if o is not None
+            }
+
+    @property
+    def num_rows(self) -> int:
+        return self._rows
+
+    def kind(self, name: str) -> str:
+        """Return the storage kind of column *name*.
+
+        One of ``"int16"``, ``"int32"``, ``"int64"``, ``"float32"``,
+        ``"float64"``, ``"bool"``, ``"uuid"``, ``"datetime"``,
+        ``"vector"`` or ``"object"`` (a list of Python objects).
+        """
+        return self._kinds[name]
+
+    def row_offsets(self, name: str) -> array.array[int]:
+        """Return the row offsets of vector column *name*.
+
+        The result has ``num_rows + 1`` int64 elements: the vector of
+        row ``i`` is ``column[offsets[i]:offsets[i + 1]]``.  Empty
+        (optional) vectors are zero-length rows.
+        """
+        try:
+            return self._offsets[name]
+        except KeyError:
+            raise TypeError(f"{name!r} is not a vector column") from None
+
+    def __getitem__(self, key: str | int) -> Column:
+        if isinstance(key, int):
+            key = self._names[key]
+        return self._columns[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        cols = ", ".join(f"{n}: {self._kinds[n]}" for n in self._names)
+        return f"<gel.Columns rows={self._rows} {{{cols}}}>"
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return the columns as NumPy arrays.
+
+        Fixed-width columns are wrapped without copying; uuid columns
+        become ``(rows, 16)`` uint8 arrays, vector columns
+        ``(rows, dimensions)`` float32 matrices, and object columns
+        one-dimensional arrays of ``dtype=object``.  Requires NumPy.
+
+        Raises ValueError if the vectors of a column differ in size
+        (or some are empty); use :meth:`row_offsets` for those.
+        """
+        import numpy  # noqa: PLC0415
+
+        result = {}
+        for name in self._names:
+            col = self._columns[name]
+            kind = self._kinds[name]
+            if kind == "object":
+                arr = numpy.empty(len(col), dtype=object)
+                for i, v in enumerate(col):
+                    arr[i] = v
+            elif kind == "uuid":
+                arr = numpy.frombuffer(col, dtype="uint8").reshape(-1, 16)
+            elif kind == "vector":
+                arr = numpy.frombuffer(col, dtype=_NUMPY_DTYPES[kind])
+                dims = {
+                    b - a for a, b in itertools.pairwise(self._offsets[name])
+                }
+                if len(dims) > 1:
+                    raise ValueError(
+                        f"vectors of column {name!r} differ in size, "
+                        f"use row_offsets() to split them"
+                    )
+                arr = arr.reshape(self._rows, dims.pop() if dims else 0)
+            elif kind == "datetime":
+                arr = numpy.frombuffer(col, dtype="int64").view(
+                    _NUMPY_DTYPES[kind]
+                )
+            else:
+                arr = numpy.frombuffer(col, dtype=_NUMPY_DTYPES[kind])
+            result[name] = arr
+        return result
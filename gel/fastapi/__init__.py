@@ -13,6 +13,16 @@ else:
         Client,
         BlockingIOClient,
     )
+    from gel._internal._integration._fastapi._responses import (
+        JSONArrayStreamingResponse,
+        RawJSONResponse,
+    )
 
 
-__all__ = ["gelify", "Client", "BlockingIOClient"]
+__all__ = [
+    "gelify",
+    "Client",
+    "BlockingIOClient",
+    "JSONArrayStreamingResponse",
+    "RawJSONResponse",
+]
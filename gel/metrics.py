@@ -0,0 +1,151 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import annotations
+
+import bisect
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import errors
+
+    Address = str | tuple[str, int]
+
+
+__all__ = ("PoolMetrics", "PoolMetricsCollector")
+
+
+class PoolMetrics:
+    """Receiver of connection pool events.
+
+    Subclass it, override the methods of interest and pass an instance
+    as the *pool_metrics* argument of :func:`gel.create_client` or
+    :func:`gel.create_async_client`.  The methods are called
+    synchronously by the pool, so they must be quick and must not
+    raise.  When no *pool_metrics* is given the pool does not even
+    measure the durations.
+    """
+
+    def on_acquire(self, wait_time: float, in_use: int) -> None:
+        """A connection was checked out of the pool.
+
+        *wait_time* is the number of seconds spent waiting for a free
+        connection (including connecting it, if needed), *in_use* the
+        number of connections checked out including this one.
+        """
+
+    def on_release(self, hold_time: float, in_use: int) -> None:
+        """A connection was returned to the pool after *hold_time*
+        seconds; *in_use* connections remain checked out."""
+
+    def on_connect(self, connect_time: float, *, reconnect: bool) -> None:
+        """A connection was established in *connect_time* seconds.
+
+        *reconnect* is set if it replaces a connection that was broken,
+        expired or closed by the pool.
+        """
+
+    def on_connect_attempt(
+        self,
+        addr: Address,
+        connect_time: float,
+        error: Exception | None,
+    ) -> None:
+        """A connection attempt to *addr* finished in *connect_time*
+        seconds, successfully if *error* is None.
+
+        *addr* is the resolved address when known, so with a host that
+        resolves to several addresses the latency of each of them can
+        be told apart.  Successful attempts include the TLS and
+        protocol handshakes.
+        """
+
+    def on_retry(self, attempt: int, error: errors.EdgeDBError) -> None:
+        """A query or a transaction failed with *error* on its
+        *attempt*-th try and is going to be retried."""
+
+
+class PoolMetricsCollector(PoolMetrics):
+    """PoolMetrics aggregating the events in memory.
+
+    The acquire wait times are counted in a histogram: the i-th element
+    of *acquire_wait_counts* is the number of waits not longer than
+    ``buckets[i]`` seconds (and longer than the previous bucket); the
+    last element counts the waits longer than all buckets.
+
+    *connect_times* maps each address connected to the duration of the
+    latest successful connect, *connect_failures* counts the failed
+    attempts per address.
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(
+        self, buckets: typing.Iterable[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self._lock = threading.Lock()
+        self.buckets = tuple(sorted(buckets))
+        self.acquire_wait_counts = [0] * (len(self.buckets) + 1)
+        self.acquire_wait_total = 0.0
+        self.acquires = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.connects = 0
+        self.reconnects = 0
+        self.retries = 0
+        self.connect_times: dict[Address, float] = {}
+        self.connect_failures: dict[Address, int] = {}
+
+    def on_acquire(self, wait_time: float, in_use: int) -> None:
+        bucket = bisect.bisect_left(self.buckets, wait_time)
+        with self._lock:
+            self.acquires += 1
+            self.acquire_wait_total += wait_time
+            self.acquire_wait_counts[bucket] += 1
+            self.in_use = in_use
+            self.max_in_use = max(self.max_in_use, in_use)
+
+    def on_release(self, hold_time: float, in_use: int) -> None:
+        with self._lock:
+            self.in_use = in_use
+
+    def on_connect(self, connect_time: float, *, reconnect: bool) -> None:
+        with self._lock:
+            if reconnect:
+                self.reconnects += 1
+            else:
+                self.connects += 1
+
+    def on_connect_attempt(
+        self,
+        addr: Address,
+        connect_time: float,
+        error: Exception | None,
+    ) -> None:
+        with self._lock:
+            if error is None:
+                self.connect_times[addr] = connect_time
+            else:
+                self.connect_failures[addr] = (
+                    self.connect_failures.get(addr, 0) + 1
+                )
+
+    def on_retry(self, attempt: int, error: errors.EdgeDBError) -> None:
+        with self._lock:
+            self.retries += 1
@@ -21,6 +21,7 @@ from typing import Any
 from typing_extensions import Self
 
 import abc
+import contextlib
 import dataclasses
 import enum
 import logging
@@ -29,10 +30,14 @@ import typing
 import sys
 from collections import namedtuple
 
+from gel._internal._identity_map import IdentityMap as IdentityMap
 from gel._internal._polyfills import _strenum
 
 from . import errors
 
+if typing.TYPE_CHECKING:
+    from ._internal._save import SaveDebug
+
 
 logger = logging.getLogger("gel")
 
@@ -352,6 +357,8 @@ class State:
 
 
 class _OptionsMixin:
+    _options: _Options
+
     def __init__(self, *args, **kwargs):
         self._options = _Options.defaults()
         super().__init__(*args, **kwargs)
@@ -503,15 +510,100 @@ class _OptionsMixin:
         result._options = self._options.with_annotations(annotations)
         return result
 
+    def with_lazy_decoding(self, enabled: bool = True) -> Self:
+        """Returns object with lazy decoding of query results turned
+        on or off.
+
+        :param enabled bool:
+            Whether objects returned by queries should be decoded lazily.
+
+        In lazy mode, nested links, multi links, arrays and long str,
+        bytes and json values of the returned objects are kept in their
+        encoded form and decoded when the attribute is first accessed.
+        This makes queries with wide shapes cheaper when only some
+        of the fields are used.  Results decoded into model classes
+        are not affected.
+
+        This method returns a "shallow copy" of the current object
+        with modified options.
+        """
+        result = self._shallow_clone()
+        result._options = self._options.with_lazy_decoding(enabled)
+        return result
+
+    def with_identity_map(
+        self, identity_map: IdentityMap | None = None
+    ) -> Self:
+        """Returns object that decodes query results into model
+        instances through an identity map.
+
+        :param identity_map:
+            The :py:class:`IdentityMap` to use.  If omitted, a new,
+            empty one is created.
+
+        Within an identity map every object is decoded into a single
+        model instance: when a query returns an object that an earlier
+        query already fetched (and that instance is still alive), the
+        new fields are merged into the existing instance and it is
+        returned again.  The merge overwrites the fields of that
+        instance in place, so every holder of the instance sees the
+        new values; fields with unsaved changes keep their local
+        values.  Instances are held weakly, so the map doesn't keep
+        objects alive.
+
+        Use an identity map for a single request or unit of work only,
+        never for a whole process or for concurrent requests: their
+        queries would overwrite each other's instances.
+        :py:meth:`identity_map_scope` creates a fresh map for a block
+        of code.  Results that are not decoded into model classes are
+        not affected.
+
+        This method returns a "shallow copy" of the current object
+        with modified options.
+        """
+        if identity_map is None:
+            identity_map = IdentityMap()
+        result = self._shallow_clone()
+        result._options = self._options.with_identity_map(identity_map)
+        return result
+
+    def without_identity_map(self) -> Self:
+        result = self._shallow_clone()
+        result._options = self._options.with_identity_map(None)
+        return result
+
+    @contextlib.contextmanager
+    def identity_map_scope(self) -> typing.Iterator[Self]:
+        """Returns a context manager that yields a copy of the client
+        using a new, empty identity map.
+
+        The map is cleared when the block exits, so instances fetched
+        afterwards through the yielded client are separate from the
+        ones fetched within the block::
+
+            with client.identity_map_scope() as uow:
+                user = uow.get(User.filter(name="Alice"))
+                ...
+
+        See :py:meth:`with_identity_map` for details.
+        """
+        identity_map = IdentityMap()
+        try:
+            yield self.with_identity_map(identity_map)
+        finally:
+            identity_map.clear()
+
     def _with_debug(
         self,
         *,
         save_postcheck: bool = False,
+        save_debug: typing.Callable[[SaveDebug], None] | None = None,
     ) -> Self:
         result = self._shallow_clone()
         result._options = self._options.with_debug(
             self._options._debug.with_flags(
                 save_postcheck=save_postcheck,
+                save_debug=save_debug,
             )
         )
         return result
@@ -520,9 +612,11 @@ class _OptionsMixin:
 @dataclasses.dataclass(frozen=True)
 class Debug:
     save_postcheck: bool = False
+    # Called with the per-phase timings of every save()/sync().
+    save_debug: typing.Callable[[SaveDebug], None] | None = None
 
     def with_flags(self, **flags: Any) -> Debug:
-        return Debug(**(dataclasses.asdict(self) | flags))
+        return dataclasses.replace(self, **flags)
 
 
 class _Options:
@@ -535,6 +629,8 @@ class _Options:
         "_warning_handler",
         "_annotations",
         "_debug",
+        "_lazy_decoding",
+        "_identity_map",
     ]
 
     def __init__(
@@ -545,6 +641,8 @@ class _Options:
         warning_handler: WarningHandler | None,
         annotations: typing.Dict[str, str],
         debug: Debug,
+        lazy_decoding: bool = False,
+        identity_map: IdentityMap | None = None,
     ):
         self._retry_options = retry_options
         self._transaction_options = transaction_options
@@ -552,6 +650,8 @@ class _Options:
         self._warning_handler = warning_handler
         self._annotations = annotations
         self._debug = debug
+        self._lazy_decoding = lazy_decoding
+        self._identity_map = identity_map
 
     @property
     def retry_options(self):
@@ -573,6 +673,14 @@ class _Options:
     def annotations(self):
         return self._annotations
 
+    @property
+    def lazy_decoding(self):
+        return self._lazy_decoding
+
+    @property
+    def identity_map(self) -> IdentityMap | None:
+        return self._identity_map
+
     def with_retry_options(self, options: RetryOptions | None):
         return _Options(
             options,
@@ -581,6 +689,8 @@ class _Options:
             self._warning_handler,
             self._annotations,
             self._debug,
+            self._lazy_decoding,
+            self._identity_map,
         )
 
     def with_transaction_options(
@@ -594,6 +704,8 @@ class _Options:
             self._warning_handler,
             self._annotations,
             self._debug,
+            self._lazy_decoding,
+            self._identity_map,
         )
 
     def with_state(self, state: State):
@@ -604,6 +716,8 @@ class _Options:
             self._warning_handler,
             self._annotations,
             self._debug,
+            self._lazy_decoding,
+            self._identity_map,
         )
 
     def with_warning_handler(
@@ -617,6 +731,8 @@ class _Options:
             warning_handler,
             self._annotations,
             self._debug,
+            self._lazy_decoding,
+            self._identity_map,
         )
 
     def with_annotations(self, annotations: typing.Dict[str, str]):
@@ -627,6 +743,8 @@ class _Options:
             self._warning_handler,
             annotations,
             self._debug,
+            self._lazy_decoding,
+            self._identity_map,
         )
 
     def with_debug(self, debug: Debug):
@@ -637,6 +755,32 @@ class _Options:
             self._warning_handler,
             self._annotations,
             debug,
+            self._lazy_decoding,
+            self._identity_map,
+        )
+
+    def with_lazy_decoding(self, lazy_decoding: bool):
+        return _Options(
+            self._retry_options,
+            self._transaction_options,
+            self._state,
+            self._warning_handler,
+            self._annotations,
+            self._debug,
+            lazy_decoding,
+            self._identity_map,
+        )
+
+    def with_identity_map(self, identity_map: IdentityMap | None):
+        return _Options(
+            self._retry_options,
+            self._transaction_options,
+            self._state,
+            self._warning_handler,
+            self._annotations,
+            self._debug,
+            self._lazy_decoding,
+            identity_map,
         )
 
     @classmethod
@@ -33,3 +33,10 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         object loop
         object msg_waiter
         object writable
+        bint reading_paused
+
+        bytes recv_buf
+        Py_ssize_t recv_buf_size
+
+    cdef resume_reading(self)
+    cdef _on_data_received(self)
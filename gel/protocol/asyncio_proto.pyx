@@ -19,15 +19,33 @@
 
 import asyncio
 
+cimport cpython
+from cpython.buffer cimport PyBUF_WRITE
+from cpython.memoryview cimport PyMemoryView_FromMemory
+from cpython.object cimport PyObject
+
 from gel import errors
 from gel.pgproto.pgproto cimport (
     WriteBuffer,
     ReadBuffer,
 )
 
+from . cimport cpythonx
 from . cimport protocol
 
 
+# Stop reading from the transport once this many bytes are buffered
+# and not yet consumed by the protocol (e.g. while a query_iter()
+# consumer is busy processing the rows it was given).
+DEF RECV_BUF_HIGH_WATERMARK = 1024 * 1024
+
+# Bounds for the size of the receive buffer handed out by get_buffer().
+# The buffer doubles every time a read fills it completely and shrinks
+# back when reads stay well below its size.
+DEF RECV_BUF_MIN_SIZE = 16 * 1024
+DEF RECV_BUF_MAX_SIZE = 1024 * 1024
+
+
 cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
 
     def __init__(self, con_params, loop):
@@ -39,6 +57,9 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         self.disconnected_fut = None
         self.writable = asyncio.Event()
         self.writable.set()
+        self.reading_paused = False
+        self.recv_buf = None
+        self.recv_buf_size = RECV_BUF_MIN_SIZE
 
         self.msg_waiter = None
 
@@ -49,6 +70,12 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
             self.transport.close()
             self.transport = None
 
+    cdef resume_reading(self):
+        if self.reading_paused:
+            self.reading_paused = False
+            if self.transport is not None:
+                self.transport.resume_reading()
+
     cdef write(self, WriteBuffer buf):
         if self.transport is None:
             raise errors.ClientConnectionFailedTemporarilyError()
@@ -58,6 +85,8 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         if self.buffer.take_message():
             return
 
+        self.resume_reading()
+
         try:
             self.msg_waiter = self.loop.create_future()
             await self.msg_waiter
@@ -84,6 +113,7 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         if not self.connected:
             return
         else:
+            self.resume_reading()
             self.disconnected_fut = self.loop.create_future()
             try:
                 await self.disconnected_fut
@@ -135,6 +165,64 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
 
     def data_received(self, data):
         self.buffer.feed_data(data)
+        self._on_data_received()
+
+    def get_buffer(self, sizehint):
+        # Hand out a writable view onto a fresh, not yet shared bytes
+        # object so that the read can be fed into the ReadBuffer without
+        # copying (see buffer_updated()).
+        if self.recv_buf is None:
+            self.recv_buf = cpython.PyBytes_FromStringAndSize(
+                NULL, self.recv_buf_size)
+        return PyMemoryView_FromMemory(
+            cpython.PyBytes_AS_STRING(self.recv_buf),
+            self.recv_buf_size,
+            PyBUF_WRITE,
+        )
+
+    def buffer_updated(self, Py_ssize_t nbytes):
+        cdef:
+            PyObject *buf
+            bytes data
+
+        # Take over the receive buffer and feed it to the ReadBuffer as
+        # is; a new one is allocated by the next get_buffer().  The
+        # ReadBuffer only accepts bytes, so a partial read is not fed
+        # as a memoryview slice but truncated in place instead.  This
+        # is safe as we hold the only reference to the object: the view
+        # returned by get_buffer() points at its memory without owning
+        # it.
+        buf = <PyObject*>self.recv_buf
+        cpython.Py_INCREF(self.recv_buf)
+        self.recv_buf = None
+        if nbytes != self.recv_buf_size:
+            # On failure this releases the object and sets buf to NULL.
+            cpythonx._PyBytes_Resize(&buf, nbytes)
+        data = <bytes>buf
+        cpython.Py_DECREF(data)
+
+        if nbytes == self.recv_buf_size:
+            if self.recv_buf_size < RECV_BUF_MAX_SIZE:
+                self.recv_buf_size *= 2
+        elif (
+            nbytes < self.recv_buf_size // 4
+            and self.recv_buf_size > RECV_BUF_MIN_SIZE
+        ):
+            self.recv_buf_size //= 2
+
+        self.buffer.feed_data(data)
+        self._on_data_received()
+
+    cdef _on_data_received(self):
+        if (
+            self.msg_waiter is None
+            and not self.reading_paused
+            and self.buffer.len() > RECV_BUF_HIGH_WATERMARK
+        ):
+            # Nobody is waiting for this data; it will be resumed by
+            # the next wait_for_message() once the buffer is drained.
+            self.reading_paused = True
+            self.transport.pause_reading()
 
         if (self.msg_waiter is not None and
                 self.buffer.take_message() and
@@ -144,3 +232,12 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
 
     def eof_received(self):
         pass
+
+
+class BufferedAsyncIOProtocol(AsyncIOProtocol, asyncio.BufferedProtocol):
+    """AsyncIOProtocol that receives data via get_buffer()/buffer_updated().
+
+    asyncio picks the receive path based on an isinstance() check against
+    asyncio.BufferedProtocol, which an extension type cannot inherit from
+    directly.
+    """
@@ -56,6 +56,29 @@ cdef class BaseArrayCodec(BaseCodec):
                 )
             )
 
+        if (
+            type(self.sub_codec) is ScalarCodec
+            and not cpython.PyList_Check(obj)
+            and not cpython.PyTuple_Check(obj)
+        ):
+            elem_bytes = _encode_buffer_elements(
+                <ScalarCodec>self.sub_codec, obj)
+            if elem_bytes is not None:
+                objlen = (
+                    cpython.PyBytes_GET_SIZE(elem_bytes)
+                    // (4 + _scalar_width(<ScalarCodec>self.sub_codec))
+                )
+                buf.write_int32(12 + 8 * ndims + len(elem_bytes))
+                buf.write_int32(ndims)  # number of dimensions
+                buf.write_int32(0)  # flags
+                buf.write_int32(0)  # reserved
+
+                buf.write_int32(<int32_t>objlen)
+                buf.write_int32(1)
+
+                buf.write_bytes(elem_bytes)
+                return
+
         if not _is_array_iterable(obj):
             raise TypeError(
                 'a sized iterable container expected (got type {!r})'.format(
@@ -107,23 +130,29 @@ cdef class BaseArrayCodec(BaseCodec):
     cdef decode(self, object return_type, FRBuffer *buf):
         return self._decode_array(False, return_type, buf, True)
 
-    cdef adapt_to_return_type(self, object return_type):
-        if return_type is self.cached_return_type:
+    cdef tuple adapt_to_return_type(self, object return_type):
+        # Return (return_type, element_type, dlist_type).  Like in
+        # ObjectCodec, the result is kept in a single attribute because
+        # codecs can be shared by several threads.
+        cdef tuple cached = self.cached_adapted
+
+        if cached is not None and cached[0] is return_type:
             # return_type should always be the same in the overwhelming
             # number of scenarios, so we should only do the expensive task
             # of introspecting the return_type and tailoring to it once
             # per Object codec's entire lifespan.
-            return
+            return cached
 
         if return_type is None:
-            self.cached_return_type = None
-            self.cached_element_type = None
-            self.cached_dlist_type = None
-            return
-
-        self.cached_return_type = return_type
-        self.cached_dlist_type = return_type.__gel_resolve_dlist__()
-        self.cached_element_type = return_type.__element_type__
+            cached = (None, None, None)
+        else:
+            cached = (
+                return_type,
+                return_type.__element_type__,
+                return_type.__gel_resolve_dlist__(),
+            )
+        self.cached_adapted = cached
+        return cached
 
     cdef inline _decode_array(self, bint is_set, object return_type, FRBuffer *buf, bint decoding_array):
         cdef:
@@ -138,9 +167,8 @@ cdef class BaseArrayCodec(BaseCodec):
             object dlist_type
 
         if decoding_array:
-            self.adapt_to_return_type(return_type)
-            element_type = self.cached_element_type
-            dlist_type = self.cached_dlist_type
+            _, element_type, dlist_type = self.adapt_to_return_type(
+                return_type)
         else:
             element_type = return_type
             dlist_type = None
@@ -263,6 +291,102 @@ cdef class ArrayCodec(BaseArrayCodec):
         )
 
 
+cdef inline int32_t _scalar_width(ScalarCodec codec):
+    cdef pgproto.encode_func encoder = codec.c_encoder
+
+    if encoder == <pgproto.encode_func>checked_int2_encode:
+        return 2
+    elif (
+        encoder == <pgproto.encode_func>checked_int4_encode
+        or encoder == <pgproto.encode_func>pgproto.float4_encode
+    ):
+        return 4
+    elif (
+        encoder == <pgproto.encode_func>checked_int8_encode
+        or encoder == <pgproto.encode_func>pgproto.float8_encode
+    ):
+        return 8
+    else:
+        return 0
+
+
+cdef _encode_buffer_elements(ScalarCodec codec, object obj):
+    # Encode the elements of an array.array, memoryview, NumPy array or
+    # any other object exporting a 1-dimensional buffer of the codec's
+    # exact C type in a single pass, without boxing every element.
+    # Returns None if obj isn't such a buffer.
+    cdef:
+        pgproto.encode_func encoder = codec.c_encoder
+        int32_t width = _scalar_width(codec)
+        const int16_t[:] i16view
+        const int32_t[:] i32view
+        const int64_t[:] i64view
+        const float[:] f32view
+        const double[:] f64view
+        Py_ssize_t objlen
+        Py_ssize_t i
+        bytes result
+        char *p
+
+    if width == 0 or not cpython.PyObject_CheckBuffer(obj):
+        return None
+
+    try:
+        if encoder == <pgproto.encode_func>checked_int2_encode:
+            i16view = obj
+            objlen = i16view.shape[0]
+        elif encoder == <pgproto.encode_func>checked_int4_encode:
+            i32view = obj
+            objlen = i32view.shape[0]
+        elif encoder == <pgproto.encode_func>checked_int8_encode:
+            i64view = obj
+            objlen = i64view.shape[0]
+        elif encoder == <pgproto.encode_func>pgproto.float4_encode:
+            f32view = obj
+            objlen = f32view.shape[0]
+        else:
+            f64view = obj
+            objlen = f64view.shape[0]
+    except (ValueError, TypeError):
+        # Wrong item type or number of dimensions: let the generic
+        # path convert (or reject) the elements one by one.
+        return None
+
+    if objlen > _MAXINT32:
+        raise ValueError('too many elements in array value')
+
+    result = cpython.PyBytes_FromStringAndSize(NULL, objlen * (4 + width))
+    p = cpython.PyBytes_AS_STRING(result)
+
+    if width == 2:
+        for i in range(objlen):
+            hton.pack_int32(p, 2)
+            hton.pack_int16(p + 4, i16view[i])
+            p += 6
+    elif encoder == <pgproto.encode_func>checked_int4_encode:
+        for i in range(objlen):
+            hton.pack_int32(p, 4)
+            hton.pack_int32(p + 4, i32view[i])
+            p += 8
+    elif encoder == <pgproto.encode_func>checked_int8_encode:
+        for i in range(objlen):
+            hton.pack_int32(p, 8)
+            hton.pack_int64(p + 4, i64view[i])
+            p += 12
+    elif encoder == <pgproto.encode_func>pgproto.float4_encode:
+        for i in range(objlen):
+            hton.pack_int32(p, 4)
+            hton.pack_float(p + 4, f32view[i])
+            p += 8
+    else:
+        for i in range(objlen):
+            hton.pack_int32(p, 8)
+            hton.pack_double(p + 4, f64view[i])
+            p += 12
+
+    return result
+
+
 cdef inline bint _is_trivial_container(object obj):
     return cpython.PyUnicode_Check(obj) or cpython.PyBytes_Check(obj) or \
             cpythonx.PyByteArray_Check(obj) or cpythonx.PyMemoryView_Check(obj)
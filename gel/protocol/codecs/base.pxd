@@ -47,13 +47,31 @@ cdef class CodecPythonOverride(BaseCodec):
                        object decoder)
 
 
+cdef class JSONCodecOverride(BaseCodec):
+
+    cdef:
+        BaseCodec codec
+        object encoder
+        object decoder
+
+    @staticmethod
+    cdef BaseCodec new(bytes tid,
+                       BaseCodec basecodec,
+                       object encoder,
+                       object decoder)
+
+
 cdef class BaseRecordCodec(BaseCodec):
 
     cdef:
         tuple fields_codecs
         uint64_t encoder_flags
+        bytes flat_layout
+        Py_ssize_t flat_size
 
     cdef _check_encoder(self)
+    cdef init_flat_layout(self)
+    cdef decode_flat(self, object result, FRBuffer *buf)
 
 
 cdef class EmptyTupleCodec(BaseCodec):
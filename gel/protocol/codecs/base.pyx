@@ -25,6 +25,19 @@ from collections.abc import Mapping as MappingABC
 cdef uint64_t RECORD_ENCODER_CHECKED = 1 << 0
 cdef uint64_t RECORD_ENCODER_INVALID = 1 << 1
 
+# Element kinds of records made of fixed-width scalars only, see
+# BaseRecordCodec.init_flat_layout().
+DEF FLAT_INT16 = 1
+DEF FLAT_INT32 = 2
+DEF FLAT_INT64 = 3
+DEF FLAT_FLOAT32 = 4
+DEF FLAT_FLOAT64 = 5
+DEF FLAT_BOOL = 6
+# Fixed-width scalars decoded by their ScalarCodec.c_decoder.
+DEF FLAT_FIXED4 = 7
+DEF FLAT_FIXED8 = 8
+DEF FLAT_FIXED16 = 9
+
 cdef bytes NULL_CODEC_ID = b'\x00' * 16
 cdef bytes EMPTY_TUPLE_CODEC_ID = TYPE_IDS.get('empty-tuple').bytes
 
@@ -92,6 +105,70 @@ cdef class CodecPythonOverride(BaseCodec):
         return self.codec.make_type(describe_context)
 
 
+cdef class JSONCodecOverride(BaseCodec):
+    # Unlike CodecPythonOverride, the decoder is handed the encoded
+    # JSON document as bytes, so that it can be parsed without
+    # decoding it into a str first.
+
+    def __cinit__(self):
+        self.codec = None
+        self.encoder = None
+        self.decoder = None
+
+    cdef encode(self, WriteBuffer buf, object obj):
+        cdef:
+            object data = self.encoder(obj)
+            Py_ssize_t size
+
+        if isinstance(data, str):
+            data = (<str>data).encode('utf-8')
+        elif not isinstance(data, bytes):
+            data = bytes(data)
+
+        size = len(data)
+        if size > 0x7fffffff - 1:
+            raise ValueError('string too long')
+
+        buf.write_int32(<int32_t>size + 1)
+        buf.write_byte(1)  # JSONB format version
+        buf.write_bytes(data)
+
+    cdef decode(self, object return_type, FRBuffer *buf):
+        cdef:
+            uint8_t format = <uint8_t>(frb_read(buf, 1)[0])
+            Py_ssize_t size
+
+        if format != 1:
+            raise ValueError(f'unexpected JSONB format: {format}')
+
+        size = frb_get_len(buf)
+        return self.decoder(
+            PyBytes_FromStringAndSize(frb_read_all(buf), size))
+
+    cdef dump(self, int level = 0):
+        return f'{level * " "}<JSON override>{self.name}'
+
+    @staticmethod
+    cdef BaseCodec new(bytes tid,
+                       BaseCodec basecodec,
+                       object encoder,
+                       object decoder):
+
+        cdef:
+            JSONCodecOverride codec
+
+        codec = JSONCodecOverride.__new__(JSONCodecOverride)
+        codec.tid = tid
+        codec.name = basecodec.name
+        codec.codec = basecodec
+        codec.encoder = encoder
+        codec.decoder = decoder
+        return codec
+
+    def make_type(self, describe_context):
+        return self.codec.make_type(describe_context)
+
+
 cdef class EmptyTupleCodec(BaseCodec):
 
     def __cinit__(self):
@@ -144,6 +221,8 @@ cdef class BaseRecordCodec(BaseCodec):
     def __cinit__(self):
         self.fields_codecs = ()
         self.encoder_flags = 0
+        self.flat_layout = None
+        self.flat_size = 0
 
     cdef _check_encoder(self):
         if not (self.encoder_flags & RECORD_ENCODER_CHECKED):
@@ -211,6 +290,130 @@ cdef class BaseRecordCodec(BaseCodec):
         buf.write_int32(<int32_t><uint32_t>objlen)
         buf.write_buffer(elem_data)
 
+    cdef init_flat_layout(self):
+        # If all elements are fixed-width scalars, every non-NULL value
+        # of the record has the same size and layout; remember it so
+        # that decode_flat() can unpack the elements in one pass.
+        cdef:
+            bytearray layout = bytearray()
+            Py_ssize_t size = 4
+            char kind
+
+        self.flat_layout = None
+        self.flat_size = 0
+
+        for codec in self.fields_codecs:
+            kind = _flat_kind(<BaseCodec>codec)
+            if not kind:
+                return
+            layout.append(kind)
+            size += 8 + _flat_width(kind)
+
+        if layout:
+            self.flat_layout = bytes(layout)
+            self.flat_size = size
+
+    cdef decode_flat(self, object result, FRBuffer *buf):
+        # Fill the (named) tuple *result* from a record of exactly
+        # flat_size bytes; the caller checks the size, which also
+        # rules out NULL elements.
+        cdef:
+            const char *data = frb_read(buf, self.flat_size)
+            const char *layout = cpython.PyBytes_AS_STRING(self.flat_layout)
+            Py_ssize_t elem_count = len(self.flat_layout)
+            Py_ssize_t i
+            int32_t width
+            char kind
+            FRBuffer elem_buf
+
+        if <Py_ssize_t><uint32_t>hton.unpack_int32(data) != elem_count:
+            raise RuntimeError(
+                f'cannot decode {self.name}: expected {elem_count} '
+                f'elements, got {<uint32_t>hton.unpack_int32(data)}')
+        data += 4
+
+        for i in range(elem_count):
+            kind = layout[i]
+            width = _flat_width(kind)
+            # data points at the reserved int32 and the element length
+            if hton.unpack_int32(data + 4) != width:
+                raise RuntimeError(
+                    f'unexpected {self.name} element length: '
+                    f'{hton.unpack_int32(data + 4)}, expected {width}')
+            data += 8
+
+            if kind == FLAT_INT16:
+                elem = cpython.PyLong_FromLong(hton.unpack_int16(data))
+            elif kind == FLAT_INT32:
+                elem = cpython.PyLong_FromLong(hton.unpack_int32(data))
+            elif kind == FLAT_INT64:
+                elem = cpython.PyLong_FromLongLong(hton.unpack_int64(data))
+            elif kind == FLAT_FLOAT32:
+                elem = cpython.PyFloat_FromDouble(hton.unpack_float(data))
+            elif kind == FLAT_FLOAT64:
+                elem = cpython.PyFloat_FromDouble(hton.unpack_double(data))
+            elif kind == FLAT_BOOL:
+                elem = True if data[0] else False
+            else:
+                frb_init(&elem_buf, data, width)
+                elem = (<ScalarCodec>self.fields_codecs[i]).c_decoder(
+                    DEFAULT_CODEC_CONTEXT, &elem_buf)
+            data += width
+
+            cpython.Py_INCREF(elem)
+            cpython.PyTuple_SET_ITEM(result, i, elem)
+
+        return result
+
+
+cdef inline char _flat_kind(BaseCodec codec):
+    cdef pgproto.decode_func decoder
+
+    # Derived scalars share the decoder of their base type; Python-level
+    # codec overrides are not ScalarCodecs and keep the generic path.
+    if type(codec) is not ScalarCodec:
+        return 0
+    decoder = (<ScalarCodec>codec).c_decoder
+    if decoder == <pgproto.decode_func>pgproto.int2_decode:
+        return FLAT_INT16
+    elif decoder == <pgproto.decode_func>pgproto.int4_decode:
+        return FLAT_INT32
+    elif decoder == <pgproto.decode_func>pgproto.int8_decode:
+        return FLAT_INT64
+    elif decoder == <pgproto.decode_func>pgproto.float4_decode:
+        return FLAT_FLOAT32
+    elif decoder == <pgproto.decode_func>pgproto.float8_decode:
+        return FLAT_FLOAT64
+    elif decoder == <pgproto.decode_func>pgproto.bool_decode:
+        return FLAT_BOOL
+    elif decoder == <pgproto.decode_func>pgproto.date_decode:
+        return FLAT_FIXED4
+    elif (
+        decoder == <pgproto.decode_func>pgproto.timestamptz_decode
+        or decoder == <pgproto.decode_func>pgproto.timestamp_decode
+        or decoder == <pgproto.decode_func>pgproto.time_decode
+    ):
+        return FLAT_FIXED8
+    elif decoder == <pgproto.decode_func>pgproto.uuid_decode:
+        return FLAT_FIXED16
+    else:
+        return 0
+
+
+cdef inline int32_t _flat_width(char kind):
+    if kind == FLAT_INT16:
+        return 2
+    elif kind == FLAT_BOOL:
+        return 1
+    elif (
+        kind == FLAT_INT32 or kind == FLAT_FLOAT32 or kind == FLAT_FIXED4
+    ):
+        return 4
+    elif kind == FLAT_FIXED16:
+        return 16
+    else:
+        return 8
+
 
 cdef class BaseNamedRecordCodec(BaseRecordCodec):
 
@@ -27,14 +27,36 @@ include "./range.pxd"
 include "./set.pxd"
 include "./enum.pxd"
 include "./record.pxd"
+include "./lazy.pxd"
+
+
+cdef class SharedCodecsCache:
+
+    cdef:
+        object _entries
+        object _lock
+        Py_ssize_t _maxsize
+        Py_ssize_t _max_bytes
+        Py_ssize_t _nbytes
+
+        readonly unsigned long long hits
+        readonly unsigned long long misses
+        readonly unsigned long long evictions
+
+    cdef tuple get(self, object key)
+    cdef put(self, object key, Py_ssize_t nbytes, tuple codecs)
 
 
 cdef class CodecsRegistry:
 
     cdef:
-        LRUMapping codecs_build_cache
-        LRUMapping codecs
+        readonly LRUMapping codecs_build_cache
+        readonly LRUMapping codecs
         dict base_codec_overrides
+        dict override_specs
+        object overrides_key
+        readonly SharedCodecsCache shared_cache
+        readonly unsigned long long codec_builds
 
     cdef BaseCodec _build_codec(self, FRBuffer *spec, list codecs_list,
                                 protocol_version)
@@ -42,3 +64,4 @@ cdef class CodecsRegistry:
 
     cdef has_codec(self, bytes type_id)
     cdef BaseCodec get_codec(self, bytes type_id)
+    cdef object get_json_decoder(self)
@@ -22,6 +22,7 @@ import inspect
 import decimal
 import uuid
 import datetime
+import threading
 from gel import describe
 from gel import enums
 from gel.datatypes import datatypes
@@ -29,8 +30,11 @@ from gel.datatypes import datatypes
 from libc.string cimport memcpy
 from cpython.bytes cimport PyBytes_FromStringAndSize
 
+from gel._internal import _identity_map
+from gel._internal import _json
 from gel._internal import _tracked_list
 cdef DLIST_READ_WRITE = _tracked_list.Mode.ReadWrite
+cdef IDENTITY_MAP = _identity_map.current
 
 include "./edb_types.pxi"
 
@@ -45,6 +49,7 @@ include "./range.pyx"
 include "./set.pyx"
 include "./enum.pyx"
 include "./record.pyx"
+include "./lazy.pyx"
 
 
 DEF CTYPE_SET = 0
@@ -64,6 +69,8 @@ DEF CTYPE_SQL_ROW = 13
 DEF CTYPE_ANNO_TYPENAME = 255
 
 DEF _CODECS_BUILD_CACHE_SIZE = 200
+DEF _SHARED_CODECS_CACHE_SIZE = 1000
+DEF _SHARED_CODECS_CACHE_BYTES = 16 * 1024 * 1024
 
 DEF NBASE = 10000
 DEF NUMERIC_POS = 0x0000
@@ -71,34 +78,161 @@ DEF NUMERIC_NEG = 0x4000
 
 cdef BaseCodec NULL_CODEC = NullCodec.__new__(NullCodec)
 cdef BaseCodec EMPTY_TUPLE_CODEC = EmptyTupleCodec.__new__(EmptyTupleCodec)
+cdef bytes JSON_TYPE_ID = TYPE_IDS['std::json'].bytes
+
+
+cdef class SharedCodecsCache:
+    """Thread-safe LRU cache of codecs built from type descriptors.
+
+    Entries are keyed by the protocol version, the custom type codecs
+    of the registry and the type descriptor bytes, so registries of
+    different clients talking to the same schema can reuse each
+    other's codecs.  The cache is bounded both by the number of
+    entries and by the total size of the cached type descriptors.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize=_SHARED_CODECS_CACHE_SIZE,
+        max_bytes=_SHARED_CODECS_CACHE_BYTES,
+    ):
+        if maxsize <= 0:
+            raise ValueError(
+                f'maxsize is expected to be greater than 0, got {maxsize}')
+        if max_bytes <= 0:
+            raise ValueError(
+                f'max_bytes is expected to be greater than 0, '
+                f'got {max_bytes}')
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._max_bytes = max_bytes
+        self._nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    cdef tuple get(self, object key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)  # last=True
+            return (<tuple>entry)[1]
+
+    cdef put(self, object key, Py_ssize_t nbytes, tuple codecs):
+        if nbytes > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (nbytes, codecs)
+            self._nbytes += nbytes
+            while (
+                len(self._entries) > self._maxsize
+                or self._nbytes > self._max_bytes
+            ):
+                _, entry = self._entries.popitem(last=False)
+                self._nbytes -= (<tuple>entry)[0]
+                self.evictions += 1
+
+
+cdef SharedCodecsCache SHARED_CODECS_CACHE = SharedCodecsCache()
+
+
+def get_shared_codecs_cache():
+    """Return the codecs cache shared by all clients in the process."""
+    return SHARED_CODECS_CACHE
 
 
 cdef class CodecsRegistry:
 
-    def __init__(self, *, cache_size=1000):
-        self.codecs_build_cache = LRUMapping(maxsize=_CODECS_BUILD_CACHE_SIZE)
+    def __init__(
+        self,
+        *,
+        cache_size=1000,
+        build_cache_size=_CODECS_BUILD_CACHE_SIZE,
+        shared_cache=None,
+    ):
+        self.codecs_build_cache = LRUMapping(maxsize=build_cache_size)
         self.codecs = LRUMapping(maxsize=cache_size)
         self.base_codec_overrides = {}
+        self.codec_builds = 0
+        self.shared_cache = shared_cache
+        self.override_specs = {}
+        self.overrides_key = frozenset()
 
     def clear_cache(self):
         self.codecs.clear()
         self.codecs_build_cache.clear()
 
     def set_type_codec(self, typeid, *, encoder, decoder, format):
-        if format != 'python':
-            raise ValueError('"python" is the only valid format')
+        if format not in {'python', 'json'}:
+            raise ValueError('format must be either "python" or "json"')
         if not isinstance(typeid, uuid.UUID):
             raise TypeError('typeid must be a UUID')
         basecodec = BASE_SCALAR_CODECS.get(typeid.bytes)
         if basecodec is None:
             raise ValueError(
                 f'{typeid} does not correspond to any known base type')
-        self.base_codec_overrides[typeid.bytes] = CodecPythonOverride.new(
-            typeid.bytes,
-            basecodec,
-            encoder,
-            decoder,
-        )
+        if format == 'json':
+            # The decoder receives the JSON document as bytes and the
+            # encoder may return either str or bytes.
+            if basecodec.name != 'std::json':
+                raise ValueError(
+                    f'"json" format is not supported for {basecodec.name}')
+            codec = JSONCodecOverride.new(
+                typeid.bytes,
+                basecodec,
+                encoder,
+                decoder,
+            )
+        else:
+            codec = CodecPythonOverride.new(
+                typeid.bytes,
+                basecodec,
+                encoder,
+                decoder,
+            )
+        self.base_codec_overrides[typeid.bytes] = codec
+
+        # Codecs built with custom type codecs may only be shared with
+        # registries using the very same ones.
+        self.override_specs[typeid.bytes] = (format, encoder, decoder)
+        try:
+            self.overrides_key = frozenset(self.override_specs.items())
+        except TypeError:
+            # Unhashable encoder or decoder; don't share codecs.
+            self.overrides_key = None
+
+    cdef object get_json_decoder(self):
+        codec = self.base_codec_overrides.get(JSON_TYPE_ID)
+        if type(codec) is JSONCodecOverride:
+            return (<JSONCodecOverride>codec).decoder
+        return _json.default_parser()[0]
 
     cdef BaseCodec _build_codec(self, FRBuffer *spec, list codecs_list,
                                 protocol_version):
@@ -120,9 +254,9 @@ cdef class CodecsRegistry:
         t = <uint8_t>(frb_read(spec, 1)[0])
         tid = frb_read(spec, 16)[:16]
 
-        res = self.codecs.get(tid, None)
+        res = self.codecs.lookup(tid, None)
         if res is None:
-            res = self.codecs_build_cache.get(tid, None)
+            res = self.codecs_build_cache.lookup(tid, None)
         if res is not None:
             # We have a codec for this "tid"; advance the buffer
             # so that we can process the next codec.
@@ -533,20 +667,22 @@ cdef class CodecsRegistry:
             raise NotImplementedError(
                 f'no codec implementation for EdgeDB data class {t}')
 
+        self.codec_builds += 1
         self.codecs_build_cache[tid] = res
         return res
 
     cdef has_codec(self, bytes type_id):
-        return (
-            type_id in self.codecs or
-            type_id in {NULL_CODEC_ID, EMPTY_TUPLE_CODEC_ID}
-        )
+        # This is the lookup counted in the codecs cache stats: it is
+        # made once for each type described by the server, and followed
+        # by either get_codec() or build_codec().
+        if type_id == NULL_CODEC_ID or type_id == EMPTY_TUPLE_CODEC_ID:
+            return True
+        return self.codecs.get(type_id, None) is not None
 
     cdef BaseCodec get_codec(self, bytes type_id):
-        try:
-            return <BaseCodec>self.codecs[type_id]
-        except KeyError:
-            pass
+        codec = self.codecs.lookup(type_id, None)
+        if codec is not None:
+            return <BaseCodec>codec
 
         if type_id == NULL_CODEC_ID:
             return NULL_CODEC
@@ -562,6 +698,16 @@ cdef class CodecsRegistry:
             FRBuffer elem_buf
             BaseCodec res
             list codecs_list
+            tuple shared
+            object shared_key = None
+
+        if self.shared_cache is not None and self.overrides_key is not None:
+            shared_key = (protocol_version, self.overrides_key, spec)
+            shared = self.shared_cache.get(shared_key)
+            if shared is not None:
+                for res in shared:
+                    self.codecs[res.tid] = res
+                return <BaseCodec>shared[-1]
 
         frb_init(
             &buf,
@@ -589,6 +735,10 @@ cdef class CodecsRegistry:
         if not codecs_list:
             raise RuntimeError(f'cannot not build codec; empty type desc')
 
+        if shared_key is not None:
+            self.shared_cache.put(
+                shared_key, cpython.Py_SIZE(spec), tuple(codecs_list))
+
         return codecs_list[-1]
 
 
@@ -960,6 +1110,14 @@ cdef generate_tables():
 generate_tables()
 
 
+cdef inline float half_to_float(uint16_t h):
+    cdef IntFloatSwap swap
+    swap.i = MANTISSA_TABLE[
+        OFFSET_TABLE[h >> 10] + (h & 0x000003ff)
+    ] + EXP_TABLE[h >> 10]
+    return swap.f
+
+
 cdef pgvector_hv_encode(pgproto.CodecContext settings, WriteBuffer buf,
                         object obj):
     cdef:
@@ -1006,7 +1164,6 @@ cdef pgvector_hv_decode(pgproto.CodecContext settings, FRBuffer *buf):
         unsigned short[:] tmp_array_view
         float[:] array_view
         Py_ssize_t i
-        IntFloatSwap swap
 
     dim = hton.unpack_uint16(frb_read(buf, 2))
     frb_read(buf, 2)
@@ -1028,11 +1185,7 @@ cdef pgvector_hv_decode(pgproto.CodecContext settings, FRBuffer *buf):
     # Create a float array with size dim
     val = ONE_EL_F32_ARRAY * dim
     for i in range(dim):
-        swap.i = tmp[i]
-        swap.i = MANTISSA_TABLE[
-            OFFSET_TABLE[swap.i >> 10] + (swap.i & 0x000003ff)
-        ] + EXP_TABLE[swap.i >> 10]
-        val[i] = swap.f
+        val[i] = half_to_float(tmp[i])
 
     return val
 
@@ -0,0 +1,38 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+@cython.final
+cdef class LazyObject:
+    cdef:
+        ObjectCodec codec
+        bytes data
+        list values
+        list offsets
+        Py_ssize_t pending
+        object __weakref__
+
+    cdef _get(self, Py_ssize_t pos)
+
+    @staticmethod
+    cdef LazyObject new(ObjectCodec codec, FRBuffer *buf)
+
+
+cdef object decode_lazy_row(BaseCodec codec, object return_type,
+                            FRBuffer *buf)
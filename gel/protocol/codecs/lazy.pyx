@@ -0,0 +1,415 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+# How a field of an object is decoded in lazy mode.
+DEF LAZY_NEVER = 0
+DEF LAZY_ALWAYS = 1
+DEF LAZY_LARGE = 2
+
+# Encoded str/bytes/json values at least this long are decoded on
+# first access; shorter ones are cheaper to decode right away.
+DEF LAZY_SCALAR_MIN_SIZE = 256
+
+# Number of object shapes whose codecs are kept around for unpickling.
+DEF UNPICKLED_CODECS_CACHE_SIZE = 100
+
+
+cdef frozenset LAZY_SCALAR_TYPES = frozenset({
+    'std::str',
+    'std::bytes',
+    'std::json',
+})
+
+cdef object NOT_DECODED = object()
+
+cdef LRUMapping UNPICKLED_CODECS = LRUMapping(
+    maxsize=UNPICKLED_CODECS_CACHE_SIZE)
+
+
+cdef inline int _lazy_field_kind(BaseCodec codec):
+    if type(codec) is ObjectCodec:
+        if (<ObjectCodec>codec).is_sparse:
+            return LAZY_NEVER
+        return LAZY_ALWAYS
+    elif isinstance(codec, BaseArrayCodec):
+        return LAZY_ALWAYS
+    elif type(codec) is JSONCodecOverride:
+        return LAZY_LARGE
+    elif type(codec) is ScalarCodec and codec.name in LAZY_SCALAR_TYPES:
+        return LAZY_LARGE
+    else:
+        return LAZY_NEVER
+
+
+cdef tuple _lazy_field_kinds(ObjectCodec codec):
+    cdef tuple kinds = codec.lazy_field_kinds
+    if kinds is None:
+        kinds = tuple(
+            _lazy_field_kind(<BaseCodec>sub_codec)
+            for sub_codec in codec.fields_codecs
+        )
+        codec.lazy_field_kinds = kinds
+    return kinds
+
+
+cdef _decode_lazy_set(SetCodec codec, FRBuffer *buf):
+    cdef:
+        object result
+        object elem
+        Py_ssize_t elem_count
+        Py_ssize_t i
+        int32_t elem_len
+        int32_t ndims = hton.unpack_int32(frb_read(buf, 4))
+        ObjectCodec sub_codec = <ObjectCodec>codec.sub_codec
+        FRBuffer elem_buf
+
+    frb_read(buf, 4)  # ignore flags
+    frb_read(buf, 4)  # reserved
+
+    if ndims == 0:
+        return []
+    elif ndims > 1:
+        raise RuntimeError('only 1-dimensional arrays are supported')
+
+    elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
+    frb_read(buf, 4)  # Ignore the lower bound information
+
+    result = cpython.PyList_New(elem_count)
+    for i in range(elem_count):
+        elem_len = hton.unpack_int32(frb_read(buf, 4))
+        if elem_len == -1:
+            raise RuntimeError('unexpected NULL value in a set of objects')
+        elem = LazyObject.new(
+            sub_codec, frb_slice_from(&elem_buf, buf, elem_len))
+        if frb_get_len(&elem_buf):
+            raise RuntimeError(
+                f'unexpected trailing data in buffer after '
+                f'set element decoding: {frb_get_len(&elem_buf)}')
+        cpython.Py_INCREF(elem)
+        cpython.PyList_SET_ITEM(result, i, elem)
+
+    return result
+
+
+cdef _decode_lazy_value(BaseCodec codec, FRBuffer *buf):
+    if type(codec) is ObjectCodec and not (<ObjectCodec>codec).is_sparse:
+        return LazyObject.new(<ObjectCodec>codec, buf)
+    elif (
+        type(codec) is SetCodec
+        and type((<SetCodec>codec).sub_codec) is ObjectCodec
+        and not (<ObjectCodec>(<SetCodec>codec).sub_codec).is_sparse
+    ):
+        return _decode_lazy_set(<SetCodec>codec, buf)
+    else:
+        return codec.decode(None, buf)
+
+
+cdef object decode_lazy_row(BaseCodec codec, object return_type,
+                            FRBuffer *buf):
+    # Plugged in place of codec.decode() when decoding query results
+    # in lazy mode.  Only plain (untyped) objects are decoded lazily.
+    if return_type is None:
+        return _decode_lazy_value(codec, buf)
+    else:
+        return codec.decode(return_type, buf)
+
+
+def _restore_lazy_object(tuple shape, list values):
+    # Unpickles a LazyObject pickled by LazyObject.__reduce__(); all of
+    # its fields are decoded already, so the codec only provides the
+    # field names and flags.
+    cdef:
+        LazyObject obj
+        ObjectCodec codec
+
+    codec = UNPICKLED_CODECS.get(shape, None)
+    if codec is None:
+        tid, names, flags, cards = shape
+        codec = <ObjectCodec>ObjectCodec.new(
+            tid, names, flags, cards, (None,) * len(names), None, False)
+        UNPICKLED_CODECS[shape] = codec
+
+    if len(values) != len(codec.names):
+        raise ValueError(
+            f'cannot unpickle LazyObject: expected {len(codec.names)} '
+            f'values, got {len(values)}')
+
+    obj = LazyObject.__new__(LazyObject)
+    obj.codec = codec
+    obj.values = values
+    obj.pending = 0
+    obj.data = None
+    obj.offsets = None
+    return obj
+
+
+@cython.final
+cdef class LazyObject:
+    """An object whose large fields are decoded on first access.
+
+    Nested objects, sets and arrays, and long str, bytes and json
+    values are kept as a slice of the encoded data until the
+    attribute is read for the first time.  Otherwise it behaves like
+    gel.Object, and isinstance(obj, gel.Object) holds.
+    """
+
+    def __init__(self):
+        raise TypeError('LazyObject cannot be instantiated directly')
+
+    @staticmethod
+    cdef LazyObject new(ObjectCodec codec, FRBuffer *buf):
+        cdef:
+            LazyObject obj
+            tuple fields_codecs = codec.fields_codecs
+            tuple kinds = _lazy_field_kinds(codec)
+            Py_ssize_t fields_codecs_len = len(fields_codecs)
+            Py_ssize_t elem_count
+            Py_ssize_t data_len
+            Py_ssize_t i
+            int32_t elem_len
+            int kind
+            Py_ssize_t pending = 0
+            bytes data
+            list values
+            list offsets
+            BaseCodec elem_codec
+            FRBuffer data_buf
+            FRBuffer elem_buf
+
+        elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
+        if elem_count != fields_codecs_len:
+            raise RuntimeError(
+                f'cannot decode Object: expected {fields_codecs_len} '
+                f'elements, got {elem_count}')
+
+        # The read buffer is reused for subsequent messages, so the
+        # encoded elements are copied once and deferred fields keep
+        # an offset into that copy.
+        data_len = frb_get_len(buf)
+        data = PyBytes_FromStringAndSize(frb_read_all(buf), data_len)
+        frb_init(&data_buf, cpython.PyBytes_AS_STRING(data), data_len)
+
+        values = [None] * elem_count
+        offsets = [0] * elem_count
+
+        for i in range(elem_count):
+            frb_read(&data_buf, 4)  # reserved
+            offsets[i] = data_len - frb_get_len(&data_buf)
+            elem_len = hton.unpack_int32(frb_read(&data_buf, 4))
+            if elem_len == -1:
+                continue
+
+            kind = kinds[i]
+            if kind == LAZY_ALWAYS or (
+                kind == LAZY_LARGE and elem_len >= LAZY_SCALAR_MIN_SIZE
+            ):
+                frb_read(&data_buf, elem_len)
+                values[i] = NOT_DECODED
+                pending += 1
+            else:
+                elem_codec = <BaseCodec>fields_codecs[i]
+                values[i] = elem_codec.decode(
+                    None,
+                    frb_slice_from(&elem_buf, &data_buf, elem_len)
+                )
+                if frb_get_len(&elem_buf):
+                    raise RuntimeError(
+                        f'unexpected trailing data in buffer after '
+                        f'object element decoding: {frb_get_len(&elem_buf)}')
+
+        obj = LazyObject.__new__(LazyObject)
+        obj.codec = codec
+        obj.values = values
+        obj.pending = pending
+        if pending:
+            obj.data = data
+            obj.offsets = offsets
+        else:
+            obj.data = None
+            obj.offsets = None
+        return obj
+
+    cdef _get(self, Py_ssize_t pos):
+        cdef:
+            object value = self.values[pos]
+            object current
+            bytes data
+            Py_ssize_t offset
+            int32_t elem_len
+            FRBuffer elem_buf
+
+        if value is not NOT_DECODED:
+            return value
+
+        # The same field may be read from several threads at once.  The
+        # encoded data is kept alive by a local reference while it is
+        # decoded, and only the first decoded value is stored.
+        with cython.critical_section(self):
+            value = self.values[pos]
+            data = self.data
+            if value is NOT_DECODED:
+                offset = self.offsets[pos]
+        if value is not NOT_DECODED:
+            return value
+
+        frb_init(
+            &elem_buf,
+            cpython.PyBytes_AS_STRING(data) + offset,
+            cpython.PyBytes_GET_SIZE(data) - offset,
+        )
+        elem_len = hton.unpack_int32(frb_read(&elem_buf, 4))
+        frb_set_len(&elem_buf, elem_len)
+
+        value = _decode_lazy_value(
+            <BaseCodec>self.codec.fields_codecs[pos], &elem_buf)
+        if frb_get_len(&elem_buf):
+            raise RuntimeError(
+                f'unexpected trailing data in buffer after '
+                f'object element decoding: {frb_get_len(&elem_buf)}')
+
+        with cython.critical_section(self):
+            current = self.values[pos]
+            if current is NOT_DECODED:
+                self.values[pos] = value
+                self.pending -= 1
+                if not self.pending:
+                    # Everything is decoded, release the encoded data.
+                    self.data = None
+                    self.offsets = None
+            else:
+                value = current
+        return value
+
+    @property
+    def __class__(self):
+        # Makes isinstance(obj, gel.Object) hold; gel.Object cannot be
+        # subclassed.
+        return datatypes.Object
+
+    @property
+    def __dataclass_fields__(self):
+        # Used in `dataclasses.asdict()`
+        return self.codec.get_dataclass_fields()
+
+    def __getattr__(self, name):
+        try:
+            pos = self.codec.descriptor.get_pos(name)
+        except LookupError:
+            raise AttributeError(
+                f'{type(self).__name__!r} object has no '
+                f'attribute {name!r}') from None
+        return self._get(pos)
+
+    def __getitem__(self, name):
+        descriptor = self.codec.descriptor
+        try:
+            pos = descriptor.get_pos(name)
+        except LookupError:
+            if isinstance(name, str) and name.startswith('@'):
+                raise KeyError(
+                    f'link property {name!r} does not exist') from None
+            raise TypeError(
+                f'link property {name!r} should be accessed with '
+                f'\'@\' prefix') from None
+        if datatypes.record_desc_pointer_is_link_prop(descriptor, pos):
+            return self._get(pos)
+        elif datatypes.record_desc_pointer_is_link(descriptor, pos):
+            raise TypeError(
+                f'link {name!r} should be accessed via dot notation')
+        else:
+            raise TypeError(
+                f'property {name!r} should be accessed via dot notation')
+
+    def __eq__(self, other):
+        cdef:
+            LazyObject obj
+            Py_ssize_t i
+
+        if type(other) is not LazyObject:
+            return NotImplemented
+        obj = <LazyObject>other
+        if obj is self:
+            return True
+        if (
+            self.codec.names != obj.codec.names
+            or self.codec.flags != obj.codec.flags
+        ):
+            return False
+        for i in range(len(self.values)):
+            if self._get(i) != obj._get(i):
+                return False
+        return True
+
+    def __hash__(self):
+        # Equal objects have the same fields, and the same id if they
+        # have one.
+        try:
+            pos = self.codec.descriptor.get_pos('id')
+        except LookupError:
+            return hash(self.codec.names)
+        return hash(self._get(pos))
+
+    def __reduce__(self):
+        cdef:
+            object descriptor = self.codec.descriptor
+            Py_ssize_t count = len(self.values)
+            Py_ssize_t i
+
+        shape = (
+            self.codec.tid,
+            self.codec.names,
+            self.codec.flags,
+            tuple(
+                CARDS_MAP[
+                    datatypes.record_desc_pointer_card(descriptor, i)
+                ].value
+                for i in range(count)
+            ),
+        )
+        return (
+            _restore_lazy_object,
+            (shape, [self._get(i) for i in range(count)]),
+        )
+
+    def __dir__(self):
+        return [
+            name
+            for name, flags in zip(self.codec.names, self.codec.flags)
+            if not flags & datatypes._EDGE_POINTER_IS_LINKPROP
+        ]
+
+    def __repr__(self):
+        # Only shows the fields decoded so far; repr() does not decode.
+        cdef bint pending = False
+
+        items = []
+        for i, (name, flags) in enumerate(
+            zip(self.codec.names, self.codec.flags)
+        ):
+            if flags & datatypes._EDGE_POINTER_IS_IMPLICIT:
+                continue
+            value = self.values[i]
+            if value is NOT_DECODED:
+                pending = True
+            else:
+                items.append(f'{name} := {value!r}')
+        if pending:
+            items.append('...')
+        return f'LazyObject{{{", ".join(items)}}}'
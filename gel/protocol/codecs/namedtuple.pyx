@@ -30,6 +30,13 @@ cdef class NamedTupleCodec(BaseNamedRecordCodec):
             FRBuffer elem_buf
             tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
 
+        if (
+            self.flat_layout is not None
+            and frb_get_len(buf) == self.flat_size
+        ):
+            return self.decode_flat(
+                datatypes.namedtuple_new(self.namedtuple_type), buf)
+
         elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
 
         if elem_count != len(fields_codecs):
@@ -74,6 +81,7 @@ cdef class NamedTupleCodec(BaseNamedRecordCodec):
             fields_names, <object>NULL, <object>NULL)
         codec.fields_codecs = fields_codecs
         codec.namedtuple_type = datatypes.namedtuple_type_new(codec.descriptor)
+        codec.init_flat_layout()
 
         return codec
 
@@ -26,18 +26,14 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
         tuple flags
         tuple source_types
 
-        dict cached_tname_map
-        tuple cached_return_type_subcodecs
-        tuple cached_return_type_dlists
-        object cached_return_type_proxy
-        object cached_return_type
-        object cached_field_origins
-        object cached_orig_return_type
-        Py_ssize_t cached_tname_index
+        tuple cached_adapted
+        dict return_type_cache
+        tuple lazy_field_kinds
 
     cdef encode_args(self, WriteBuffer buf, dict obj)
 
-    cdef adapt_to_return_type(self, object return_type)
+    cdef tuple adapt_to_return_type(self, object return_type)
+    cdef tuple _adapt_to_return_type(self, object return_type)
 
     cdef _decode_plain(self, FRBuffer *buf, Py_ssize_t elem_count)
 
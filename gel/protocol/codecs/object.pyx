@@ -23,6 +23,11 @@ import typing
 from gel.datatypes import datatypes
 
 
+# Maximum number of distinct return types an ObjectCodec keeps
+# the adapted decoding state for.
+DEF RETURN_TYPE_CACHE_SIZE = 8
+
+
 cdef dict CARDS_MAP = {
     datatypes.EdgeFieldCardinality.NO_RESULT: enums.Cardinality.NO_RESULT,
     datatypes.EdgeFieldCardinality.AT_MOST_ONE: enums.Cardinality.AT_MOST_ONE,
@@ -213,15 +218,16 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
         if self.is_sparse:
             raise NotImplementedError
 
-        self.adapt_to_return_type(return_type)
-        tname_map = self.cached_tname_map
-        tname_index = self.cached_tname_index
+        (
+            return_type,
+            return_type_proxy,
+            tname_map,
+            tname_index,
+            fields_types,
+            dlists,
+            origins,
+        ) = self.adapt_to_return_type(return_type)
         is_polymorphic = tname_map is not None and len(tname_map) > 1
-        fields_types = self.cached_return_type_subcodecs
-        return_type = self.cached_return_type
-        return_type_proxy = self.cached_return_type_proxy
-        dlists = self.cached_return_type_dlists
-        origins = self.cached_field_origins
 
         elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
 
@@ -271,7 +277,7 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
                 assert name[0] == '@' # XXX fix this
                 lprops_dict[name[1:]] = elem
             else:
-                dlist_factory = self.cached_return_type_dlists[i]
+                dlist_factory = dlists[i]
                 if dlist_factory is tuple:
                     # must be a computed multi-prop
                     elem = tuple(elem)
@@ -293,44 +299,74 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
                 pass
         assert not hasattr(current_ret_type, '__proxy_of__'), current_ret_type
 
-        if return_type_proxy is not None:
-            nested = current_ret_type.__gel_model_construct__(result_dict)
+        identity_map = IDENTITY_MAP.get()
+        if identity_map is not None:
+            result = identity_map.__gel_construct__(
+                current_ret_type, result_dict)
+        else:
+            result = current_ret_type.__gel_model_construct__(result_dict)
 
+        if return_type_proxy is not None:
             # ProxyModel instances are passed straight to LinkSet.__init__
             # with __wrap_list__=True. It's important that all proxies
             # coming from the codec will be "owned" by the link.
             result = return_type_proxy.__gel_proxy_construct__(
-                nested, lprops_dict, linked=True,
+                result, lprops_dict, linked=True,
             )
-        else:
-            result = current_ret_type.__gel_model_construct__(result_dict)
 
         return result
 
-    cdef adapt_to_return_type(self, object return_type):
+    cdef tuple adapt_to_return_type(self, object return_type):
+        # Codecs can be shared by clients in several threads (see
+        # SharedCodecsCache), so the adapted state is returned to the
+        # caller rather than stored in separate attributes, and the
+        # caches below are only ever replaced, never modified in place.
         cdef:
-            tuple names = self.names
-            tuple flags = self.flags
-            tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
-            Py_ssize_t fields_codecs_len = len(fields_codecs)
-            Py_ssize_t i
+            tuple cached = self.cached_adapted
+            tuple adapted
+            dict cache
 
-        if return_type is self.cached_orig_return_type:
+        if cached is not None and cached[0] is return_type:
             # return_type should always be the same in the overwhelming
             # number of scenarios, so we should only do the expensive task
             # of introspecting the return_type and tailoring to it once
             # per Object codec's entire lifespan.
-            return
+            return <tuple>cached[1]
+
+        # The same shape can also be decoded into a handful of different
+        # types in turn (e.g. a ProxyModel and its plain model), so keep
+        # the adapted state for a few recent return types around.
+        adapted = self.return_type_cache.get(return_type)
+        if adapted is None:
+            adapted = self._adapt_to_return_type(return_type)
+            cache = dict(self.return_type_cache)
+            if len(cache) >= RETURN_TYPE_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[return_type] = adapted
+            self.return_type_cache = cache
+
+        self.cached_adapted = (return_type, adapted)
+        return adapted
+
+    cdef tuple _adapt_to_return_type(self, object return_type):
+        cdef:
+            tuple names = self.names
+            tuple flags = self.flags
+            tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
+            Py_ssize_t fields_codecs_len = len(fields_codecs)
+            Py_ssize_t i
+            Py_ssize_t tname_index = -1
 
         if return_type is None:
-            self.cached_tname_map = None
-            self.cached_return_type = None
-            self.cached_return_type_subcodecs = (None,) * fields_codecs_len
-            self.cached_return_type_dlists = (None,) * fields_codecs_len
-            self.cached_return_type_proxy = None
-            self.cached_orig_return_type = None
-            self.cached_field_origins = None
-            return
+            return (
+                None,
+                None,
+                None,
+                tname_index,
+                (None,) * fields_codecs_len,
+                (None,) * fields_codecs_len,
+                None,
+            )
 
         refl = getattr(return_type, "__gel_reflection__", None)
         if (
@@ -352,19 +388,19 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
         expr_object_types = getattr(return_type.__gel_reflection__, 'expr_object_types', None)
 
         if proxy := getattr(return_type, '__proxy_of__', None):
-            self.cached_return_type_proxy = return_type
-            self.cached_return_type = proxy
+            target_type = proxy
+            target_type_proxy = return_type
             assert not hasattr(proxy, '__proxy_of__')
             lprops_type = return_type.__linkprops__
-            worklist = [self.cached_return_type]
+            worklist = [target_type]
         elif expr_object_types is not None:
-            self.cached_return_type = return_type
-            self.cached_return_type_proxy = None
+            target_type = return_type
+            target_type_proxy = None
             worklist = list(expr_object_types)
         else:
-            self.cached_return_type = return_type
-            self.cached_return_type_proxy = None
-            worklist = [self.cached_return_type]
+            target_type = return_type
+            target_type_proxy = None
+            worklist = [target_type]
 
         # Build a map of descendant types that are marked as being
         # canonical targets.  Make sure to descend through types not
@@ -415,7 +451,7 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
                 elif name == "__tname__":
                     subs.append(None)
                     dlists.append(None)
-                    self.cached_tname_index = i
+                    tname_index = i
                     origins.append(component)
                 elif name in {"__tid__", "id"}:
                     subs.append(None)
@@ -466,13 +502,15 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
                             dlist_factory = ptrtype
                     dlists.append(dlist_factory)
 
-        self.cached_return_type_subcodecs = tuple(subs)
-        self.cached_return_type_dlists = tuple(dlists)
-
-        self.cached_field_origins = tuple(origins)
-
-        self.cached_tname_map = tname_map
-        self.cached_orig_return_type = return_type
+        return (
+            target_type,
+            target_type_proxy,
+            tname_map,
+            tname_index,
+            tuple(subs),
+            tuple(dlists),
+            tuple(origins),
+        )
 
     def get_dataclass_fields(self):
         cdef descriptor = (<BaseNamedRecordCodec>self).descriptor
@@ -504,13 +542,9 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
         else:
             codec.name = 'Object'
 
-        codec.cached_return_type_proxy = None
-        codec.cached_return_type = None
-        codec.cached_return_type_subcodecs = (None,) * len(names)
-        codec.cached_orig_return_type = None
-        codec.cached_tname_map = None
-        codec.cached_return_type_dlists = None
-        codec.cached_field_origins = None
+        codec.cached_adapted = None
+        codec.return_type_cache = {}
+        codec.lazy_field_kinds = None
 
         codec.flags = flags
         codec.is_sparse = is_sparse
@@ -30,6 +30,13 @@ cdef class TupleCodec(BaseRecordCodec):
             FRBuffer elem_buf
             tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
 
+        if (
+            self.flat_layout is not None
+            and frb_get_len(buf) == self.flat_size
+        ):
+            return self.decode_flat(
+                cpython.PyTuple_New(len(fields_codecs)), buf)
+
         elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
 
         if elem_count != len(fields_codecs):
@@ -77,6 +84,7 @@ cdef class TupleCodec(BaseRecordCodec):
         codec.tid = tid
         codec.name = 'Tuple'
         codec.fields_codecs = fields_codecs
+        codec.init_flat_layout()
 
         return codec
 
@@ -0,0 +1,39 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+cdef class ColumnsBuilder:
+
+    cdef:
+        BaseCodec codec
+        bint is_record
+        tuple names
+        bytes kinds
+        tuple fields_codecs
+        list columns
+        list offsets
+        Py_ssize_t rows
+
+    cdef decode_row(self, FRBuffer *buf)
+    cdef decode_field(self, Py_ssize_t i, FRBuffer *buf, int32_t elem_len)
+    cdef decode_vector(self, Py_ssize_t i, char kind, FRBuffer *buf,
+                       int32_t elem_len)
+    cdef finish(self)
+
+    @staticmethod
+    cdef ColumnsBuilder new(BaseCodec codec)
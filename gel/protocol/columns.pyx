@@ -0,0 +1,341 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+cimport cpython.array
+
+from gel.datatypes.columns import Columns
+
+
+DEF COL_OBJECT = 0
+DEF COL_SKIP = 1
+DEF COL_INT16 = 2
+DEF COL_INT32 = 3
+DEF COL_INT64 = 4
+DEF COL_FLOAT32 = 5
+DEF COL_FLOAT64 = 6
+DEF COL_BOOL = 7
+DEF COL_UUID = 8
+DEF COL_DATETIME = 9
+DEF COL_VECTOR = 10
+DEF COL_HALFVEC = 11
+
+# Microseconds between the Postgres epoch (2000-01-01) used on the wire
+# and the Unix epoch.
+DEF PG_EPOCH_OFFSET_US = 946684800000000
+
+cdef tuple COL_KIND_NAMES = (
+    'object', None, 'int16', 'int32', 'int64',
+    'float32', 'float64', 'bool', 'uuid', 'datetime', 'vector', 'vector',
+)
+cdef tuple COL_TYPECODES = (
+    None, None, 'h', 'i', 'q', 'f', 'd', 'b', 'B', 'q', 'f', 'f',
+)
+cdef int32_t[10] COL_WIDTHS = [0, 0, 2, 4, 8, 4, 8, 1, 16, 8]
+
+
+cdef char column_kind(BaseCodec codec):
+    cdef pgproto.decode_func decoder
+
+    # Derived scalars (e.g. custom scalars extending std::int64) share
+    # the decoder of their base type; Python-level codec overrides are
+    # not ScalarCodecs and are thus decoded into objects.
+    if type(codec) is not ScalarCodec:
+        return COL_OBJECT
+    decoder = (<ScalarCodec>codec).c_decoder
+    if decoder == <pgproto.decode_func>pgproto.int2_decode:
+        return COL_INT16
+    elif decoder == <pgproto.decode_func>pgproto.int4_decode:
+        return COL_INT32
+    elif decoder == <pgproto.decode_func>pgproto.int8_decode:
+        return COL_INT64
+    elif decoder == <pgproto.decode_func>pgproto.float4_decode:
+        return COL_FLOAT32
+    elif decoder == <pgproto.decode_func>pgproto.float8_decode:
+        return COL_FLOAT64
+    elif decoder == <pgproto.decode_func>pgproto.bool_decode:
+        return COL_BOOL
+    elif decoder == <pgproto.decode_func>pgproto.uuid_decode:
+        return COL_UUID
+    elif (
+        decoder == <pgproto.decode_func>pgproto.timestamptz_decode
+        or decoder == <pgproto.decode_func>pgproto.timestamp_decode
+    ):
+        return COL_DATETIME
+    elif decoder == <pgproto.decode_func>pgvector_decode:
+        return COL_VECTOR
+    elif decoder == <pgproto.decode_func>pgvector_hv_decode:
+        return COL_HALFVEC
+    else:
+        return COL_OBJECT
+
+
+@cython.final
+cdef class ColumnsBuilder:
+    """Decodes result rows field by field into per-field columns.
+
+    Required fields of fixed-width scalar types are unpacked straight
+    into array.array buffers, so no Python object is created for them;
+    everything else goes through the regular codecs into lists.
+
+    Vectors (ext::pgvector::vector and halfvec) of all rows are written
+    one after another into a single float32 buffer, with a parallel
+    array of row offsets; empty vectors can't exist, so a NULL is just
+    a zero-length row.
+    """
+
+    cdef decode_row(self, FRBuffer *buf):
+        cdef:
+            Py_ssize_t elem_count
+            Py_ssize_t i
+            Py_ssize_t nfields = len(self.fields_codecs)
+            int32_t elem_len
+
+        if not self.is_record:
+            self.decode_field(0, buf, <int32_t>frb_get_len(buf))
+            self.rows += 1
+            return
+
+        elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
+        if elem_count != nfields:
+            raise RuntimeError(
+                f'cannot decode columns: expected {nfields} '
+                f'elements, got {elem_count}')
+
+        for i in range(elem_count):
+            frb_read(buf, 4)  # reserved
+            elem_len = hton.unpack_int32(frb_read(buf, 4))
+            self.decode_field(i, buf, elem_len)
+
+        self.rows += 1
+
+    cdef decode_field(self, Py_ssize_t i, FRBuffer *buf, int32_t elem_len):
+        cdef:
+            char kind = cpython.PyBytes_AS_STRING(self.kinds)[i]
+            const char *data
+            FRBuffer elem_buf
+            int16_t i16
+            int32_t i32
+            int64_t i64
+            float f32
+            double f64
+            int8_t b
+
+        if kind == COL_SKIP:
+            if elem_len != -1:
+                frb_read(buf, elem_len)
+            return
+
+        if kind == COL_VECTOR or kind == COL_HALFVEC:
+            self.decode_vector(i, kind, buf, elem_len)
+            return
+
+        if kind == COL_OBJECT:
+            if elem_len == -1:
+                elem = None
+            else:
+                elem = (<BaseCodec>self.fields_codecs[i]).decode(
+                    None,
+                    frb_slice_from(&elem_buf, buf, elem_len)
+                )
+                if frb_get_len(&elem_buf):
+                    raise RuntimeError(
+                        f'unexpected trailing data in buffer after '
+                        f'column element decoding: {frb_get_len(&elem_buf)}')
+            (<list>self.columns[i]).append(elem)
+            return
+
+        if elem_len != COL_WIDTHS[kind]:
+            raise RuntimeError(
+                f'cannot decode {COL_KIND_NAMES[kind]} column: '
+                f'unexpected element length {elem_len}')
+
+        col = <cpython.array.array>self.columns[i]
+        data = frb_read(buf, elem_len)
+        if kind == COL_INT16:
+            i16 = hton.unpack_int16(data)
+            cpython.array.extend_buffer(col, <char *>&i16, 1)
+        elif kind == COL_INT32:
+            i32 = hton.unpack_int32(data)
+            cpython.array.extend_buffer(col, <char *>&i32, 1)
+        elif kind == COL_INT64:
+            i64 = hton.unpack_int64(data)
+            cpython.array.extend_buffer(col, <char *>&i64, 1)
+        elif kind == COL_FLOAT32:
+            f32 = hton.unpack_float(data)
+            cpython.array.extend_buffer(col, <char *>&f32, 1)
+        elif kind == COL_FLOAT64:
+            f64 = hton.unpack_double(data)
+            cpython.array.extend_buffer(col, <char *>&f64, 1)
+        elif kind == COL_BOOL:
+            b = data[0] != 0
+            cpython.array.extend_buffer(col, <char *>&b, 1)
+        elif kind == COL_UUID:
+            cpython.array.extend_buffer(col, <char *>data, 16)
+        elif kind == COL_DATETIME:
+            i64 = hton.unpack_int64(data) + PG_EPOCH_OFFSET_US
+            cpython.array.extend_buffer(col, <char *>&i64, 1)
+
+    cdef decode_vector(self, Py_ssize_t i, char kind, FRBuffer *buf,
+                       int32_t elem_len):
+        cdef:
+            cpython.array.array col = <cpython.array.array>self.columns[i]
+            cpython.array.array offsets = \
+                <cpython.array.array>self.offsets[i]
+            Py_ssize_t start = len(col)
+            Py_ssize_t dim
+            Py_ssize_t j
+            int32_t width = 4 if kind == COL_VECTOR else 2
+            int64_t end
+            const char *data
+            float *out
+
+        if elem_len != -1:
+            if elem_len < 4:
+                raise RuntimeError(
+                    f'cannot decode vector column: '
+                    f'unexpected element length {elem_len}')
+            data = frb_read(buf, 4)
+            dim = hton.unpack_uint16(data)
+            if elem_len != 4 + dim * width:
+                raise RuntimeError(
+                    f'cannot decode vector column: '
+                    f'unexpected element length {elem_len} '
+                    f'for {dim} dimensions')
+            data = frb_read(buf, dim * width)
+
+            cpython.array.resize_smart(col, start + dim)
+            out = col.data.as_floats + start
+            if kind == COL_VECTOR:
+                for j in range(dim):
+                    out[j] = hton.unpack_float(data + j * 4)
+            else:
+                for j in range(dim):
+                    out[j] = half_to_float(
+                        <uint16_t>hton.unpack_uint16(data + j * 2))
+            start += dim
+
+        end = start
+        cpython.array.extend_buffer(offsets, <char *>&end, 1)
+
+    cdef finish(self):
+        cdef:
+            Py_ssize_t i
+            char kind
+            list names = []
+            list kinds = []
+            list columns = []
+            list offsets = []
+
+        for i in range(len(self.fields_codecs)):
+            kind = cpython.PyBytes_AS_STRING(self.kinds)[i]
+            if kind == COL_SKIP:
+                continue
+            names.append(self.names[i])
+            kinds.append(COL_KIND_NAMES[kind])
+            columns.append(self.columns[i])
+            offsets.append(self.offsets[i])
+
+        return Columns(names, kinds, columns, self.rows, offsets)
+
+    @staticmethod
+    cdef ColumnsBuilder new(BaseCodec codec):
+        cdef:
+            ColumnsBuilder builder
+            Py_ssize_t i
+            char kind
+            bytearray kinds = bytearray()
+            list columns = []
+            list offsets = []
+            tuple names
+            tuple fields_codecs
+
+        builder = ColumnsBuilder.__new__(ColumnsBuilder)
+        builder.codec = codec
+        builder.rows = 0
+
+        if type(codec) is ObjectCodec:
+            if (<ObjectCodec>codec).is_sparse:
+                raise errors.InterfaceError(
+                    'sparse objects cannot be decoded into columns')
+            descriptor = (<BaseNamedRecordCodec>codec).descriptor
+            names = (<ObjectCodec>codec).names
+            fields_codecs = (<BaseRecordCodec>codec).fields_codecs
+            builder.is_record = True
+        elif type(codec) is NamedTupleCodec:
+            descriptor = (<BaseNamedRecordCodec>codec).descriptor
+            fields_codecs = (<BaseRecordCodec>codec).fields_codecs
+            names = tuple(
+                datatypes.record_desc_pointer_name(descriptor, i)
+                for i in range(len(fields_codecs))
+            )
+            descriptor = None
+            builder.is_record = True
+        elif type(codec) is TupleCodec:
+            fields_codecs = (<BaseRecordCodec>codec).fields_codecs
+            names = tuple(str(i) for i in range(len(fields_codecs)))
+            descriptor = None
+            builder.is_record = True
+        else:
+            fields_codecs = (codec,)
+            names = ('0',)
+            descriptor = None
+            builder.is_record = False
+
+        for i in range(len(fields_codecs)):
+            if descriptor is not None and (
+                datatypes.record_desc_pointer_is_implicit(descriptor, i)
+            ):
+                kind = COL_SKIP
+            else:
+                kind = column_kind(<BaseCodec>fields_codecs[i])
+                card = (
+                    datatypes.record_desc_pointer_card(descriptor, i)
+                    if descriptor is not None
+                    else datatypes.EdgeFieldCardinality.ONE
+                )
+                if card == datatypes.EdgeFieldCardinality.ONE:
+                    pass
+                elif (
+                    card == datatypes.EdgeFieldCardinality.AT_MOST_ONE
+                    and (kind == COL_VECTOR or kind == COL_HALFVEC)
+                ):
+                    # Empty vectors are zero-length rows.
+                    pass
+                else:
+                    # Optional and multi fields can be empty.
+                    kind = COL_OBJECT
+
+            kinds.append(kind)
+            if kind == COL_OBJECT:
+                columns.append([])
+            elif kind == COL_SKIP:
+                columns.append(None)
+            else:
+                columns.append(array.array(COL_TYPECODES[kind]))
+            if kind == COL_VECTOR or kind == COL_HALFVEC:
+                offsets.append(array.array('q', [0]))
+            else:
+                offsets.append(None)
+
+        builder.names = names
+        builder.kinds = bytes(kinds)
+        builder.fields_codecs = fields_codecs
+        builder.columns = columns
+        builder.offsets = offsets
+        return builder
@@ -4,10 +4,14 @@
 # This module is part of asyncpg and is released under
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
+from cpython.object cimport PyObject
+
 
 cdef extern from "Python.h":
     int PyByteArray_Check(object)
 
+    int _PyBytes_Resize(PyObject **, Py_ssize_t) except -1
+
     int PyMemoryView_Check(object)
     Py_buffer *PyMemoryView_GET_BUFFER(object)
     object PyMemoryView_GetContiguous(object, int buffertype, char order)
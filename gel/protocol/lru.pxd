@@ -25,4 +25,9 @@ cdef class LRUMapping:
         object _dict_move_to_end
         object _dict_get
 
+        readonly unsigned long long hits
+        readonly unsigned long long misses
+        readonly unsigned long long evictions
+
     cpdef get(self, key, default)
+    cdef lookup(self, key, default)
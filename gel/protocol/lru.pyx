@@ -52,8 +52,23 @@ cdef class LRUMapping:
         self._dict_move_to_end = self._dict.move_to_end
         self._dict_get = self._dict.get
         self._maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
 
     cpdef get(self, key, default):
+        o = self._dict_get(key, _LRU_MARKER)
+        if o is _LRU_MARKER:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._dict_move_to_end(key)  # last=True
+        return o
+
+    cdef lookup(self, key, default):
+        # Like get(), but not counted in the hits and misses.
         o = self._dict_get(key, _LRU_MARKER)
         if o is _LRU_MARKER:
             return default
@@ -61,7 +76,12 @@ cdef class LRUMapping:
         return o
 
     def __getitem__(self, key):
-        o = self._dict[key]
+        try:
+            o = self._dict[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
         self._dict_move_to_end(key)  # last=True
         return o
 
@@ -73,6 +93,7 @@ cdef class LRUMapping:
             self._dict[key] = o
             if len(self._dict) > self._maxsize:
                 self._dict.popitem(last=False)
+                self.evictions += 1
 
     def __delitem__(self, key):
         del self._dict[key]
@@ -35,6 +35,7 @@ from gel.pgproto.debug cimport PG_DEBUG
 
 include "./lru.pxd"
 include "./codecs/codecs.pxd"
+include "./columns.pxd"
 
 
 ctypedef object (*decode_row_method)(BaseCodec, object return_type, FRBuffer *buf)
@@ -93,6 +94,12 @@ cdef class ExecuteContext:
         object annotations
         object tx_options
         object return_type
+        object persistent_cache
+        bint columnar
+        bint lazy
+        bint parse_json
+        bint json_bytes
+        object identity_map
 
         # Contextual variables
         readonly bytes cardinality
@@ -101,9 +108,14 @@ cdef class ExecuteContext:
         readonly uint64_t capabilities
         readonly tuple warnings
         readonly tuple unsafe_isolation_dangers
+        tuple in_type_desc
+        tuple out_type_desc
+        ColumnsBuilder columns
 
     cdef inline bint has_na_cardinality(self)
+    cdef inline tuple cache_key(self)
     cdef bint load_from_cache(self)
+    cdef load_from_persistent_cache(self, tuple key)
     cdef inline store_to_cache(self)
     cdef inline invalidate_cache(self)
 
@@ -135,12 +147,12 @@ cdef class SansIOProtocol:
 
         bytes state_type_id
         BaseCodec state_codec
-        object state_cache
 
     cdef encode_args(self, BaseCodec in_dc, WriteBuffer buf, args, kwargs)
     cdef encode_state(self, state)
 
     cdef parse_data_messages(self, ExecuteContext ctx, result)
+    cdef _parse_data_messages(self, ExecuteContext ctx, result)
     cdef parse_sync_message(self)
     cdef parse_command_complete_message(self)
     cdef parse_describe_type_message(self, ExecuteContext ctx)
@@ -153,6 +165,7 @@ cdef class SansIOProtocol:
         bint expect_one,
         bint required_one,
     )
+    cdef _amend_parameter_type_mismatch(self, ExecuteContext ctx, exc)
 
     cdef inline ignore_headers(self)
     cdef inline dict read_headers(self)
@@ -162,6 +175,7 @@ cdef class SansIOProtocol:
     cdef parse_error_message(self)
 
     cdef write(self, WriteBuffer buf)
+    cdef resume_reading(self)
     cpdef abort(self)
 
     cdef reset_status(self)
@@ -174,6 +188,7 @@ cdef class SansIOProtocol:
     cdef ensure_connected(self)
 
     cdef WriteBuffer encode_parse_params(self, ExecuteContext ctx, dict state)
+    cdef WriteBuffer encode_execute_message(self, ExecuteContext ctx)
     cdef _handle_query_result(self, ExecuteContext ctx, ret)
 
 
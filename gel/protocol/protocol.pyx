@@ -24,7 +24,9 @@ cimport cpython.datetime
 import asyncio
 import collections
 import datetime
+import decimal
 import json
+import threading
 import time
 import types
 import typing
@@ -60,11 +62,13 @@ from . cimport cpythonx
 from gel import enums
 from gel import errors
 from gel import scram
+from gel._internal import _identity_map
 
 
 include "./consts.pxi"
 include "./lru.pyx"
 include "./codecs/codecs.pyx"
+include "./columns.pyx"
 
 
 cpython.datetime.import_datetime()
@@ -90,6 +94,15 @@ cdef dict OLD_ERROR_CODES = {
     0x05_03_00_02: 0x05_03_01_02,  # TransactionDeadlockError      #2431
 }
 
+DEF STATE_CACHE_SIZE = 256
+
+# Encoded session state shared by all connections, keyed by the state
+# type id (a hash of the state descriptor) and state_fingerprint().
+# Connections of the blocking client run in different threads, so all
+# access goes through STATE_CACHE_LOCK.
+cdef LRUMapping STATE_CACHE = LRUMapping(maxsize=STATE_CACHE_SIZE)
+cdef object STATE_CACHE_LOCK = threading.Lock()
+
 
 cdef class ExecuteContext:
     def __init__(
@@ -112,6 +125,12 @@ cdef class ExecuteContext:
         annotations: typing.Optional[dict[str, str]] = None,
         transaction_options: typing.Optional[object] = None,
         return_type: typing.Optional[typing.Type],
+        persistent_cache: typing.Optional[object] = None,
+        columnar: bool = False,
+        lazy: bool = False,
+        parse_json: bool = False,
+        json_bytes: bool = False,
+        identity_map: typing.Optional[object] = None,
     ):
         self.query = query
         self.args = args
@@ -134,15 +153,23 @@ cdef class ExecuteContext:
         self.capabilities = 0
         self.warnings = ()
         self.unsafe_isolation_dangers = ()
+        self.in_type_desc = self.out_type_desc = None
         self.annotations = annotations
 
         self.return_type = return_type
+        self.persistent_cache = persistent_cache
+        self.columnar = bool(columnar)
+        self.columns = None
+        self.lazy = bool(lazy)
+        self.parse_json = bool(parse_json)
+        self.json_bytes = bool(json_bytes)
+        self.identity_map = identity_map
 
     cdef inline bint has_na_cardinality(self):
         return self.cardinality == CARDINALITY_NOT_APPLICABLE
 
-    cdef bint load_from_cache(self):
-        key = (
+    cdef inline tuple cache_key(self):
+        return (
             self.query,
             self.output_format,
             self.implicit_limit,
@@ -150,30 +177,56 @@ cdef class ExecuteContext:
             self.inline_typeids,
             self.expect_one,
         )
+
+    cdef bint load_from_cache(self):
+        key = self.cache_key()
         rv = self.qc.get(key, None)
         if rv is None:
-            return False
-        else:
-            (
-                self.cardinality,
-                self.in_dc,
-                self.out_dc,
-                self.capabilities,
-                self.unsafe_isolation_dangers
-            ) = rv
-            return True
+            if self.persistent_cache is None:
+                return False
+            rv = self.load_from_persistent_cache(key)
+            if rv is None:
+                return False
+            self.qc[key] = rv
+
+        (
+            self.cardinality,
+            self.in_dc,
+            self.out_dc,
+            self.capabilities,
+            self.unsafe_isolation_dangers
+        ) = rv
+        return True
+
+    cdef load_from_persistent_cache(self, tuple key):
+        cdef:
+            CodecsRegistry reg = self.reg
+
+        entry = self.persistent_cache.get(key)
+        if entry is None:
+            return None
+
+        protocol_version = self.persistent_cache.protocol_version
+        cardinality, capabilities, in_desc, out_desc = entry
+        try:
+            dcs = []
+            for type_id, type_data in (in_desc, out_desc):
+                if reg.has_codec(type_id):
+                    dcs.append(reg.get_codec(type_id))
+                else:
+                    dcs.append(reg.build_codec(type_data, protocol_version))
+        except Exception:
+            # A damaged or incompatible entry: forget it and let the
+            # caller parse the query as usual.
+            self.persistent_cache.discard(key)
+            return None
+
+        return (cardinality, dcs[0], dcs[1], capabilities, ())
 
     cdef inline store_to_cache(self):
         assert self.in_dc is not None
         assert self.out_dc is not None
-        key = (
-            self.query,
-            self.output_format,
-            self.implicit_limit,
-            self.inline_typenames,
-            self.inline_typeids,
-            self.expect_one,
-        )
+        key = self.cache_key()
         self.qc[key] = (
             self.cardinality,
             self.in_dc,
@@ -181,20 +234,51 @@ cdef class ExecuteContext:
             self.capabilities,
             self.unsafe_isolation_dangers,
         )
+        if (
+            self.persistent_cache is not None
+            and self.in_type_desc is not None
+            and self.out_type_desc is not None
+            and not self.unsafe_isolation_dangers
+        ):
+            self.persistent_cache.put(
+                key,
+                (
+                    self.cardinality,
+                    self.capabilities,
+                    self.in_type_desc,
+                    self.out_type_desc,
+                ),
+            )
 
     cdef inline invalidate_cache(self):
-        key = (
-            self.query,
-            self.output_format,
-            self.implicit_limit,
-            self.inline_typenames,
-            self.inline_typeids,
-            self.expect_one,
-        )
+        key = self.cache_key()
         try:
             del self.qc[key]
         except KeyError:
             pass
+        if self.persistent_cache is not None:
+            self.persistent_cache.discard(key)
+
+
+cdef state_fingerprint(value):
+    # A hashable snapshot of the state dict.  Leaves are paired with
+    # their type, so that e.g. 1 and True do not share an encoding,
+    # and numbers that compare equal but encode differently (-0.0 and
+    # 0.0, Decimal('1.0') and Decimal('1.00')) are told apart.
+    # Hashing the result raises TypeError if a leaf is unhashable.
+    t = type(value)
+    if t is dict:
+        return (t, tuple([
+            (k, state_fingerprint(v)) for k, v in (<dict>value).items()
+        ]))
+    elif t is list or t is tuple:
+        return (t, tuple([state_fingerprint(v) for v in value]))
+    elif t is float:
+        return (t, value.hex())
+    elif t is decimal.Decimal:
+        return (t, value.as_tuple())
+    else:
+        return (t, value)
 
 
 cdef prefers_repeatable_read(state):
@@ -226,7 +310,6 @@ cdef class SansIOProtocol:
 
         self.state_type_id = NULL_CODEC_ID
         self.state_codec = None
-        self.state_cache = (None, None)
 
     cdef reset_status(self):
         self.last_status = None
@@ -247,6 +330,10 @@ cdef class SansIOProtocol:
     cdef write(self, WriteBuffer buf):
         raise NotImplementedError
 
+    cdef resume_reading(self):
+        # Overridden by protocols that apply read-side flow control.
+        pass
+
     async def wait_for_message(self):
         raise NotImplementedError
 
@@ -537,13 +624,10 @@ cdef class SansIOProtocol:
         if exc is not None:
             raise exc
 
-    async def _execute(self, ctx: ExecuteContext):
+    cdef WriteBuffer encode_execute_message(self, ExecuteContext ctx):
         cdef:
-            WriteBuffer packet
             WriteBuffer buf
             WriteBuffer params
-            char mtype
-            object result
 
         params = self.encode_parse_params(
             ctx, self._get_active_state(ctx, is_execute=True)
@@ -560,9 +644,17 @@ cdef class SansIOProtocol:
         self.encode_args(ctx.in_dc, buf, ctx.args, ctx.kwargs)
 
         buf.end_message()
+        return buf
+
+    async def _execute(self, ctx: ExecuteContext):
+        cdef:
+            WriteBuffer packet
+            WriteBuffer buf
+            char mtype
+            object result
 
         packet = WriteBuffer.new()
-        packet.write_buffer(buf)
+        packet.write_buffer(self.encode_execute_message(ctx))
         packet.write_bytes(SYNC_MESSAGE)
         self.write(packet)
 
@@ -609,23 +701,7 @@ cdef class SansIOProtocol:
                     exc = self.parse_error_message()
                     exc._query = ctx.query
                     if exc.get_code() == parameter_type_mismatch_code:
-                        if not isinstance(ctx.in_dc, NullCodec):
-                            buf = WriteBuffer.new()
-                            try:
-                                self.encode_args(
-                                    ctx.in_dc, buf, ctx.args, ctx.kwargs
-                                )
-                            except errors.QueryArgumentError as ex:
-                                exc = ex
-                            else:
-                                # Now we know for sure that the new codec can
-                                # encode the same arguments, let's hint the
-                                # caller to retry as a special case.
-                                exc.tags = exc.tags.union(
-                                    {errors.SHOULD_RETRY}
-                                )
-                            finally:
-                                buf = None
+                        exc = self._amend_parameter_type_mismatch(ctx, exc)
                     else:
                         exc = self._amend_parse_error(
                             exc,
@@ -649,6 +725,22 @@ cdef class SansIOProtocol:
         else:
             return result
 
+    cdef _amend_parameter_type_mismatch(self, ExecuteContext ctx, exc):
+        # The server has sent the new input descriptor before the error.
+        cdef WriteBuffer buf
+
+        if isinstance(ctx.in_dc, NullCodec):
+            return exc
+        buf = WriteBuffer.new()
+        try:
+            self.encode_args(ctx.in_dc, buf, ctx.args, ctx.kwargs)
+        except errors.QueryArgumentError as ex:
+            return ex
+        # Now we know for sure that the new codec can encode the same
+        # arguments, let's hint the caller to retry as a special case.
+        exc.tags = exc.tags.union({errors.SHOULD_RETRY})
+        return exc
+
     async def _execute_batch(self, ctxs: list[ExecuteContext]):
         cdef:
             WriteBuffer packet, buf, params
@@ -733,30 +825,14 @@ cdef class SansIOProtocol:
                     exc = self.parse_error_message()
                     exc._query = ctx.query
                     if exc.get_code() == parameter_type_mismatch_code:
-                        if not isinstance(ctx.in_dc, NullCodec):
-                            buf = WriteBuffer.new()
-                            try:
-                                self.encode_args(
-                                    ctx.in_dc, buf, ctx.args, ctx.kwargs
-                                )
-                            except errors.QueryArgumentError as ex:
-                                exc = ex
-                            else:
-                                # Now we know for sure that the new codec can
-                                # encode the same arguments, let's hint the
-                                # caller to retry as a special case.
-                                exc.tags = exc.tags.union(
-                                    {errors.SHOULD_RETRY}
-                                )
-
-                                # If we may retry this batch, invalidate codec
-                                # cache for all queries except the current one
-                                # because we just updated its input codec
-                                for c in ctxs:
-                                    if c is not ctx:
-                                        c.invalidate_cache()
-                            finally:
-                                buf = None
+                        exc = self._amend_parameter_type_mismatch(ctx, exc)
+                        if exc.has_tag(errors.SHOULD_RETRY):
+                            # If we may retry this batch, invalidate codec
+                            # cache for all queries except the current one
+                            # because we just updated its input codec
+                            for c in ctxs:
+                                if c is not ctx:
+                                    c.invalidate_cache()
                     else:
                         exc = self._amend_parse_error(
                             exc,
@@ -784,19 +860,26 @@ cdef class SansIOProtocol:
         cdef WriteBuffer buf
 
         if state is not None:
-            if self.state_cache[0] is state:
-                state_data = self.state_cache[1]
-            else:
+            key = (self.state_type_id, state_fingerprint(state))
+            try:
+                with STATE_CACHE_LOCK:
+                    state_data = STATE_CACHE.get(key, None)
+            except TypeError:
+                # Unhashable values in the state, don't cache it.
+                key = state_data = None
+            if state_data is None:
                 assert self.state_codec is not None
                 buf = WriteBuffer.new()
                 self.state_codec.encode(buf, state)
                 state_data = bytes(buf)
-                self.state_cache = (state, state_data)
+                if key is not None:
+                    with STATE_CACHE_LOCK:
+                        STATE_CACHE[key] = state_data
             return self.state_type_id, state_data
         else:
             return NULL_CODEC_ID, EMPTY_NULL_DATA
 
-    async def execute(self, ctx: ExecuteContext):
+    async def _prepare_execute(self, ctx: ExecuteContext):
         self.ensure_connected()
         self.reset_status()
 
@@ -823,12 +906,163 @@ cdef class SansIOProtocol:
             await self._parse(ctx)
             ctx.store_to_cache()
 
+    async def execute(self, ctx: ExecuteContext):
+        await self._prepare_execute(ctx)
         return await self._execute(ctx)
 
     async def query(self, ctx: ExecuteContext):
+        ctx.columns = None
         ret = await self.execute(ctx)
+        if ctx.columnar:
+            if ctx.columns is None:
+                # No rows were received.
+                ctx.columns = ColumnsBuilder.new(ctx.out_dc)
+            return ctx.columns.finish()
         return self._handle_query_result(ctx, ret)
 
+    async def query_iter(self, ctx: ExecuteContext):
+        """Execute a query and yield lists of rows as they are decoded.
+
+        Each yielded chunk holds the rows that were fully received at
+        that point, so at most one network read worth of rows is kept
+        in memory.  If the consumer stops iterating before the query
+        completes, the remaining messages are discarded so that the
+        connection stays usable (e.g. within a transaction).
+
+        Like _execute(), a ParameterTypeMismatchError means that the
+        input descriptor was outdated; the query is executed again with
+        the new one, which is possible as no rows were handed out yet.
+        """
+        cdef:
+            WriteBuffer packet
+            char mtype
+            list rows
+            bint yielded = False
+            bint retried = False
+
+        await self._prepare_execute(ctx)
+
+        packet = WriteBuffer.new()
+        packet.write_buffer(self.encode_execute_message(ctx))
+        packet.write_bytes(SYNC_MESSAGE)
+        self.write(packet)
+
+        rows = []
+        exc = None
+        synced = False
+        try:
+            while True:
+                if not self.buffer.take_message():
+                    if rows:
+                        # Hand out what we have before reading more.
+                        chunk, rows = rows, []
+                        yielded = True
+                        yield chunk
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                try:
+                    if mtype == STMT_DATA_DESC_MSG:
+                        # our in/out type spec is out-dated
+                        self.parse_describe_type_message(ctx)
+                        ctx.store_to_cache()
+
+                    elif mtype == STATE_DATA_DESC_MSG:
+                        self.parse_describe_state_message()
+
+                    elif mtype == DATA_MSG:
+                        if exc is None:
+                            try:
+                                self.parse_data_messages(ctx, rows)
+                            except Exception as ex:
+                                # See _execute() for the rationale.
+                                exc = errors.ClientError(
+                                    'unable to decode data to Python objects')
+                                exc.__cause__ = ex
+                                while self.buffer.take_message_type(DATA_MSG):
+                                    self.buffer.discard_message()
+                        else:
+                            self.buffer.discard_message()
+
+                    elif mtype == COMMAND_COMPLETE_MSG:
+                        self.parse_command_complete_message()
+
+                    elif mtype == ERROR_RESPONSE_MSG:
+                        exc = self.parse_error_message()
+                        exc._query = ctx.query
+                        if exc.get_code() == parameter_type_mismatch_code:
+                            exc = self._amend_parameter_type_mismatch(
+                                ctx, exc)
+                        else:
+                            exc = self._amend_parse_error(
+                                exc,
+                                ctx.output_format,
+                                ctx.expect_one,
+                                ctx.required_one,
+                            )
+
+                    elif mtype == READY_FOR_COMMAND_MSG:
+                        self.parse_sync_message()
+                        if (
+                            exc is not None
+                            and not yielded
+                            and not retried
+                            and exc.get_code() == parameter_type_mismatch_code
+                            and exc.has_tag(errors.SHOULD_RETRY)
+                        ):
+                            retried = True
+                            exc = None
+                            rows = []
+                            packet = WriteBuffer.new()
+                            packet.write_buffer(
+                                self.encode_execute_message(ctx))
+                            packet.write_bytes(SYNC_MESSAGE)
+                            self.write(packet)
+                            continue
+                        synced = True
+                        break
+
+                    else:
+                        self.fallthrough()
+
+                finally:
+                    self.buffer.finish_message()
+
+            if exc is not None:
+                raise exc
+            if rows:
+                chunk, rows = rows, []
+                yield chunk
+        finally:
+            if not synced and self.connected:
+                await self._discard_until_sync()
+            self.resume_reading()
+
+    async def _discard_until_sync(self):
+        cdef char mtype
+        while True:
+            if not self.buffer.take_message():
+                await self.wait_for_message()
+            mtype = self.buffer.get_message_type()
+
+            try:
+                if mtype == READY_FOR_COMMAND_MSG:
+                    self.parse_sync_message()
+                    break
+                elif mtype == STATE_DATA_DESC_MSG:
+                    self.parse_describe_state_message()
+                elif (
+                    mtype == DATA_MSG
+                    or mtype == STMT_DATA_DESC_MSG
+                    or mtype == COMMAND_COMPLETE_MSG
+                    or mtype == ERROR_RESPONSE_MSG
+                ):
+                    self.buffer.discard_message()
+                else:
+                    self.fallthrough()
+            finally:
+                self.buffer.finish_message()
+
     cdef _handle_query_result(self, ExecuteContext ctx, ret):
         if ctx.expect_one:
             if ret or not ctx.required_one:
@@ -836,7 +1070,7 @@ cdef class SansIOProtocol:
                     return ret[0]
                 else:
                     if ctx.output_format == OutputFormat.JSON:
-                        return 'null'
+                        return b'null' if ctx.json_bytes else 'null'
                     else:
                         return None
             else:
@@ -853,7 +1087,7 @@ cdef class SansIOProtocol:
                     return ret
             else:
                 if ctx.output_format == OutputFormat.JSON:
-                    return '[]'
+                    return b'[]' if ctx.json_bytes else '[]'
                 else:
                     return ret
 
@@ -1250,7 +1484,8 @@ cdef class SansIOProtocol:
             itercount,
             client_first_bare.encode('utf-8'),
             server_first,
-            server_nonce)
+            server_nonce,
+            keys=self.con_params.get_scram_keys(salt, itercount))
 
         msg_buf = WriteBuffer.new_message(AUTH_RESPONSE_MSG)
         msg_buf.write_len_prefixed_utf8(client_final)
@@ -1418,7 +1653,6 @@ cdef class SansIOProtocol:
 
             if state_type_id != self.state_type_id:
                 self.state_type_id = state_type_id
-                self.state_cache = (None, None)
                 if self.internal_reg.has_codec(state_type_id):
                     self.state_codec = self.internal_reg.get_codec(
                         state_type_id
@@ -1443,6 +1677,7 @@ cdef class SansIOProtocol:
             in_dc = reg.get_codec(type_id)
         else:
             in_dc = reg.build_codec(type_data, self.protocol_version)
+        ctx.in_type_desc = (type_id, type_data)
 
         type_id = self.buffer.read_bytes(16)
         type_data = self.buffer.read_len_prefixed_bytes()
@@ -1451,13 +1686,30 @@ cdef class SansIOProtocol:
             out_dc = reg.get_codec(type_id)
         else:
             out_dc = reg.build_codec(type_data, self.protocol_version)
+        ctx.out_type_desc = (type_id, type_data)
 
         return in_dc, out_dc
 
     cdef parse_data_messages(self, ExecuteContext ctx, result):
+        if ctx.identity_map is None:
+            return self._parse_data_messages(ctx, result)
+
+        # Models decoded from these rows are looked up in (and added to)
+        # the identity map by ObjectCodec.
+        token = _identity_map.current.set(ctx.identity_map)
+        try:
+            return self._parse_data_messages(ctx, result)
+        finally:
+            _identity_map.current.reset(token)
+
+    cdef _parse_data_messages(self, ExecuteContext ctx, result):
         cdef:
             ReadBuffer buf = self.buffer
             BaseCodec out_dc = ctx.out_dc
+            ColumnsBuilder columns = None
+            object json_loads = None
+            bint json_rows = False
+            bint jsonb = False
 
             decode_row_method decoder = <decode_row_method>out_dc.decode
             pgproto.try_consume_message_method try_consume_message = \
@@ -1480,6 +1732,20 @@ cdef class SansIOProtocol:
                 raise RuntimeError(
                     f'result is not a list, but {result!r}')
 
+        if ctx.columnar:
+            if ctx.columns is None:
+                ctx.columns = ColumnsBuilder.new(out_dc)
+            columns = ctx.columns
+        elif ctx.parse_json or ctx.json_bytes:
+            # JSON output rows are returned as bytes or parsed straight
+            # from them, without decoding them into a str first.
+            if ctx.parse_json:
+                json_loads = ctx.reg.get_json_decoder()
+            json_rows = True
+            jsonb = out_dc.name == 'std::json'
+        elif ctx.lazy:
+            decoder = decode_lazy_row
+
         while take_message_type(buf, DATA_MSG):
             cbuf = try_consume_message(buf, &cbuf_len)
             if cbuf == NULL:
@@ -1506,8 +1772,20 @@ cdef class SansIOProtocol:
                 # so we want to skip first 6 bytes:
                 frb_init(rbuf, cbuf + 6, cbuf_len - 6)
 
-            row = decoder(out_dc, ctx.return_type, rbuf)
-            result.append(row)
+            if columns is not None:
+                columns.decode_row(rbuf)
+            elif json_rows:
+                if jsonb and <uint8_t>frb_read(rbuf, 1)[0] != 1:
+                    raise ValueError('unexpected JSONB format')
+                cbuf_len = frb_get_len(rbuf)
+                row = cpython.PyBytes_FromStringAndSize(
+                    frb_read_all(rbuf), cbuf_len)
+                if json_loads is not None:
+                    row = json_loads(row)
+                result.append(row)
+            else:
+                row = decoder(out_dc, ctx.return_type, rbuf)
+                result.append(row)
 
             if frb_get_len(rbuf):
                 raise RuntimeError(
@@ -291,23 +291,27 @@ def build_client_final_message(
     client_first_bare: bytes,
     server_first: bytes,
     server_nonce: str,
+    *,
+    keys: tuple[bytes, bytes] | None = None,
 ) -> str:
+    """Build the client-final-message and the expected server proof.
+
+    *keys* are the ClientKey and ServerKey for *password*, *salt* and
+    *iterations*, if the caller has them from an earlier login.
+    """
     client_final = f"c=biws,r={server_nonce}"
 
     AuthMessage = build_auth_message(
         client_first_bare, server_first, client_final.encode("utf-8")
     )
 
-    SaltedPassword = get_salted_password(
-        saslprep(password).encode("utf-8"), salt, iterations
-    )
-
-    ClientKey = get_client_key(SaltedPassword)
+    if keys is None:
+        keys = get_client_and_server_keys(password, salt, iterations)
+    ClientKey, ServerKey = keys
     StoredKey = H(ClientKey)
     ClientSignature = HMAC(StoredKey, AuthMessage)
     ClientProof = XOR(ClientKey, ClientSignature)
 
-    ServerKey = get_server_key(SaltedPassword)
     ServerProof = HMAC(ServerKey, AuthMessage)
 
     return f"{client_final},p={B64(ClientProof)}", ServerProof
@@ -421,14 +425,18 @@ def H(s: bytes) -> bytes:
 def get_salted_password(
     password: bytes, salt: bytes, iterations: int
 ) -> bytes:
-    # U1 := HMAC(str, salt + INT(1))
-    H_i = U_i = HMAC(password, salt + b"\x00\x00\x00\x01")
+    # Hi() of RFC 5802 is PBKDF2 with HMAC-SHA-256 as the PRF.
+    return hashlib.pbkdf2_hmac("sha256", password, salt, iterations)
 
-    for _ in range(iterations - 1):
-        U_i = HMAC(password, U_i)
-        H_i = XOR(H_i, U_i)
 
-    return H_i
+def get_client_and_server_keys(
+    password: str, salt: bytes, iterations: int
+) -> tuple[bytes, bytes]:
+    """Return the ClientKey and ServerKey derived from *password*."""
+    salted_password = get_salted_password(
+        saslprep(password).encode("utf-8"), salt, iterations
+    )
+    return get_client_key(salted_password), get_server_key(salted_password)
 
 
 def get_client_key(salted_password: bytes) -> bytes:
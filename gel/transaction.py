@@ -19,6 +19,7 @@
 
 import typing
 
+import contextlib
 import enum
 import sys
 
@@ -222,10 +223,25 @@ class BaseTransaction:
     def _get_annotations(self) -> typing.Dict[str, str]:
         return self._client._get_annotations()
 
+    def _get_lazy_decoding(self) -> bool:
+        return self._client._get_lazy_decoding()
+
+    def _get_identity_map(self) -> typing.Optional[options.IdentityMap]:
+        return self._client._get_identity_map()
+
     async def _query(self, query_context: abstract.QueryContext):
         await self._ensure_transaction()
         return await self._connection.raw_query(query_context)
 
+    async def _query_iter(self, query_context: abstract.BaseQueryContext):
+        await self._ensure_transaction()
+        async with contextlib.aclosing(
+            self._connection.raw_query_iter(query_context)
+        ) as chunks:
+            async for chunk in chunks:
+                for row in chunk:
+                    yield row
+
     async def _execute(self, execute_context: abstract.ExecuteContext) -> None:
         await self._ensure_transaction()
         await self._connection._execute(execute_context)
@@ -286,6 +302,8 @@ class BaseRetry:
             return False
         self._done = False
         self._next_backoff = rule.backoff(self._iteration)
+        if (metrics := self._owner._impl._metrics) is not None:
+            metrics.on_retry(self._iteration, exc)
         return True
 
     def _retry_rr_failure(self, exc):
@@ -0,0 +1,184 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Compares encoding a large array<int64> / array<float64> query argument
+# passed as a list with passing it as an array.array or a memoryview
+# (which take the single-pass buffer path).  A minimal in-process server
+# declares the argument and discards the Execute message, so no Gel
+# server is needed.
+
+import array
+import socket
+import struct
+import threading
+import time
+import types
+import uuid
+
+from gel import blocking_client
+from gel.protocol import blocking_proto
+from gel.protocol import protocol
+
+
+N = 10_000_000
+ROUNDS = 5
+
+INT64_ID = uuid.UUID('00000000-0000-0000-0000-000000000105').bytes
+FLOAT64_ID = uuid.UUID('00000000-0000-0000-0000-000000000107').bytes
+ARRAY_ID = uuid.UUID('c2f2d1f6-5d0b-4b53-8d7b-6a1a0f2d9a01').bytes
+ARGS_ID = uuid.UUID('c2f2d1f6-5d0b-4b53-8d7b-6a1a0f2d9a02').bytes
+NULL_ID = b'\x00' * 16
+
+
+def msg(mtype, payload):
+    return mtype + struct.pack('!i', len(payload) + 4) + payload
+
+
+def len_prefixed(data):
+    return struct.pack('!i', len(data)) + data
+
+
+READY = msg(b'Z', struct.pack('!h', 0) + b'I')
+
+HANDSHAKE = (
+    msg(b'v', struct.pack('!hhh', 3, 0, 0))
+    + msg(b'R', struct.pack('!i', 0))
+    + msg(b'K', b'\x00' * 32)
+    + READY
+)
+
+
+def describe(elem_id):
+    # Arguments shape {"0": array<elem>}, no result.
+    desc = (
+        len_prefixed(b'\x02' + elem_id)
+        + len_prefixed(
+            b'\x06' + ARRAY_ID + len_prefixed(b'array') + b'\x00'
+            + struct.pack('!HHHi', 0, 0, 1, -1)
+        )
+        + len_prefixed(
+            b'\x01' + ARGS_ID + b'\x01' + struct.pack('!HH', 0, 1)
+            + struct.pack('!I', 0) + b'A' + len_prefixed(b'0')
+            + struct.pack('!HH', 1, 0)
+        )
+    )
+    return msg(
+        b'T',
+        struct.pack('!hq', 0, 0) + b'n'
+        + ARGS_ID + len_prefixed(desc)
+        + NULL_ID + len_prefixed(b''),
+    )
+
+
+COMPLETE = msg(
+    b'C',
+    struct.pack('!hq', 0, 0) + len_prefixed(b'SELECT')
+    + NULL_ID + len_prefixed(b''),
+)
+
+
+def serve(sock, elem_id):
+    def recv_exactly(n):
+        buf = bytearray(n)
+        view = memoryview(buf)
+        pos = 0
+        while pos < n:
+            got = sock.recv_into(view[pos:])
+            if not got:
+                raise EOFError
+            pos += got
+        return buf
+
+    try:
+        while True:
+            mtype = bytes(recv_exactly(1))
+            mlen, = struct.unpack('!i', recv_exactly(4))
+            recv_exactly(mlen - 4)
+            if mtype == b'V':
+                sock.sendall(HANDSHAKE)
+            elif mtype == b'P':
+                sock.sendall(describe(elem_id))
+            elif mtype == b'O':
+                sock.sendall(COMPLETE)
+            elif mtype == b'S':
+                sock.sendall(READY)
+            elif mtype == b'X':
+                return
+    except (EOFError, OSError):
+        pass
+    finally:
+        sock.close()
+
+
+def run(elem_id, arg):
+    csock, ssock = socket.socketpair()
+    threading.Thread(
+        target=serve, args=(ssock, elem_id), daemon=True).start()
+
+    params = types.SimpleNamespace(
+        user='edgedb', database='edgedb', branch='edgedb',
+        secret_key=None, password=None)
+    proto = blocking_proto.BlockingIOProtocol(params, csock)
+    blocking_client.iter_coroutine(proto.connect())
+
+    reg = protocol.CodecsRegistry()
+    qc = protocol.LRUMapping(maxsize=10)
+
+    best = None
+    for _ in range(ROUNDS):
+        ctx = protocol.ExecuteContext(
+            query='select count(array_unpack(<array<int64>>$0))',
+            args=(arg,),
+            kwargs={},
+            reg=reg,
+            qc=qc,
+            input_language=protocol.InputLanguage.EDGEQL,
+            output_format=protocol.OutputFormat.NONE,
+            return_type=None,
+        )
+        st = time.monotonic()
+        blocking_client.iter_coroutine(proto.execute(ctx))
+        total = time.monotonic() - st
+        best = total if best is None else min(best, total)
+
+    proto.abort()
+    return best
+
+
+def main():
+    for elem, elem_id, typecode, values in [
+        ('int64', INT64_ID, 'q', range(N)),
+        ('float64', FLOAT64_ID, 'd', (i / 2 for i in range(N))),
+    ]:
+        buf = array.array(typecode, values)
+        results = {}
+        for name, arg in [
+            ('list', buf.tolist()),
+            ('array.array', buf),
+            ('memoryview', memoryview(buf)),
+        ]:
+            results[name] = total = run(elem_id, arg)
+            print(f'array<{elem}> {name}:\t{N / total:>14,.0f} elements/sec')
+        print(
+            f'array<{elem}> buffer speedup: '
+            f'{results["list"] / results["array.array"]:.2f}x\n'
+        )
+
+
+if __name__ == '__main__':
+    main()
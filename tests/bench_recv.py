@@ -0,0 +1,205 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Compares the data_received() and the get_buffer()/buffer_updated()
+# receive paths of the asyncio protocol.  A minimal in-process server
+# answers every query with N rows of int64, so no Gel server is needed.
+
+import asyncio
+import socket
+import struct
+import threading
+import time
+import tracemalloc
+import types
+import uuid
+
+from gel.protocol import asyncio_proto
+from gel.protocol import protocol
+
+
+N = 1_000_000
+ROUNDS = 5
+
+INT64_ID = uuid.UUID('00000000-0000-0000-0000-000000000105').bytes
+NULL_ID = b'\x00' * 16
+
+
+def msg(mtype, payload):
+    return mtype + struct.pack('!i', len(payload) + 4) + payload
+
+
+def len_prefixed(data):
+    return struct.pack('!i', len(data)) + data
+
+
+READY = msg(b'Z', struct.pack('!h', 0) + b'I')
+
+HANDSHAKE = (
+    msg(b'v', struct.pack('!hhh', 3, 0, 0))
+    + msg(b'R', struct.pack('!i', 0))
+    + msg(b'K', b'\x00' * 32)
+    + READY
+)
+
+DESCRIBE = msg(
+    b'T',
+    struct.pack('!hq', 0, 0) + b'm'
+    + NULL_ID + len_prefixed(b'')
+    + INT64_ID + len_prefixed(len_prefixed(b'\x02' + INT64_ID)),
+)
+
+ROWS = b''.join(
+    msg(b'D', struct.pack('!h', 1) + len_prefixed(struct.pack('!q', i)))
+    for i in range(N)
+)
+
+COMPLETE = msg(
+    b'C',
+    struct.pack('!hq', 0, 0) + len_prefixed(b'SELECT')
+    + NULL_ID + len_prefixed(b''),
+)
+
+
+def serve(sock):
+    def recv_exactly(n):
+        buf = b''
+        while len(buf) < n:
+            data = sock.recv(n - len(buf))
+            if not data:
+                raise EOFError
+            buf += data
+        return buf
+
+    try:
+        while True:
+            mtype = recv_exactly(1)
+            mlen, = struct.unpack('!i', recv_exactly(4))
+            body = recv_exactly(mlen - 4)
+            if mtype == b'V':
+                sock.sendall(HANDSHAKE)
+            elif mtype == b'O':
+                if INT64_ID not in body:
+                    sock.sendall(DESCRIBE)
+                sock.sendall(ROWS)
+                sock.sendall(COMPLETE)
+            elif mtype == b'S':
+                sock.sendall(READY)
+            elif mtype == b'X':
+                return
+    except (EOFError, OSError):
+        pass
+    finally:
+        sock.close()
+
+
+async def run(proto_cls, *, trace):
+    loop = asyncio.get_running_loop()
+    csock, ssock = socket.socketpair()
+    threading.Thread(target=serve, args=(ssock,), daemon=True).start()
+
+    params = types.SimpleNamespace(
+        user='edgedb', database='edgedb', branch='edgedb',
+        secret_key=None, password=None)
+    _, proto = await loop.create_connection(
+        lambda: proto_cls(params, loop), sock=csock)
+    await proto.connect()
+
+    reg = protocol.CodecsRegistry()
+    qc = protocol.LRUMapping(maxsize=10)
+
+    best = None
+    peak = 0
+    for _ in range(ROUNDS):
+        ctx = protocol.ExecuteContext(
+            query='select 1',
+            args=(),
+            kwargs={},
+            reg=reg,
+            qc=qc,
+            input_language=protocol.InputLanguage.EDGEQL,
+            output_format=protocol.OutputFormat.BINARY,
+            return_type=None,
+        )
+        if trace:
+            tracemalloc.start()
+        st = time.monotonic()
+        rows = await proto.execute(ctx)
+        total = time.monotonic() - st
+        if trace:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert len(rows) == N
+        del rows
+        best = total if best is None else min(best, total)
+
+    proto.abort()
+    return best, peak
+
+
+def check_partial_read():
+    # A read that does not fill the buffer must be fed to the protocol
+    # without copying the received bytes.
+    loop = asyncio.new_event_loop()
+    try:
+        proto = asyncio_proto.BufferedAsyncIOProtocol(
+            types.SimpleNamespace(), loop)
+        tracemalloc.start()
+        try:
+            buf = proto.get_buffer(-1)
+            nbytes = len(buf) // 2
+            buf[:nbytes] = b'\x00' * nbytes
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            proto.buffer_updated(nbytes)
+            allocated = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+    finally:
+        loop.close()
+
+    print(f'partial read of {nbytes} bytes allocated {allocated} bytes')
+    assert allocated < nbytes, (
+        f'buffer_updated() copied a partial read: '
+        f'{allocated} bytes allocated for {nbytes} bytes received')
+
+
+def main():
+    check_partial_read()
+
+    results = {}
+    for name, proto_cls in [
+        ('data_received', asyncio_proto.AsyncIOProtocol),
+        ('buffer_updated', asyncio_proto.BufferedAsyncIOProtocol),
+    ]:
+        total, _ = asyncio.run(run(proto_cls, trace=False))
+        _, peak = asyncio.run(run(proto_cls, trace=True))
+        results[name] = total
+        print(
+            f'{name}:\t{N / total:>12,.0f} rows/sec'
+            f'\tpeak alloc {peak / 1024 / 1024:.1f} MiB'
+        )
+
+    print(
+        f'\nbuffer_updated speedup: '
+        f'{results["data_received"] / results["buffer_updated"]:.2f}x'
+    )
+
+
+if __name__ == '__main__':
+    main()
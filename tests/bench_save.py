@@ -0,0 +1,123 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Throughput of save() for large lists of new objects of one type,
+# and for deep and wide graphs of linked objects.
+# Needs a Gel server, just like the model tests; run explicitly with
+#
+#     python -m pytest tests/bench_save.py
+
+import itertools
+import time
+
+from gel._internal import _save
+from gel._internal._testbase import _models as tb
+
+
+SIZES = (10_000, 100_000)
+BATCH_SIZES = (100, 1280, 5000)
+GRAPH_SIZES = (1_000, 10_000, 50_000)
+
+
+class BenchSave(tb.ModelTestCase):
+    ISOLATED_TEST_BRANCHES = True
+
+    SCHEMA = """
+        type Item {
+            name: str;
+            num: int64;
+            flag: bool;
+        };
+
+        type Node {
+            name: str;
+            next: Node;
+            multi children: Node;
+        };
+    """
+
+    def test_bench_save_flat(self):
+        from models.BenchSave import default
+
+        print()
+        for size in SIZES:
+            for batch_size in BATCH_SIZES:
+                objs = [
+                    default.Item(name=f"item{i}", num=i, flag=bool(i % 2))
+                    for i in range(size)
+                ]
+
+                reports = []
+                client = self.client._with_debug(save_debug=reports.append)
+
+                st = time.monotonic()
+                client.save(*objs, batch_size=batch_size)
+                total = time.monotonic() - st
+
+                report = reports[0]
+                print(
+                    f"{size:>8} objs, batch {batch_size:>5}: "
+                    f"{size / total:>10,.0f} objs/sec  "
+                    f"plan {report.plan_time:.3f}s  "
+                    f"compile {report.compile_time:.3f}s  "
+                    f"network {report.network_time:.3f}s  "
+                    f"commit {report.commit_time:.3f}s"
+                )
+
+                self.client.execute("delete Item")
+
+    def _bench_graph(self, kind, root, size):
+        st = time.monotonic()
+        tracker = _save.IDTracker()
+        visited = sum(1 for _ in _save.iter_graph([root], tracker))
+        walk = time.monotonic() - st
+        assert visited == size
+
+        reports = []
+        client = self.client._with_debug(save_debug=reports.append)
+
+        st = time.monotonic()
+        client.save(root)
+        total = time.monotonic() - st
+
+        report = reports[0]
+        print(
+            f"{kind:>5} {size:>8} objs: "
+            f"walk {walk:.3f}s  "
+            f"save {total:.3f}s  "
+            f"plan {report.plan_time:.3f}s  "
+            f"commit {report.commit_time:.3f}s"
+        )
+
+        self.client.execute("delete Node")
+
+    def test_bench_save_graph(self):
+        from models.BenchSave import default
+
+        print()
+        for size in GRAPH_SIZES:
+            # A linked list: as deep as it gets.
+            nodes = [default.Node(name=f"n{i}") for i in range(size)]
+            for prev, node in itertools.pairwise(nodes):
+                prev.next = node
+            self._bench_graph("deep", nodes[0], size)
+
+            # A root with all other nodes as its children.
+            nodes = [default.Node(name=f"n{i}") for i in range(size)]
+            nodes[0].children = nodes[1:]
+            self._bench_graph("wide", nodes[0], size)
@@ -0,0 +1,125 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Change tracking of large multi properties (the tracked lists that
+# hold e.g. `multi tags: str`), edited in loops the way user code
+# does.  Doesn't need a Gel server.
+
+import random
+import time
+
+from gel._internal import _save
+from gel._internal._tracked_list import Mode, TrackedList
+
+
+N = 100_000
+EDITS = 10_000
+REMOVE_AND_READ = 2_000
+
+StrList = TrackedList[str]
+
+
+def fetched(items):
+    return StrList(list(items), __mode__=Mode.ReadWrite, __wrap_list__=True)
+
+
+def bench(name, setup, run):
+    lst = setup()
+    st = time.monotonic()
+    run(lst)
+    total = time.monotonic() - st
+    print(f'{name:<40} {total:.4f}')
+    return lst
+
+
+def main():
+    tags = [f'tag{i}' for i in range(N)]
+    rnd = random.Random(0)
+    victims = rnd.sample(tags, EDITS)
+    new = [f'new{i}' for i in range(EDITS)]
+
+    print(f'{N} items, {EDITS} edits')
+    print()
+
+    def remove(lst):
+        for tag in victims:
+            lst.remove(tag)
+
+    lst = bench('remove()', lambda: fetched(tags), remove)
+    assert len(lst) == N - EDITS
+
+    def contains(lst):
+        for tag in victims:
+            assert tag in lst
+
+    bench('in', lambda: fetched(tags), contains)
+
+    def add_if_missing(lst):
+        for tag in victims + new:
+            if tag not in lst:
+                lst.append(tag)
+
+    lst = bench('append() unless in', lambda: fetched(tags), add_if_missing)
+    assert lst.__gel_get_added__() == new
+
+    def add_then_remove(lst):
+        for tag in new:
+            lst.append(tag)
+        for tag in new:
+            lst.remove(tag)
+
+    lst = bench('append() then remove()', lambda: fetched(tags),
+                add_then_remove)
+    assert not lst.__gel_get_added__()
+    assert not lst.__gel_get_removed__()
+    assert not lst.__gel_has_changes__()
+
+    def remove_then_len(lst):
+        for tag in victims[:REMOVE_AND_READ]:
+            lst.remove(tag)
+            len(lst)
+
+    lst = bench('remove() then len()', lambda: fetched(tags),
+                remove_then_len)
+    assert len(lst) == N - REMOVE_AND_READ
+
+    def remove_then_index(lst):
+        for tag in victims[:REMOVE_AND_READ]:
+            lst.remove(tag)
+            assert lst[-1] == last
+
+    removed = set(victims[:REMOVE_AND_READ])
+    last = next(tag for tag in reversed(tags) if tag not in removed)
+    bench('remove() then [-1]', lambda: fetched(tags), remove_then_index)
+
+    def pop(lst):
+        for _ in range(EDITS):
+            lst.pop()
+
+    bench('pop()', lambda: fetched(tags), pop)
+
+    def has_changes(lst):
+        for _ in range(EDITS):
+            _save.multi_prop_has_changes_recursive(lst)
+
+    bench('multi_prop_has_changes_recursive()', lambda: fetched(tags),
+          has_changes)
+
+
+if __name__ == '__main__':
+    main()
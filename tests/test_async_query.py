@@ -17,6 +17,7 @@
 #
 
 
+import contextlib
 import datetime
 import decimal
 import enum
@@ -227,6 +228,71 @@ class TestAsyncQuery(tb.AsyncQueryTestCase):
                 r'not return'):
             await self.client.query_required_single_json('create type Bar456')
 
+    async def test_async_query_iter_01(self):
+        rows = [
+            row async for row in self.client.query_iter(
+                'select range_unpack(range(0, 100000))'
+            )
+        ]
+        self.assertEqual(rows, list(range(100000)))
+
+        rows = [
+            row async for row in self.client.query_iter(
+                'select <int64>$0 + {1, 2}', 10
+            )
+        ]
+        self.assertEqual(sorted(rows), [11, 12])
+
+        rows = [row async for row in self.client.query_iter('select <str>{}')]
+        self.assertEqual(rows, [])
+
+    async def test_async_query_iter_02(self):
+        # Stop consuming early: the connection must be usable afterwards.
+        for _ in range(3):
+            async with contextlib.aclosing(
+                self.client.query_iter('select range_unpack(range(0, 100000))')
+            ) as rows:
+                async for row in rows:
+                    if row == 10:
+                        break
+            self.assertEqual(await self.client.query_single('select 1'), 1)
+
+        self.assertFalse(self.client.connection.is_closed())
+
+    async def test_async_query_iter_03(self):
+        with self.assertRaises(gel.DivisionByZeroError):
+            async for _ in self.client.query_iter(
+                'select 1 // {1, 0}'
+            ):
+                pass
+
+        self.assertEqual(await self.client.query_single('select 1'), 1)
+
+        async for tx in self.client.transaction():
+            async with tx:
+                rows = [
+                    row async for row in tx.query_iter(
+                        'select test::Obj.name'
+                    )
+                ]
+                self.assertEqual(sorted(rows), ['bar', 'foo'])
+
+    async def test_async_query_columns_01(self):
+        cols = await self.client.query_columns('''
+            select test::Obj { name, val, half := <float64>.val / 2 }
+            order by .val
+        ''')
+        self.assertEqual(list(cols), ['name', 'val', 'half'])
+        self.assertEqual(cols['name'], ['foo', 'bar'])
+        self.assertEqual(cols['val'].tolist(), [0, 1])
+        self.assertEqual(cols['half'].tolist(), [0.0, 0.5])
+
+        async for tx in self.client.transaction():
+            async with tx:
+                cols = await tx.query_columns(
+                    'select range_unpack(range(0, 1000))')
+                self.assertEqual(cols['0'].tolist(), list(range(1000)))
+
     async def test_async_basic_datatypes_01(self):
         for _ in range(10):
             self.assertEqual(
@@ -1216,6 +1282,27 @@ class TestAsyncQuery(tb.AsyncQueryTestCase):
             ),
         )
 
+    async def test_retry_mismatch_input_typedesc_iter(self):
+        query = "SELECT <test::IterType>$0 + {0, 1}"
+        await self.client.execute(
+            "CREATE SCALAR TYPE test::IterType EXTENDING std::int32"
+        )
+        try:
+            rows = [row async for row in self.client.query_iter(query, 42)]
+            self.assertEqual(sorted(rows), [42, 43])
+
+            await self.client.execute("""
+                DROP SCALAR TYPE test::IterType;
+                CREATE SCALAR TYPE test::IterType EXTENDING std::int64;
+            """)
+
+            # The outdated input descriptor is replaced before any rows
+            # are returned, so query_iter() can run the query again.
+            rows = [row async for row in self.client.query_iter(query, 42)]
+            self.assertEqual(sorted(rows), [42, 43])
+        finally:
+            await self.client.execute("DROP SCALAR TYPE test::IterType")
+
     async def test_retry_mismatch_input_typedesc(self):
         # Cache the input type descriptor first
         val = await self.client.query_single("SELECT <test::MyType>$0", 42)
@@ -139,6 +139,28 @@ class TestAsyncRetry(tb.AsyncQueryTestCase):
             FILTER .name = 'counter_retry_begin'
         ''')
 
+    async def test_async_retry_metrics(self):
+        metrics = gel.metrics.PoolMetricsCollector()
+        client = self.make_test_client(
+            database=self.get_database_name(),
+            pool_metrics=metrics,
+        ).with_retry_options(
+            RetryOptions(attempts=3, backoff=lambda n: 0)
+        )
+        iterations = 0
+        try:
+            async for tx in client.transaction():
+                async with tx:
+                    await tx.query_single('SELECT 1')
+                    iterations += 1
+                    if iterations < 3:
+                        raise errors.TransactionSerializationError()
+        finally:
+            await client.aclose()
+
+        self.assertEqual(iterations, 3)
+        self.assertEqual(metrics.retries, 2)
+
     async def test_async_retry_conflict(self):
         await self.execute_conflict('counter2')
 
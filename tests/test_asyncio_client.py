@@ -339,6 +339,57 @@ class TestAsyncIOClient(tb.AsyncQueryTestCase):
 
         await client.aclose()
 
+    async def test_client_min_size(self):
+        client = self.create_client(max_concurrency=4, min_size=3)
+        await client.ensure_connected()
+        self.assertEqual(client._impl._count_connected(), 3)
+        self.assertEqual(await client.query_single("SELECT 42"), 42)
+        await client.aclose()
+
+        with self.assertRaises(ValueError):
+            self.create_client(max_concurrency=2, min_size=3)
+
+    async def test_client_max_lifetime(self):
+        client = self.create_client(max_concurrency=1, max_lifetime=0.1)
+        self.assertEqual(await client.query_single("SELECT 42"), 42)
+        con = client._impl._holders[0]._con
+
+        await asyncio.sleep(0.2)
+        self.assertEqual(await client.query_single("SELECT 42"), 42)
+        self.assertIsNot(client._impl._holders[0]._con, con)
+        await client.aclose()
+
+    async def test_client_max_idle_time_reaper(self):
+        # Expired connections are closed even if the pool stays idle.
+        client = self.create_client(
+            max_concurrency=2, min_size=1, max_idle_time=0.1
+        )
+        async for tx in client.transaction():
+            async with tx:
+                await tx.query("SELECT 42")
+                await client.query("SELECT 42")
+        self.assertEqual(client._impl._count_connected(), 2)
+
+        await asyncio.sleep(0.5)
+        self.assertEqual(client._impl._count_connected(), 1)
+        await client.aclose()
+        self.assertIsNone(client._impl._reap_handle)
+
+    async def test_client_pool_metrics(self):
+        metrics = gel.metrics.PoolMetricsCollector()
+        client = self.create_client(max_concurrency=2, pool_metrics=metrics)
+        await asyncio.gather(*[
+            client.query_single("SELECT 42") for _ in range(4)
+        ])
+
+        self.assertEqual(metrics.acquires, 4)
+        self.assertEqual(sum(metrics.acquire_wait_counts), 4)
+        self.assertEqual(metrics.connects, 2)
+        self.assertEqual(metrics.max_in_use, 2)
+        self.assertEqual(metrics.in_use, 0)
+        self.assertTrue(metrics.connect_times)
+        await client.aclose()
+
     async def test_client_properties(self):
         max_concurrency = 2
 
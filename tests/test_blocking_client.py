@@ -19,12 +19,16 @@
 import asyncio
 import queue
 import random
+import socket
 import threading
 import time
+import unittest
+from unittest import mock
 
 import gel
 
 from gel._internal import _testbase as tb
+from gel import base_client
 from gel import errors
 from gel import blocking_client
 
@@ -357,6 +361,96 @@ class TestBlockingClient(tb.SyncQueryTestCase):
         self.assertIsNone(client._impl._holders[0]._con)
         client.close()
 
+    def test_client_min_size(self):
+        client = self.create_client(max_concurrency=4, min_size=3)
+        client.ensure_connected()
+        self.assertEqual(client._impl._count_connected(), 3)
+        self.assertEqual(client.query_single("SELECT 42"), 42)
+        client.close()
+
+        with self.assertRaises(ValueError):
+            self.create_client(max_concurrency=2, min_size=3)
+
+    def test_client_max_lifetime(self):
+        client = self.create_client(max_concurrency=1, max_lifetime=0.1)
+        self.assertEqual(client.query_single("SELECT 42"), 42)
+        con = client._impl._holders[0]._con
+
+        time.sleep(0.2)
+        self.assertEqual(client.query_single("SELECT 42"), 42)
+        self.assertTrue(con.is_closed())
+        self.assertIsNot(client._impl._holders[0]._con, con)
+        client.close()
+
+    def test_client_max_idle_time(self):
+        client = self.create_client(
+            max_concurrency=2, min_size=1, max_idle_time=0.1
+        )
+        for tx in client.transaction():
+            with tx:
+                tx.query("SELECT 42")
+                client.query("SELECT 42")
+        self.assertEqual(client._impl._count_connected(), 2)
+
+        time.sleep(0.2)
+        client._impl._next_reap = 0
+        client.query("SELECT 42")
+        # One connection is kept open to honor min_size.
+        self.assertEqual(client._impl._count_connected(), 1)
+        client.close()
+
+    def test_client_max_idle_time_reaper(self):
+        # Expired connections are closed even if the pool stays idle.
+        client = self.create_client(
+            max_concurrency=2, min_size=1, max_idle_time=0.1
+        )
+        for tx in client.transaction():
+            with tx:
+                tx.query("SELECT 42")
+                client.query("SELECT 42")
+        self.assertEqual(client._impl._count_connected(), 2)
+
+        time.sleep(0.5)
+        self.assertEqual(client._impl._count_connected(), 1)
+        client.close()
+        self.assertIsNone(client._impl._reap_timer)
+
+    def test_client_pool_metrics(self):
+        metrics = gel.metrics.PoolMetricsCollector()
+        client = self.create_client(max_concurrency=2, pool_metrics=metrics)
+        for _ in range(3):
+            self.assertEqual(client.query_single("SELECT 42"), 42)
+
+        self.assertEqual(metrics.acquires, 3)
+        self.assertEqual(sum(metrics.acquire_wait_counts), 3)
+        self.assertEqual(metrics.connects, 1)
+        self.assertEqual(metrics.reconnects, 0)
+        self.assertEqual(metrics.max_in_use, 1)
+        self.assertEqual(metrics.in_use, 0)
+
+        client._impl.expire_connections()
+        client.query_single("SELECT 42")
+        self.assertEqual(metrics.reconnects, 1)
+        client.close()
+
+        self.assertTrue(metrics.connect_times)
+        self.assertTrue(
+            all(t > 0 for t in metrics.connect_times.values()))
+
+    def test_client_tls_session_reuse(self):
+        client = self.create_client(max_concurrency=1)
+        client.query_single("SELECT 42")
+        params = client._impl._working_params
+        if params is None or not params.ssl_ctx.session:
+            client.close()
+            self.skipTest("the server does not issue TLS session tickets")
+
+        client._impl.expire_connections()
+        client.query_single("SELECT 42")
+        con = client._impl._holders[0]._con
+        self.assertTrue(con._protocol.sock.session_reused)
+        client.close()
+
     def test_client_properties(self):
         max_concurrency = 2
 
@@ -491,3 +585,69 @@ class TestBlockingClient(tb.SyncQueryTestCase):
         self.assertEqual(client.max_concurrency, 5)
 
         client.close()
+
+
+class TestRaceConnect(unittest.TestCase):
+    def test_race_connect_blackholed_first(self):
+        # The first address never answers: the second one is tried
+        # after HAPPY_EYEBALLS_DELAY and wins the race.
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+        live = server.getsockname()
+        blackholed = ("127.0.0.1", 9)
+
+        released = threading.Event()
+        self.addCleanup(released.set)
+        real_socket = socket.socket
+
+        class BlackholeSocket(real_socket):
+            def connect(self, address):
+                if address == blackholed:
+                    released.wait(self.gettimeout())
+                    raise TimeoutError
+                super().connect(address)
+
+        candidates = [
+            (socket.AF_INET, socket.SOCK_STREAM, 0, "", blackholed),
+            (socket.AF_INET, socket.SOCK_STREAM, 0, "", live),
+        ]
+        con = blocking_client.BlockingIOConnection([], None, None)
+
+        with mock.patch.object(socket, "socket", BlackholeSocket):
+            start = time.monotonic()
+            sock, sa, _, remaining = con._race_connect(
+                candidates, time.monotonic() + 10
+            )
+            elapsed = time.monotonic() - start
+        self.addCleanup(sock.close)
+
+        self.assertEqual(sa, live)
+        self.assertEqual(sock.getpeername(), live)
+        self.assertEqual(remaining, [candidates[0]])
+        self.assertGreaterEqual(elapsed, base_client.HAPPY_EYEBALLS_DELAY)
+        self.assertLess(elapsed, 5)
+
+    def test_race_connect_single(self):
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+        addr = server.getsockname()
+
+        con = blocking_client.BlockingIOConnection([], None, None)
+        with mock.patch.object(threading, "Thread") as thread:
+            sock, sa, _, remaining = con._race_connect(
+                [(socket.AF_INET, socket.SOCK_STREAM, 0, "", addr)],
+                time.monotonic() + 10,
+            )
+        self.addCleanup(sock.close)
+
+        thread.assert_not_called()
+        self.assertEqual(sa, addr)
+        self.assertEqual(remaining, [])
+
+        server.close()
+        with self.assertRaises(errors.ClientConnectionError):
+            con._race_connect(
+                [(socket.AF_INET, socket.SOCK_STREAM, 0, "", addr)],
+                time.monotonic() + 10,
+            )
+        self.assertEqual(len(con._connect_attempts), 1)
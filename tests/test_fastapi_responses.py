@@ -0,0 +1,118 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import json
+import unittest
+
+try:
+    import fastapi  # noqa: F401
+except ImportError:
+    NO_FASTAPI = True
+else:
+    NO_FASTAPI = False
+
+if not NO_FASTAPI:
+    from gel._internal._integration._fastapi._responses import (
+        JSONArrayStreamingResponse,
+        RawJSONResponse,
+    )
+
+
+ELEMENTS = {
+    "empty": [],
+    "one": [b'{"a": 1}'],
+    "many": [b'{"a": 1}', b'"two"', b"[3, 4]", b"null"],
+}
+
+
+async def _collect(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class _AsyncElements:
+    # An async iterable without aclose()
+    def __init__(self, elements):
+        self._it = iter(elements)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+@unittest.skipIf(NO_FASTAPI, "fastapi is not installed")
+class TestFastAPIResponses(unittest.TestCase):
+    def test_fastapi_raw_json_response(self):
+        for content in (b'{"a": [1, 2]}', '{"a": [1, 2]}'):
+            response = RawJSONResponse(content)
+            self.assertEqual(response.body, b'{"a": [1, 2]}')
+            self.assertEqual(response.media_type, "application/json")
+            self.assertEqual(json.loads(response.body), {"a": [1, 2]})
+
+        self.assertEqual(RawJSONResponse(None).body, b"")
+
+    def test_fastapi_json_array_streaming_response_sync(self):
+        for name, elements in ELEMENTS.items():
+            with self.subTest(name):
+                response = JSONArrayStreamingResponse(iter(elements))
+                body = asyncio.run(_collect(response))
+                self.assertEqual(response.media_type, "application/json")
+                self.assertEqual(
+                    json.loads(body), [json.loads(e) for e in elements]
+                )
+
+    def test_fastapi_json_array_streaming_response_async(self):
+        async def agen(elements):
+            for element in elements:
+                yield element
+
+        for name, elements in ELEMENTS.items():
+            for content in (agen(elements), _AsyncElements(elements)):
+                with self.subTest(name, content=type(content).__name__):
+                    response = JSONArrayStreamingResponse(content)
+                    body = asyncio.run(_collect(response))
+                    self.assertEqual(
+                        json.loads(body), [json.loads(e) for e in elements]
+                    )
+
+    def test_fastapi_json_array_streaming_response_close(self):
+        # The query iterator is closed when the stream is abandoned.
+        closed = False
+
+        async def agen():
+            nonlocal closed
+            try:
+                while True:
+                    yield b"1"
+            finally:
+                closed = True
+
+        async def read_some():
+            response = JSONArrayStreamingResponse(agen())
+            it = response.body_iterator
+            self.assertEqual(await anext(it), b"[")
+            self.assertEqual(await anext(it), b"1")
+            await it.aclose()
+
+        asyncio.run(read_some())
+        self.assertTrue(closed)
@@ -81,6 +81,25 @@ class TestGlobals(tb.AsyncQueryTestCase):
         x = await gdb.query_single('select global foo::bar::baz')
         self.assertEqual(x, 'asdf')
 
+    async def test_globals_02(self) -> None:
+        db = self.client
+        if db.is_proto_lt_1_0:
+            self.skipTest("Global is added in EdgeDB 2.0")
+
+        # Alternate between a few equal-but-distinct states, as an
+        # application setting per-request globals would do; encoded
+        # states are cached by content and must not leak between them.
+        for _ in range(3):
+            for val in ['a', 'b', None]:
+                gdb = db.with_globals(glob=val)
+                x = await gdb.query_single('select global glob')
+                self.assertEqual(x, val)
+
+                gdb = db.with_globals(glob=val, req_glob='r')
+                x = await gdb.query_single(
+                    'select (global glob, global req_glob)')
+                self.assertEqual(x, (val, 'r'))
+
     async def test_global_graphql_01(self) -> None:
         if self.server_version.major < 7:
             self.skipTest("GraphQL added in 7.0")
@@ -0,0 +1,63 @@
+import threading
+import time
+import unittest
+import uuid
+
+from gel._internal import _identity_map
+
+
+class Model:
+    __gel_has_id_field__ = True
+
+    constructed = 0
+
+    def __init__(self, data):
+        self.data = dict(data)
+
+    @classmethod
+    def __gel_model_construct__(cls, data):
+        cls.constructed += 1
+        time.sleep(0.01)
+        return cls(data)
+
+    def __gel_merge_fetched__(self, data):
+        self.data.update(data)
+
+
+class TestIdentityMap(unittest.TestCase):
+    def test_identity_map_construct_01(self):
+        imap = _identity_map.IdentityMap()
+        mid = uuid.uuid4()
+
+        obj = imap.__gel_construct__(Model, {"id": mid, "a": 1})
+        again = imap.__gel_construct__(Model, {"id": mid, "b": 2})
+        self.assertIs(again, obj)
+        self.assertEqual(obj.data, {"id": mid, "a": 1, "b": 2})
+        self.assertIs(imap.get(Model, mid), obj)
+
+        imap.clear()
+        self.assertIsNot(imap.__gel_construct__(Model, {"id": mid}), obj)
+
+    def test_identity_map_construct_02(self):
+        # Threads decoding the same object get the same instance.
+        imap = _identity_map.IdentityMap()
+        mid = uuid.uuid4()
+        barrier = threading.Barrier(8)
+        results = []
+        Model.constructed = 0
+
+        def construct(i):
+            barrier.wait()
+            results.append(imap.__gel_construct__(Model, {"id": mid, i: i}))
+
+        threads = [
+            threading.Thread(target=construct, args=(i,)) for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(Model.constructed, 1)
+        self.assertEqual(len({id(obj) for obj in results}), 1)
+        self.assertEqual(len(results[0].data), 9)
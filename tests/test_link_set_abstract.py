@@ -1748,6 +1748,49 @@ class TestAbstractMutableLinkSet(unittest.TestCase):
                     box_d: box_d,
                 })
 
+    def test_abstract_mutable_link_set_track_changes_09(self):
+        # Changes are recorded as net deltas; removals keep the order
+        # of the remaining items.
+        box_a = BoxedInt(1, __gel_new__=False)
+        box_b = BoxedInt(2, __gel_new__=False)
+        box_c = BoxedInt(3, __gel_new__=False)
+        box_d = BoxedInt(4)
+        box_e = BoxedInt(5)
+
+        lst = DummyAbstractMutableLinkSet(
+            [box_a, box_b, box_c],
+            __mode__=Mode.ReadWrite,
+            __wrap_list__=True,
+        )
+
+        lst.add(box_d)
+        lst.remove(box_b)
+        lst.add(box_e)
+        self._check_list(lst, [box_a, box_c, box_d, box_e])
+        self.assertEqual(lst.__gel_get_added__(), [box_d, box_e])
+        self.assertEqual(list(lst.__gel_get_removed__()), [box_b])
+
+        # Adding back a removed item and removing an added one
+        # cancel out.
+        lst.add(box_b)
+        lst.remove(box_d)
+        self._check_list(lst, [box_a, box_c, box_e, box_b])
+        self.assertEqual(lst.__gel_get_added__(), [box_e])
+        self.assertEqual(list(lst.__gel_get_removed__()), [])
+
+        lst.remove(box_e)
+        self.assertFalse(lst.__gel_has_changes__())
+
+        lst.clear()
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(
+            list(lst.__gel_get_removed__()), [box_a, box_c, box_b]
+        )
+
+        lst.__gel_commit__()
+        self.assertFalse(lst.__gel_has_changes__())
+        self.assertEqual(list(lst.__gel_get_removed__()), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -35,6 +35,7 @@
 from __future__ import annotations
 import typing_extensions
 
+import itertools
 import os
 import pathlib
 import shutil
@@ -5033,6 +5034,166 @@ class TestModelGeneratorMain(tb.ModelTestCase):
             MultiRange([Range(dt.date(2025, 3, 4), dt.date(2025, 11, 21))]),
         )
 
+    def test_modelgen_save_dirty_01(self):
+        from unittest import mock
+
+        from gel._internal import _dirty
+        from gel._internal import _save
+        from models.orm import default
+
+        # save() only walks the graph until it has seen every object
+        # marked dirty; changes deep in a loaded graph must still be
+        # found.
+        groups = self.client.query(
+            default.UserGroup.select(name=True, users=True)
+        )
+        group = next(g for g in groups if len(g.users) > 1)
+        user = next(iter(group.users))
+        self.assertFalse(_dirty.is_marked(group))
+        self.assertFalse(_dirty.is_marked(user))
+
+        # Put the edited object first so that the rest of the graph
+        # is left unvisited.
+        objs = [group, *(g for g in groups if g is not group)]
+        graph_size = len(list(_save.iter_graph(objs, _save.IDTracker())))
+
+        # New objects that aren't linked from what's being saved don't
+        # keep save() walking; they aren't even in the index.
+        unrelated = default.User(name="Not saved")
+        unrelated.nickname = "Still not saved"
+        unrelated_group = default.UserGroup(name="Not saved")
+        unrelated_group.users.add(user)
+        self.assertFalse(_dirty.is_marked(unrelated))
+        self.assertFalse(_dirty.is_marked(unrelated_group))
+        self.assertFalse(_dirty.is_marked(unrelated_group.users))
+
+        user.nickname = "deep edit"
+        self.assertTrue(_dirty.is_marked(user))
+
+        walked = 0
+        committed = 0
+        iter_graph = _save.iter_graph
+        commit_one = _save.SaveExecutor._commit_one
+
+        def counting_iter_graph(*args, **kwargs):
+            nonlocal walked
+            for obj in iter_graph(*args, **kwargs):
+                walked += 1
+                yield obj
+
+        def counting_commit_one(self, obj):
+            nonlocal committed
+            committed += 1
+            commit_one(self, obj)
+
+        with (
+            mock.patch.object(_save, "iter_graph", counting_iter_graph),
+            mock.patch.object(
+                _save.SaveExecutor, "_commit_one", counting_commit_one
+            ),
+        ):
+            self.client.save(*objs)
+
+        self.assertGreater(walked, 0)
+        self.assertLess(walked, graph_size)
+        self.assertGreater(committed, 0)
+        self.assertLess(committed, graph_size)
+        self.assertFalse(_dirty.is_marked(user))
+        self.assertTrue(unrelated.__gel_new__)
+        self.assertTrue(unrelated_group.__gel_new__)
+
+        res = self.client.get(
+            default.User.select(nickname=True).filter(id=user.id)
+        )
+        self.assertEqual(res.nickname, "deep edit")
+
+        # A multi link changed on an otherwise untouched object; new
+        # objects are found through the changed link.
+        num_users = len(group.users)
+        group.users.discard(user)
+        newcomer = default.User(name="Newcomer")
+        newcomer.nickname = "new"
+        group.users.add(newcomer)
+        self.assertFalse(group.__gel_get_changed_fields__())
+        self.client.save(*objs)
+        self.assertFalse(_dirty.is_marked(group.users))
+        self.assertFalse(newcomer.__gel_new__)
+        self.assertTrue(unrelated.__gel_new__)
+
+        res = self.client.get(
+            default.UserGroup.select(
+                users=lambda g: g.users.select(name=True, nickname=True)
+            ).filter(id=group.id)
+        )
+        self.assertEqual(len(res.users), num_users)
+        self.assertIn(
+            ("Newcomer", "new"), {(u.name, u.nickname) for u in res.users}
+        )
+
+    def test_modelgen_identity_map_01(self):
+        from models.orm import default
+
+        # Within an identity map each object is decoded into a single
+        # instance, and later fetches merge their fields into it.
+        client = self.client.with_identity_map()
+
+        alice = client.get(
+            default.User.select(name=True).filter(name="Alice")
+        )
+        again = client.get(
+            default.User.select(nickname=True).filter(name="Alice")
+        )
+        self.assertIs(again, alice)
+        self.assertEqual(alice.name, "Alice")
+        self.assertIsNone(alice.nickname)
+
+        groups = client.query(
+            default.UserGroup.select(name=True, users=True)
+        )
+        alices = [u for g in groups for u in g.users if u.id == alice.id]
+        self.assertEqual(len(alices), 2)
+        self.assertIs(alices[0], alices[1])
+
+        # Unsaved changes are not overwritten by fetches.
+        alice.nickname = "Al"
+        client.get(default.User.select(nickname=True).filter(name="Alice"))
+        self.assertEqual(alice.nickname, "Al")
+
+        # Without the map (or with another one) instances are separate.
+        other = self.client.get(default.User.filter(name="Alice"))
+        self.assertIsNot(other, alice)
+        self.assertEqual(other, alice)
+        other = client.with_identity_map().get(
+            default.User.filter(name="Alice")
+        )
+        self.assertIsNot(other, alice)
+
+        # A scope gets a fresh map, which is cleared on exit.
+        with self.client.identity_map_scope() as uow:
+            first = uow.get(default.User.filter(name="Alice"))
+            self.assertIs(uow.get(default.User.filter(name="Alice")), first)
+            self.assertIsNot(first, alice)
+        self.assertIsNot(uow.get(default.User.filter(name="Alice")), first)
+
+    def test_modelgen_save_deep_chain_01(self):
+        from models.orm import default
+
+        # A link chain much deeper than the recursion limit.
+        depth = 5000
+        nodes = [default.LinearPath(label=f"deep-{i}") for i in range(depth)]
+        for prev, node in itertools.pairwise(nodes):
+            prev.next = node
+
+        self.client.save(nodes[0])
+        self.assertFalse(any(n.__gel_new__ for n in nodes))
+
+        count = self.client.query_required_single("""
+            select count(
+                LinearPath filter .label like 'deep-%' and exists .next
+            )
+        """)
+        self.assertEqual(count, depth - 1)
+
     def test_modelgen_linkprops_01(self):
         from models.orm import default
 
@@ -270,6 +270,41 @@ class TestModelSyncBasic(tb.ModelTestCase):
         self.assertTrue(hasattr(a, "id"))
         self.assertTrue(hasattr(c, "id"))
 
+    def test_model_sync_basic_03(self):
+        # Refetch queries are sent in the same flight as the updates
+
+        from models.TestModelSyncBasic import default
+
+        reports = []
+        client = self.client._with_debug(
+            save_postcheck=True, save_debug=reports.append
+        )
+
+        a = default.A()
+        b = default.B()
+        client.sync(a, b)
+
+        # inserts, then refetch with the new ids
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].flights, 2)
+
+        b.a = a
+        client.sync(b)
+
+        # update and refetch together
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(reports[1].flights, 1)
+        self.assertEqual(b.a, a)
+
+        for report in reports:
+            self.assertGreater(report.plan_time, 0)
+            self.assertGreater(report.network_time, 0)
+            self.assertGreater(report.commit_time, 0)
+            self.assertTrue(report.queries)
+            for query in report.queries:
+                self.assertGreater(query.total_execs, 0)
+                self.assertGreater(query.max_args_number, 0)
+
 
 class TestModelSyncSingleProp(tb.ModelTestCase):
     ISOLATED_TEST_BRANCHES = True
@@ -697,6 +732,44 @@ class TestModelSyncSingleProp(tb.ModelTestCase):
         self.client.sync(mirror_1, mirror_2)
         self.assertFalse(hasattr(mirror_1, "val"))  # Fail
 
+    def test_model_sync_single_prop_06(self):
+        # Bulk insert of many objects, split into batches
+
+        from models.TestModelSyncSingleProp import default
+
+        reports = []
+        client = self.client._with_debug(
+            save_postcheck=True, save_debug=reports.append
+        )
+
+        objs = [
+            default.A(val=i) if i % 3 else default.A() for i in range(50)
+        ] + [default.B(val=[i, i]) for i in range(20)]
+
+        client.save(*objs, batch_size=7)
+
+        self.assertEqual(len(reports), 1)
+        # one query per type and set of fields: A(val), A(), B(val)
+        self.assertEqual(len(reports[0].queries), 3)
+        self.assertEqual(
+            sorted(q.total_execs for q in reports[0].queries),
+            [3, 3, 5],
+        )
+        for q in reports[0].queries:
+            self.assertLessEqual(q.max_args_number, 7)
+
+        a_vals = self.client.query("select A.val")
+        self.assertEqual(
+            sorted(a_vals), [i for i in range(50) if i % 3]
+        )
+        b_vals = self.client.query("select B.val")
+        self.assertEqual(
+            sorted(b_vals), [[i, i] for i in range(20)]
+        )
+
+        with self.assertRaisesRegex(ValueError, "batch_size"):
+            client.save(default.A(val=1), batch_size=0)
+
 
 class TestModelSyncComputedSingleProp(tb.ModelTestCase):
     ISOLATED_TEST_BRANCHES = True
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from gel._internal import _query_cache
+
+
+KEY = ("select 1", 0, 0, False, False, True)
+ENTRY = (b"m", 0, (b"\x01", b"\x02"), (b"\x03", b"\x04"))
+
+
+class TestPersistentQueryCache(unittest.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.cache = _query_cache.PersistentQueryCache(td.name)
+        self.cache.load("server", (3, 0))
+
+    def test_query_cache_claim_save_01(self):
+        cache = self.cache
+        self.assertFalse(cache.claim_save())
+
+        cache.put(KEY, ENTRY)
+        with mock.patch.object(_query_cache, "SAVE_INTERVAL", 0):
+            # Only one save is in flight at a time.
+            self.assertTrue(cache.claim_save())
+            self.assertFalse(cache.claim_save())
+            cache.save_claimed()
+            self.assertFalse(cache.claim_save())
+
+            cache.put(KEY, ENTRY)
+            self.assertTrue(cache.claim_save())
+
+        # And at most one every SAVE_INTERVAL seconds.
+        cache.save_claimed()
+        cache.put(KEY, ENTRY)
+        self.assertFalse(cache.claim_save())
+
+    def test_query_cache_claim_save_02(self):
+        # Failed saves are logged and retried later.
+        cache = self.cache
+        cache.put(KEY, ENTRY)
+        with (
+            mock.patch.object(_query_cache, "SAVE_INTERVAL", 0),
+            mock.patch.object(
+                _query_cache._cache, "save_json", return_value=False
+            ),
+            self.assertLogs(_query_cache.logger, "WARNING"),
+        ):
+            self.assertTrue(cache.claim_save())
+            cache.save_claimed()
+
+        with (
+            mock.patch.object(_query_cache, "SAVE_INTERVAL", 0),
+            mock.patch.object(
+                _query_cache.PersistentQueryCache,
+                "_save_locked",
+                side_effect=OSError,
+            ),
+            self.assertLogs(_query_cache.logger, "WARNING"),
+        ):
+            self.assertTrue(cache.claim_save())
+            cache.save_claimed()
+
+        with mock.patch.object(_query_cache, "SAVE_INTERVAL", 0):
+            self.assertTrue(cache.claim_save())
+            cache.save_claimed()
+            self.assertFalse(cache.claim_save())
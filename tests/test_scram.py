@@ -19,7 +19,9 @@
 
 import base64
 import unittest
+from unittest import mock
 
+from gel import con_utils
 from gel import scram
 
 
@@ -83,3 +85,28 @@ class TestSCRAM(unittest.TestCase):
         self.assertEqual(parsed.server_key, base64.b64decode(server_key))
 
         self.assertTrue(scram.verify_password(password, v))
+
+    def test_scram_sha_256_cached_keys(self):
+        salt = base64.b64decode('W22ZaJ0SNY7soEsUEjb6gQ==')
+        config = con_utils.ResolvedConnectConfig()
+        config.set_password('pencil', 'test')
+
+        with mock.patch.object(
+            scram, 'get_salted_password', wraps=scram.get_salted_password
+        ) as derive:
+            client_key, server_key = config.get_scram_keys(salt, 4096)
+            self.assertEqual(
+                scram.B64(scram.H(client_key)),
+                'WG5d8oPm3OtcPnkdi4Uo7BkeZkBFzpcXkuLmtbsT4qY=')
+            self.assertEqual(
+                scram.B64(server_key),
+                'wfPLwcE6nTWhTAmQ7tl2KeoiWGPlZqQxSrmfPwDl2dU=')
+
+            self.assertEqual(
+                config.get_scram_keys(salt, 4096),
+                (client_key, server_key))
+            self.assertEqual(derive.call_count, 1)
+
+            config.clear_scram_keys()
+            config.get_scram_keys(salt, 4096)
+            self.assertEqual(derive.call_count, 2)
@@ -16,19 +16,25 @@
 # limitations under the License.
 #
 
+import array
 import datetime
 import decimal
 import json
+import os
+import pickle
 import random
 import sys
+import tempfile
 import threading
 import time
 import unittest
 import uuid
+from unittest import mock
 
 import gel
 
 from gel import abstract
+from gel._internal import _query_cache
 from gel._internal import _testbase as tb
 from gel import blocking_client
 from gel.protocol import protocol
@@ -223,6 +229,418 @@ class TestSyncQuery(tb.SyncQueryTestCase):
                 r'not return'):
             self.client.query_required_single_json('create type Bar123')
 
+    def test_sync_query_iter_01(self):
+        rows = list(
+            self.client.query_iter('select range_unpack(range(0, 100000))')
+        )
+        self.assertEqual(rows, list(range(100000)))
+
+        rows = list(self.client.query_iter('select <int64>$0 + {1, 2}', 10))
+        self.assertEqual(sorted(rows), [11, 12])
+
+        self.assertEqual(list(self.client.query_iter('select <str>{}')), [])
+
+    def test_sync_query_iter_02(self):
+        # Stop consuming early: the connection must be usable afterwards.
+        for _ in range(3):
+            rows = self.client.query_iter(
+                'select range_unpack(range(0, 100000))'
+            )
+            for row in rows:
+                if row == 10:
+                    break
+            rows.close()
+            self.assertEqual(self.client.query_single('select 1'), 1)
+
+        self.assertFalse(self.client.connection.is_closed())
+
+    def test_sync_query_iter_03(self):
+        with self.assertRaises(gel.DivisionByZeroError):
+            for _ in self.client.query_iter('select 1 // {1, 0}'):
+                pass
+
+        self.assertEqual(self.client.query_single('select 1'), 1)
+
+        for tx in self.client.transaction():
+            with tx:
+                rows = list(tx.query_iter('select test::Obj.name'))
+                self.assertEqual(sorted(rows), ['bar', 'foo'])
+
+    def test_sync_query_columns_01(self):
+        cols = self.client.query_columns('''
+            select test::Obj {
+                name,
+                val,
+                half := <float64>.val / 2,
+                flag := .val > 0,
+                small := <int16>.val,
+                mytype := <test::MyType2>.val,
+                opt := (select 1 filter .val > 0),
+            } order by .val
+        ''')
+        self.assertEqual(cols.num_rows, 2)
+        self.assertEqual(
+            list(cols),
+            ['name', 'val', 'half', 'flag', 'small', 'mytype', 'opt'],
+        )
+        self.assertEqual(cols.kind('val'), 'int64')
+        self.assertEqual(cols['val'].tolist(), [0, 1])
+        self.assertEqual(cols['half'].tolist(), [0.0, 0.5])
+        self.assertEqual(cols['flag'].tolist(), [0, 1])
+        self.assertEqual(cols['small'].typecode, 'h')
+        self.assertEqual(cols['mytype'].tolist(), [0, 1])
+        self.assertEqual(cols.kind('name'), 'object')
+        self.assertEqual(cols['name'], ['foo', 'bar'])
+        self.assertEqual(cols.kind('opt'), 'object')
+        self.assertEqual(cols['opt'], [None, 1])
+        self.assertIs(cols[1], cols['val'])
+
+    def test_sync_query_columns_02(self):
+        cols = self.client.query_columns(
+            'select range_unpack(range(<int64>$0, 100000))', 10)
+        self.assertEqual(list(cols), ['0'])
+        self.assertEqual(cols['0'].tolist(), list(range(10, 100000)))
+
+        u = uuid.uuid4()
+        dt = datetime.datetime(2024, 5, 6, 7, 8, 9, 123456,
+                               tzinfo=datetime.timezone.utc)
+        cols = self.client.query_columns(
+            'select (<uuid>$0, <datetime>$1, <int32>1)', u, dt)
+        self.assertEqual(
+            [cols.kind(name) for name in cols], ['uuid', 'datetime', 'int32'])
+        self.assertEqual(bytes(cols['0']), u.bytes)
+        self.assertEqual(
+            cols['1'].tolist(),
+            [(dt - datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc))
+             // datetime.timedelta(microseconds=1)],
+        )
+
+        cols = self.client.query_columns('select <float32>{}')
+        self.assertEqual(cols.num_rows, 0)
+        self.assertEqual(len(cols['0']), 0)
+
+    def test_sync_lazy_decoding_01(self):
+        client = self.client.with_lazy_decoding()
+        long_name = 'x' * 1000
+
+        r = client.query_single('''
+            select {
+                name := <str>$0,
+                short := 'abc',
+                data := to_json('{"a": [1, 2]}'),
+                objs := (select test::Obj { name } order by .name),
+                one := (select test::Obj { name } filter .name = 'foo'),
+                arr := [1, 2, 3],
+                nothing := <str>{},
+            }
+        ''', long_name)
+        self.assertEqual(r.name, long_name)
+        self.assertEqual(r.short, 'abc')
+        self.assertEqual(r.data, '{"a": [1, 2]}')
+        self.assertEqual([o.name for o in r.objs], ['bar', 'foo'])
+        self.assertEqual(r.one.name, 'foo')
+        self.assertEqual(r.arr, [1, 2, 3])
+        self.assertIsNone(r.nothing)
+        self.assertIn('short := ', repr(r))
+        self.assertIn('objs', dir(r))
+
+        with self.assertRaises(AttributeError):
+            r.missing
+        with self.assertRaises(KeyError):
+            r.objs[0]['@missing']
+        with self.assertRaises(TypeError):
+            r.objs[0]['name']
+
+        # Scalars are not affected, and the option can be turned off.
+        self.assertEqual(client.query('select {1, 2}'), [1, 2])
+        r = client.with_lazy_decoding(False).query_single(
+            'select { one := (select test::Obj { name } limit 1) }')
+        self.assertIs(type(r), gel.Object)
+
+    def test_sync_lazy_decoding_02(self):
+        client = self.client.with_lazy_decoding()
+        query = '''
+            select test::Obj { name, long := <str>$0 ++ .name }
+            order by .name
+        '''
+        prefix = 'x' * 1000
+
+        rows = client.query(query, prefix)
+        self.assertIsInstance(rows[0], gel.LazyObject)
+        self.assertIsInstance(rows[0], gel.Object)
+        # repr() does not decode the pending fields.
+        self.assertEqual(repr(rows[0]), "LazyObject{name := 'bar', ...}")
+
+        again = client.query(query, prefix)
+        self.assertEqual(rows, again)
+        self.assertEqual(
+            [hash(o) for o in rows], [hash(o) for o in again])
+        self.assertNotEqual(rows[0], rows[1])
+
+        restored = pickle.loads(pickle.dumps(rows))
+        self.assertEqual(restored, rows)
+        self.assertEqual(restored[0].long, prefix + 'bar')
+        self.assertIsInstance(restored[0], gel.LazyObject)
+
+        # Fields read from several threads at once are decoded once.
+        rows = client.query(query, prefix)
+        barrier = threading.Barrier(4)
+        results = []
+
+        def read():
+            barrier.wait()
+            results.append([o.long for o in rows])
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(
+            results, [[prefix + 'bar', prefix + 'foo']] * 4)
+
+    def test_sync_decode_json_01(self):
+        client = self.make_test_client(
+            database=self.client.dbname,
+            decode_json=True,
+        )
+        try:
+            self.assertEqual(
+                client.query_single('select to_json(\'{"a": [1, null]}\')'),
+                {'a': [1, None]},
+            )
+            self.assertEqual(
+                client.query_single(
+                    'select <json>$0', {'b': 'c', 'd': [1.5]}),
+                {'b': 'c', 'd': [1.5]},
+            )
+            self.assertIsNone(client.query_single('select <json>{}'))
+            # query_json() still returns text.
+            self.assertEqual(
+                json.loads(client.query_json('select {1, 2}')), [1, 2])
+        finally:
+            client.close()
+
+        parsed = []
+
+        def loads(data):
+            self.assertIsInstance(data, bytes)
+            parsed.append(data)
+            return json.loads(data)
+
+        client = self.make_test_client(
+            database=self.client.dbname,
+            decode_json=loads,
+        )
+        try:
+            self.assertEqual(client.query_single('select <json>1'), 1)
+            self.assertEqual(parsed, [b'1'])
+        finally:
+            client.close()
+
+    def test_sync_query_json_iter_01(self):
+        rows = list(self.client.query_json_iter(
+            'select test::Obj { name, val } order by .val'))
+        self.assertEqual(
+            rows, [{'name': 'foo', 'val': 0}, {'name': 'bar', 'val': 1}])
+
+        rows = list(self.client.query_json_iter(
+            'select range_unpack(range(0, <int64>$0))', 10000))
+        self.assertEqual(rows, list(range(10000)))
+
+        self.assertEqual(
+            list(self.client.query_json_iter('select <str>{}')), [])
+
+    def test_sync_query_json_bytes_01(self):
+        res = self.client.query_json_bytes(
+            'select test::Obj { name, val } order by .val')
+        self.assertIsInstance(res, bytes)
+        self.assertEqual(
+            json.loads(res),
+            [{'name': 'foo', 'val': 0}, {'name': 'bar', 'val': 1}])
+
+        self.assertEqual(
+            self.client.query_json_bytes('select <str>{}'), b'[]')
+
+        rows = list(self.client.query_json_bytes_iter(
+            'select range_unpack(range(0, <int64>$0))', 1000))
+        self.assertTrue(all(isinstance(r, bytes) for r in rows))
+        self.assertEqual([json.loads(r) for r in rows], list(range(1000)))
+
+        self.assertEqual(
+            list(self.client.query_json_bytes_iter('select <str>{}')), [])
+
+    def test_sync_persistent_query_cache_01(self):
+        query = 'select <int64>$0 + 1'
+        key = (query, protocol.OutputFormat.BINARY, 0, False, False, True)
+
+        with tempfile.TemporaryDirectory() as td:
+            client = self.make_test_client(
+                database=self.client.dbname,
+                persistent_query_cache=td,
+            )
+            try:
+                self.assertEqual(client.query_single(query, 41), 42)
+            finally:
+                client.close()
+            self.assertTrue(os.listdir(td))
+
+            client = self.make_test_client(
+                database=self.client.dbname,
+                persistent_query_cache=td,
+            )
+            try:
+                client.ensure_connected()
+                self.assertIsNotNone(client._impl.persistent_cache.get(key))
+                # Entries are only stored after a Parse.
+                with mock.patch.object(
+                    _query_cache.PersistentQueryCache,
+                    "put",
+                    autospec=True,
+                ) as put:
+                    self.assertEqual(client.query_single(query, 1), 2)
+                put.assert_not_called()
+                self.assertIn(key, client._impl.query_cache)
+            finally:
+                client.close()
+
+    def test_sync_cache_stats_01(self):
+        client = self.make_test_client(
+            database=self.client.dbname,
+            query_cache_size=2,
+        )
+        try:
+            for i in range(3):
+                client.query_single('select <int64>$0 + ' + str(i), 1)
+            stats = client.cache_stats
+            self.assertEqual(stats.query_cache.maxsize, 2)
+            self.assertEqual(stats.query_cache.size, 2)
+            self.assertEqual(stats.query_cache.evictions, 1)
+            self.assertEqual(stats.query_cache.hits, 0)
+            self.assertGreater(stats.codec_builds, 0)
+
+            client.query_single('select <int64>$0 + 2', 1)
+            self.assertEqual(client.cache_stats.query_cache.hits, 1)
+        finally:
+            client.close()
+
+        with self.assertRaisesRegex(ValueError, 'query_cache_size'):
+            self.make_test_client(query_cache_size=0)
+
+    def test_sync_cache_stats_02(self):
+        # Each type described by the server is counted once, the
+        # codecs it is built from are not.
+        query = 'select (1, [<str>$0])'
+        client = self.make_test_client(database=self.client.dbname)
+        try:
+            client.query_single(query, 'a')
+            stats = client.cache_stats.codecs
+            self.assertEqual((stats.hits, stats.misses), (0, 2))
+
+            # Described again, with the codecs cached this time.
+            client._impl._query_cache.clear()
+            client.query_single(query, 'b')
+            stats = client.cache_stats.codecs
+            self.assertEqual((stats.hits, stats.misses), (2, 2))
+
+            # Served from the query cache, no codec lookups at all.
+            client.query_single(query, 'c')
+            stats = client.cache_stats.codecs
+            self.assertEqual((stats.hits, stats.misses), (2, 2))
+
+            # One cached output type (int64 was built for the tuple
+            # above), and no input type: exactly one hit.
+            client.query_single('select 1')
+            stats = client.cache_stats.codecs
+            self.assertEqual((stats.hits, stats.misses), (3, 2))
+        finally:
+            client.close()
+
+    def test_sync_share_codecs_01(self):
+        query = 'select (a := <int64>$0, b := [<str>$1], c := <bool>$2)'
+        clients = [
+            self.make_test_client(
+                database=self.client.dbname,
+                share_codecs=True,
+            )
+            for _ in range(2)
+        ]
+        try:
+            first, second = clients
+            self.assertEqual(first.query_single(query, 1, 'x', True).a, 1)
+            self.assertEqual(second.query_single(query, 2, 'y', False).a, 2)
+
+            self.assertEqual(second.cache_stats.codec_builds, 0)
+            self.assertGreater(second.cache_stats.shared_codecs.hits, 0)
+        finally:
+            for client in clients:
+                client.close()
+
+        self.assertIsNone(self.client.cache_stats.shared_codecs)
+
+    def test_sync_share_codecs_02(self):
+        # Shared codecs decode results of several threads at once.
+        query = 'select (a := <int64>$0, b := [<str>$1])'
+        clients = [
+            self.make_test_client(
+                database=self.client.dbname,
+                share_codecs=True,
+            )
+            for _ in range(4)
+        ]
+        failures = []
+
+        def worker(client, n):
+            try:
+                for i in range(50):
+                    res = client.query_single(query, n * 100 + i, str(i))
+                    self.assertEqual(res.a, n * 100 + i)
+                    self.assertEqual(res.b, [str(i)])
+            except Exception as e:
+                failures.append(e)
+
+        threads = [
+            threading.Thread(target=worker, args=(client, n))
+            for n, client in enumerate(clients)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for client in clients:
+                client.close()
+
+        self.assertEqual(failures, [])
+
+    def test_sync_state_cache_01(self):
+        # The encoded session state is cached across connections;
+        # threads using different state see their own.
+        query = 'select assert_single(cfg::Config.query_execution_timeout)'
+        failures = []
+
+        def worker(n):
+            try:
+                timeout = datetime.timedelta(seconds=n + 1)
+                client = self.client.with_config(
+                    query_execution_timeout=timeout
+                )
+                for _ in range(20):
+                    self.assertEqual(client.query_single(query), timeout)
+            except Exception as e:
+                failures.append(e)
+
+        threads = [
+            threading.Thread(target=worker, args=(n,)) for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+
     def test_sync_basic_datatypes_01(self):
         for _ in range(10):
             self.assertEqual(
@@ -332,6 +750,48 @@ class TestSyncQuery(tb.SyncQueryTestCase):
                 None
             )
 
+    def test_sync_basic_datatypes_04(self):
+        # Tuples of fixed-width scalars are decoded in one pass.
+        uid = uuid.UUID('7d4eb57a-5d8b-11ee-8a3c-3b5a0bd1f2a7')
+        dt = datetime.datetime(
+            2023, 9, 28, 12, 30, tzinfo=datetime.timezone.utc)
+
+        self.assertEqual(
+            self.client.query('''
+                for x in {-1, 0, 2}
+                select (<int16>x, <int32>x, <int64>x, <float32>x / 2,
+                        <float64>x / 4, x > 1, <test::MyType2>x)
+                order by .0
+            '''),
+            [
+                (x, x, x, x / 2, x / 4, x > 1, x)
+                for x in [-1, 0, 2]
+            ])
+
+        r = self.client.query_single('''
+            select (a := <int16>-7, b := 2.5, c := true,
+                    d := <uuid>$0, e := <datetime>$1,
+                    f := <cal::local_date>'2023-09-28')
+        ''', uid, dt)
+        self.assertEqual(
+            r, (-7, 2.5, True, uid, dt, datetime.date(2023, 9, 28)))
+        self.assertEqual(
+            (r.a, r.d, r.f), (-7, uid, datetime.date(2023, 9, 28)))
+
+        # Nested in arrays and other tuples, and optional elements.
+        self.assertEqual(
+            self.client.query_single(
+                'select [(1, 2.5), (3, -1.5)]'),
+            [(1, 2.5), (3, -1.5)])
+        self.assertEqual(
+            self.client.query_single(
+                'select (1, "a", (2, false))'),
+            (1, "a", (2, False)))
+        self.assertEqual(
+            self.client.query_single(
+                'select (a := 1, b := <optional int64>$0)', None),
+            (1, None))
+
     def test_sync_args_01(self):
         self.assertEqual(
             self.client.query(
@@ -482,6 +942,44 @@ class TestSyncQuery(tb.SyncQueryTestCase):
 
             self.client.query("""SELECT 42""", a=1, b=2)
 
+    def test_sync_args_array_buffer(self):
+        for typename, typecode, values in [
+            ('int16', 'h', [-(2 ** 15), 0, 2 ** 15 - 1]),
+            ('int32', 'i', [-(2 ** 31), 0, 2 ** 31 - 1]),
+            ('int64', 'q', [-(2 ** 63), 0, 2 ** 63 - 1]),
+            ('float32', 'f', [-1.5, 0.0, 2.25]),
+            ('float64', 'd', [-1.5, 0.0, 1e300]),
+        ]:
+            with self.subTest(typename=typename):
+                buf = array.array(typecode, values)
+                for arg in [buf, memoryview(buf), memoryview(buf)[::2]]:
+                    self.assertEqual(
+                        self.client.query_single(
+                            f'select <array<{typename}>>$0', arg),
+                        list(arg))
+
+                self.assertEqual(
+                    self.client.query_single(
+                        f'select <array<{typename}>>$0',
+                        array.array(typecode)),
+                    [])
+
+        # Buffers of another item type take the element-wise path.
+        self.assertEqual(
+            self.client.query_single(
+                'select <array<int64>>$0', array.array('i', [1, 2, 3])),
+            [1, 2, 3])
+
+        with self.assertRaisesRegex(
+                gel.InvalidArgumentError, 'expected str, got int'):
+            self.client.query_single(
+                'select <array<str>>$0', array.array('q', [1]))
+
+        with self.assertRaisesRegex(
+                gel.InvalidArgumentError, 'sized iterable container'):
+            self.client.query_single(
+                'select <array<int16>>$0', b'\x00\x01')
+
     def test_sync_args_uuid_pack(self):
         obj = self.client.query_single(
             'select schema::Object {id, name} limit 1')
@@ -1067,6 +1565,27 @@ class TestSyncQuery(tb.SyncQueryTestCase):
         val = self.client.query_single("SELECT <test::MyType>$0", "foo")
         self.assertEqual(val, 'foo')
 
+    def test_retry_mismatch_input_typedesc_iter(self):
+        query = "SELECT <test::IterType>$0 + {0, 1}"
+        self.client.execute(
+            "CREATE SCALAR TYPE test::IterType EXTENDING std::int32"
+        )
+        try:
+            rows = self.client.query_iter(query, 42)
+            self.assertEqual(sorted(rows), [42, 43])
+
+            self.client.execute("""
+                DROP SCALAR TYPE test::IterType;
+                CREATE SCALAR TYPE test::IterType EXTENDING std::int64;
+            """)
+
+            # The outdated input descriptor is replaced before any rows
+            # are returned, so query_iter() can run the query again.
+            rows = self.client.query_iter(query, 42)
+            self.assertEqual(sorted(rows), [42, 43])
+        finally:
+            self.client.execute("DROP SCALAR TYPE test::IterType")
+
     def test_batch_01(self):
         def test(bx):
             bx.send_query_single('SELECT 1')
@@ -0,0 +1,222 @@
+import copy
+import pickle
+import random
+import unittest
+
+from gel._internal._tracked_list import Mode, TrackedList
+
+
+IntList = TrackedList[int]
+AnyList = TrackedList[object]
+
+
+def _fetched(cls, items):
+    # Mimic a list coming from the codecs: no changes are tracked.
+    return cls(list(items), __mode__=Mode.ReadWrite, __wrap_list__=True)
+
+
+class TestTrackedList(unittest.TestCase):
+    def test_tracked_list_track_changes_01(self):
+        lst = _fetched(IntList, [1, 2, 3])
+        self.assertFalse(lst.__gel_has_changes__())
+
+        lst.append(4)
+        lst.remove(2)
+        self.assertEqual(lst, [1, 3, 4])
+        self.assertTrue(lst.__gel_has_changes__())
+        self.assertEqual(lst.__gel_get_added__(), [4])
+        self.assertEqual(lst.__gel_get_removed__(), [2])
+
+    def test_tracked_list_track_changes_02(self):
+        # Adding and then removing a value cancels out, and vice versa,
+        # but the list is still changed if the order isn't the same:
+        # arrays are ordered.
+        lst = _fetched(IntList, [1, 2, 3])
+
+        lst.append(4)
+        lst.remove(4)
+        self.assertEqual(lst, [1, 2, 3])
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(lst.__gel_get_removed__(), [])
+        self.assertFalse(lst.__gel_has_changes__())
+
+        lst.remove(1)
+        lst.append(1)
+        self.assertEqual(lst, [2, 3, 1])
+        self.assertTrue(lst.__gel_has_changes__())
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(lst.__gel_get_removed__(), [])
+
+        lst.__gel_commit__()
+        self.assertFalse(lst.__gel_has_changes__())
+
+        lst[0], lst[1] = lst[1], lst[0]
+        self.assertEqual(lst, [3, 2, 1])
+        self.assertTrue(lst.__gel_has_changes__())
+        self.assertTrue(copy.copy(lst).__gel_has_changes__())
+        self.assertTrue(
+            pickle.loads(pickle.dumps(lst)).__gel_has_changes__()
+        )
+
+    def test_tracked_list_track_changes_03(self):
+        # Duplicates are counted.
+        lst = _fetched(IntList, [1, 1, 2])
+
+        lst.append(1)
+        lst.remove(1)
+        lst.remove(1)
+        self.assertEqual(lst, [2, 1])
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(lst.__gel_get_removed__(), [1])
+
+        lst.extend([2, 2])
+        lst.remove(2)
+        self.assertEqual(lst, [1, 2, 2])
+        self.assertEqual(lst.__gel_get_added__(), [2])
+        self.assertEqual(lst.__gel_get_removed__(), [1])
+
+    def test_tracked_list_track_changes_04(self):
+        # Positional removals and replacements are tracked too.
+        lst = _fetched(IntList, [1, 2, 3, 4])
+
+        self.assertEqual(lst.pop(0), 1)
+        del lst[0]
+        lst[0] = 5
+        self.assertEqual(lst, [5, 4])
+        self.assertEqual(lst.__gel_get_added__(), [5])
+        self.assertEqual(sorted(lst.__gel_get_removed__()), [1, 2, 3])
+
+        lst[0] = 3
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(sorted(lst.__gel_get_removed__()), [1, 2])
+
+        lst.clear()
+        self.assertEqual(lst, [])
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(sorted(lst.__gel_get_removed__()), [1, 2, 3, 4])
+
+    def test_tracked_list_track_changes_05(self):
+        # A new list only has additions.
+        lst = IntList([1, 2], __mode__=Mode.ReadWrite)
+        lst.append(3)
+        lst.remove(1)
+        self.assertEqual(lst.__gel_get_added__(), [2, 3])
+        self.assertEqual(lst.__gel_get_removed__(), [])
+
+        lst.__gel_commit__()
+        self.assertFalse(lst.__gel_has_changes__())
+        lst.__gel_post_commit_check__(None)
+
+        lst.remove(3)
+        self.assertEqual(lst, [2])
+        self.assertEqual(lst.__gel_get_removed__(), [3])
+
+    def test_tracked_list_remove_01(self):
+        lst = _fetched(IntList, [3, 1, 2, 1])
+
+        self.assertIn(1, lst)
+        self.assertNotIn(4, lst)
+
+        lst.remove(1)
+        self.assertEqual(lst.count(1), 1)
+        self.assertIn(1, lst)
+        lst.remove(1)
+        self.assertNotIn(1, lst)
+        self.assertEqual(lst, [3, 2])
+
+        with self.assertRaises(ValueError):
+            lst.remove(1)
+
+        # Removals are applied before positional access.
+        lst.remove(3)
+        self.assertEqual(len(lst), 1)
+        lst.insert(0, 7)
+        self.assertEqual(lst, [7, 2])
+        self.assertEqual(lst[1], 2)
+        self.assertEqual(len(lst), 2)
+
+    def test_tracked_list_remove_02(self):
+        # Removed items are dropped in a single pass.
+        items = list(range(100)) * 2
+        lst = _fetched(IntList, items)
+        for i in range(0, 100, 2):
+            lst.remove(i)
+        self.assertEqual(len(lst), 150)
+        self.assertEqual(lst, items[1:100:2] + items[100:])
+
+    def test_tracked_list_remove_03(self):
+        # Positional access and mutations between removals.
+        rnd = random.Random(0)
+        expected = [rnd.randrange(50) for _ in range(300)]
+        lst = _fetched(IntList, expected)
+        for _ in range(1000):
+            op = rnd.randrange(6)
+            if op == 0 and expected:
+                value = rnd.choice(expected)
+                lst.remove(value)
+                expected.remove(value)
+            elif op == 1:
+                value = rnd.randrange(50)
+                lst.append(value)
+                expected.append(value)
+            elif op == 2 and expected:
+                i = rnd.randrange(-len(expected), len(expected))
+                self.assertEqual(lst.pop(i), expected.pop(i))
+            elif op == 3 and expected:
+                i = rnd.randrange(-len(expected), len(expected))
+                lst[i] = expected[i] = rnd.randrange(50)
+            elif op == 4 and expected:
+                i = rnd.randrange(len(expected))
+                del lst[i]
+                del expected[i]
+            self.assertEqual(len(lst), len(expected))
+            if expected:
+                i = rnd.randrange(-len(expected), len(expected))
+                self.assertEqual(lst[i], expected[i])
+        self.assertEqual(lst, expected)
+
+        with self.assertRaises(IndexError):
+            lst[len(expected)]
+
+    def test_tracked_list_unhashable_01(self):
+        lst = _fetched(AnyList, [[1], [2], 3])
+
+        self.assertIn([2], lst)
+        lst.remove([2])
+        lst.append([4])
+        lst.remove([4])
+        self.assertEqual(lst, [[1], 3])
+        self.assertEqual(lst.__gel_get_added__(), [])
+        self.assertEqual(lst.__gel_get_removed__(), [[2]])
+
+    def test_tracked_list_unhashable_02(self):
+        # An unhashable value showing up in a list that was indexed
+        # already keeps the recorded changes.
+        lst = _fetched(AnyList, [1, 2, 3])
+
+        lst.remove(2)
+        lst.append(4)
+        lst.append([5])
+        lst.remove(4)
+        self.assertEqual(lst, [1, 3, [5]])
+        self.assertEqual(lst.__gel_get_added__(), [[5]])
+        self.assertEqual(lst.__gel_get_removed__(), [2])
+
+    def test_tracked_list_copy_01(self):
+        lst = _fetched(IntList, [1, 2, 3])
+        lst.remove(2)
+        lst.append(4)
+
+        for other in (
+            copy.copy(lst),
+            copy.deepcopy(lst),
+            pickle.loads(pickle.dumps(lst)),
+        ):
+            self.assertEqual(other, [1, 3, 4])
+            self.assertEqual(other.__gel_get_added__(), [4])
+            self.assertEqual(other.__gel_get_removed__(), [2])
+
+            other.remove(4)
+            self.assertEqual(other.__gel_get_added__(), [])
+
+        self.assertEqual(lst.__gel_get_added__(), [4])
@@ -312,3 +312,40 @@ class TestVector(tb.SyncQueryTestCase):
                 ''',
                 [1_000_000],
             )
+
+    def test_vector_columns_01(self):
+        cols = self.client.query_columns('''
+            select (
+                for x in {1, 2} select {
+                    n := x,
+                    v := <ext::pgvector::vector>[x, x / 2, -x],
+                    ov := (
+                        <ext::pgvector::vector>[7] if x = 2
+                        else <ext::pgvector::vector>{}
+                    ),
+                }
+            ) order by .n
+        ''')
+        self.assertEqual(cols.kind('v'), 'vector')
+        self.assertEqual(
+            cols['v'], array.array('f', [1, 0.5, -1, 2, 1, -2]))
+        self.assertEqual(cols.row_offsets('v').tolist(), [0, 3, 6])
+
+        self.assertEqual(cols.kind('ov'), 'vector')
+        self.assertEqual(cols['ov'], array.array('f', [7]))
+        self.assertEqual(cols.row_offsets('ov').tolist(), [0, 0, 1])
+
+        with self.assertRaises(TypeError):
+            cols.row_offsets('n')
+
+    def test_vector_columns_02(self):
+        if self.PGVECTOR_VER < (0, 7):
+            self.skipTest("need at least pgvector 0.7.4 for halfvec")
+
+        cols = self.client.query_columns('''
+            select <ext::pgvector::halfvec>{[1.5, 2.0], [65000, -0.25]}
+        ''')
+        self.assertEqual(cols.kind('0'), 'vector')
+        self.assertEqual(
+            cols['0'], array.array('f', [1.5, 2.0, 64992, -0.25]))
+        self.assertEqual(cols.row_offsets('0').tolist(), [0, 2, 4])